@@ -0,0 +1,95 @@
+import argparse
+from pathlib import Path
+import sys
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src' / 'mifit_analyzer'))
+
+from activity.activity import ActivityData  # noqa: E402
+from ingestion import IngestionConfig, get_memory_usage_mb  # noqa: E402
+from sleep.sleep import SleepData  # noqa: E402
+from sleep_activity.sleep_activity import SleepActivityData  # noqa: E402
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(prog='engine_benchmark', usage='python3 %(prog)s [options]',
+                                     description='This benchmark compares the c engine with numpy-backed columns '
+                                                 'and the pyarrow engine with arrow-backed columns.')
+    parser.add_argument('--days', help='number of days in the exports. Default: 100000', type=int, default=100000)
+    parser.add_argument('--file_number', help='number of export files. Default: 4', type=int, default=4)
+    parser.add_argument('--repeats', help='number of repeats, the best time is reported. Default: 3', type=int,
+                        default=3)
+    args = parser.parse_args()
+    return args
+
+
+def write_exports(directory: str, file_number: int, days: int) -> None:
+    rng = np.random.default_rng(0)
+    Path(f'{directory}/SLEEP').mkdir()
+    Path(f'{directory}/ACTIVITY').mkdir()
+
+    # every file covers its own part of the history, so nothing is removed by the deduplication
+    for index, day_range in enumerate(np.array_split(pd.date_range('1800-01-01', periods=days, freq='D'), file_number)):
+        dates = pd.DatetimeIndex(day_range)
+        sync_time = 1600000000 + index
+        start = dates.astype('int64') // 10 ** 9 + rng.integers(72000, 86000, len(dates))
+        deep_sleep_time = rng.integers(30, 200, len(dates))
+        shallow_sleep_time = rng.integers(100, 400, len(dates))
+        pd.DataFrame({'date': dates.strftime('%Y-%m-%d'), 'lastSyncTime': sync_time,
+                      'deepSleepTime': deep_sleep_time, 'shallowSleepTime': shallow_sleep_time,
+                      'wakeTime': rng.integers(0, 60, len(dates)), 'start': start,
+                      'stop': start + (deep_sleep_time + shallow_sleep_time) * 60})\
+            .to_csv(f'{directory}/SLEEP/SLEEP_{sync_time}.csv', index=False)
+
+        steps = rng.integers(0, 30000, len(dates))
+        pd.DataFrame({'date': dates.strftime('%Y-%m-%d'), 'lastSyncTime': sync_time, 'steps': steps,
+                      'distance': (steps * 0.7).astype(int), 'runDistance': rng.integers(0, 3000, len(dates)),
+                      'calories': rng.integers(0, 800, len(dates))})\
+            .to_csv(f'{directory}/ACTIVITY/ACTIVITY_{sync_time}.csv', index=False)
+
+
+def measure(directory: str, engine: str) -> tuple[float, float, float, float]:
+    ingestion_config = IngestionConfig(use_cache=False, engine=engine)
+    results_directory = f'{directory}/results_{engine}'
+
+    start_time = perf_counter()
+    sleep = SleepData(input_directory=f'{directory}/SLEEP', results_directory=results_directory,
+                      ingestion_config=ingestion_config)
+    activity = ActivityData(input_directory=f'{directory}/ACTIVITY', results_directory=results_directory,
+                            ingestion_config=ingestion_config)
+    parse_time = perf_counter() - start_time
+
+    start_time = perf_counter()
+    sleep.transform_data_for_analysis()
+    activity.transform_data_for_analysis()
+    sleep_activity = SleepActivityData(sleep=sleep, activity=activity, results_directory=results_directory)
+    transform_time = perf_counter() - start_time
+
+    start_time = perf_counter()
+    sleep.data.describe()
+    activity.data.describe()
+    sleep_activity.data.describe()
+    statistics_time = perf_counter() - start_time
+
+    memory_usage = sum(get_memory_usage_mb(dataset.data) for dataset in (sleep, activity, sleep_activity))
+    return parse_time, transform_time, statistics_time, memory_usage
+
+
+def main(days: int, file_number: int, repeats: int) -> None:
+    print('engine\tparse seconds\ttransform seconds\tstatistics seconds\tmemory Mb')
+    with tempfile.TemporaryDirectory() as directory:
+        write_exports(directory, file_number, days)
+        for engine in ('c', 'arrow'):
+            results = [measure(directory, engine) for _ in range(repeats)]
+            parse_time, transform_time, statistics_time, _ = np.min(results, axis=0)
+            memory_usage = results[-1][-1]
+            print(f'{engine}\t{parse_time:.3f}\t{transform_time:.3f}\t{statistics_time:.3f}\t{memory_usage:.2f}')
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    main(days=args.days, file_number=args.file_number, repeats=args.repeats)
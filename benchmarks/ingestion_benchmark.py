@@ -0,0 +1,78 @@
+import argparse
+from dataclasses import replace
+from pathlib import Path
+import sys
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src' / 'mifit_analyzer'))
+
+from activity import ActivityData  # noqa: E402
+from ingestion import IngestionConfig  # noqa: E402
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(prog='ingestion_benchmark', usage='python3 %(prog)s [options]',
+                                     description='This benchmark compares sequential and parallel reading '
+                                                 'of Mi Fit csv exports through the ingestion path of the '
+                                                 'datasets.')
+    parser.add_argument('--file_numbers', help='numbers of files to read. Default: 4 16 64', type=int, nargs='+',
+                        default=[4, 16, 64])
+    parser.add_argument('--rows_per_file', help='rows per file. Default: 50000', type=int, default=50000)
+    parser.add_argument('--workers', help='numbers of workers. Default: 2 4 8', type=int, nargs='+',
+                        default=[2, 4, 8])
+    parser.add_argument('--repeats', help='number of repeats, the best time is reported. Default: 3', type=int,
+                        default=3)
+    args = parser.parse_args()
+    return args
+
+
+def write_activity_exports(directory: str, file_number: int, rows_per_file: int) -> None:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2000-01-01', periods=rows_per_file, freq='D').strftime('%Y-%m-%d')
+    Path(f'{directory}/ACTIVITY').mkdir()
+    for index in range(file_number):
+        # every export repeats the whole history, as the exports of Mi Fit do
+        steps = rng.integers(0, 30000, rows_per_file)
+        pd.DataFrame({'date': dates, 'lastSyncTime': 1600000000 + index, 'steps': steps,
+                      'distance': (steps * 0.7).astype(int), 'runDistance': rng.integers(0, 3000, rows_per_file),
+                      'calories': rng.integers(0, 800, rows_per_file)})\
+            .to_csv(f'{directory}/ACTIVITY/ACTIVITY_{1600000000 + index}.csv', index=False)
+
+
+def measure(activity: ActivityData, workers: int, executor: str, repeats: int) -> tuple[float, pd.DataFrame]:
+    # the files are read with read_csv_sources, the same date index, pool and deduplication as a run of the tool
+    activity.ingestion_config = replace(activity.ingestion_config, workers=workers, executor=executor)
+    best_time = float('inf')
+    data = pd.DataFrame()
+    for _ in range(repeats):
+        start_time = perf_counter()
+        data = activity.read_csv_sources(activity.sources, None, None)
+        best_time = min(best_time, perf_counter() - start_time)
+    return best_time, data
+
+
+def main(file_numbers: list[int], rows_per_file: int, workers: list[int], repeats: int) -> None:
+    print('files\texecutor\tworkers\tseconds\tspeedup')
+    for file_number in file_numbers:
+        with tempfile.TemporaryDirectory() as directory:
+            write_activity_exports(directory, file_number, rows_per_file)
+            activity = ActivityData(input_directory=f'{directory}/ACTIVITY', results_directory=f'{directory}/results',
+                                    ingestion_config=IngestionConfig(use_cache=False))
+            sequential_time, expected = measure(activity, 1, 'thread', repeats)
+            print(f'{file_number}\tsequential\t1\t{sequential_time:.3f}\t1.00')
+            for executor in ('thread', 'process'):
+                for worker_number in workers:
+                    elapsed_time, data = measure(activity, worker_number, executor, repeats)
+                    pd.testing.assert_frame_equal(expected, data)
+                    print(f'{file_number}\t{executor}\t{worker_number}\t{elapsed_time:.3f}\t'
+                          f'{sequential_time / elapsed_time:.2f}')
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    main(file_numbers=args.file_numbers, rows_per_file=args.rows_per_file, workers=args.workers,
+         repeats=args.repeats)
@@ -0,0 +1,97 @@
+import argparse
+from pathlib import Path
+import sys
+import tempfile
+from time import perf_counter
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import seaborn as sns  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src' / 'mifit_analyzer'))
+
+from abstract_classes import PlotRenderer, PlotterAbstract  # noqa: E402
+from activity import ActivityData, ActivityPlotter  # noqa: E402
+from engine_benchmark import write_exports  # noqa: E402
+from ingestion import IngestionConfig  # noqa: E402
+from sleep import SleepData, SleepPlotter  # noqa: E402
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(prog='plot_benchmark', usage='python3 %(prog)s [options]',
+                                     description='This benchmark compares the per-plot overhead of pyplot figures '
+                                                 'with the recycled figures of the figure pool and renders the '
+                                                 'sleep and activity plots with threads.')
+    parser.add_argument('--figures', help='number of empty figures of the overhead test. Default: 50', type=int,
+                        default=50)
+    parser.add_argument('--days', help='number of days in the exports. Default: 3650', type=int, default=3650)
+    parser.add_argument('--workers', help='numbers of threads rendering the plots. Default: 1 2 4', type=int,
+                        nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+    return args
+
+
+def render_with_pyplot(path: Path) -> None:
+    # every plot method went through these pyplot calls before the figure pool
+    sns.set_style('whitegrid')
+    plt.figure(figsize=PlotterAbstract.plot_figsize)
+    plt.title('Benchmark plot', fontsize=PlotterAbstract.title_fontsize)
+    plt.savefig(path)
+    plt.close("all")
+
+
+def render_with_figure_pool(path: Path) -> None:
+    with PlotterAbstract.figure_pool.figure(path, PlotterAbstract.plot_figsize) as (fig, ax):
+        ax.set_title('Benchmark plot', fontsize=PlotterAbstract.title_fontsize)
+
+
+def measure_overhead(directory: str, figures: int) -> None:
+    print('figures\tseconds per figure')
+    for name, render in (('pyplot', render_with_pyplot), ('figure pool', render_with_figure_pool)):
+        # the first figure loads the fonts, so it is not measured
+        render(Path(directory, f'{name}.png'))
+        start_time = perf_counter()
+        for _ in range(figures):
+            render(Path(directory, f'{name}.png'))
+        print(f'{name}\t{(perf_counter() - start_time) / figures:.4f}')
+
+
+def measure_plots(directory: str, days: int, workers: list[int]) -> None:
+    write_exports(directory, 1, days)
+    ingestion_config = IngestionConfig(use_cache=False)
+    results_directory = f'{directory}/results'
+    sleep = SleepData(input_directory=f'{directory}/SLEEP', results_directory=results_directory,
+                      ingestion_config=ingestion_config)
+    activity = ActivityData(input_directory=f'{directory}/ACTIVITY', results_directory=results_directory,
+                            ingestion_config=ingestion_config)
+    sleep.transform_data_for_analysis()
+    activity.transform_data_for_analysis()
+
+    plotters = [SleepPlotter(sleep.ensure_columns(*SleepPlotter.required_columns),
+                             results_directory=results_directory, rollup=sleep.get_rollup()),
+                ActivityPlotter(activity.ensure_columns(*ActivityPlotter.required_columns),
+                                results_directory=results_directory, rollup=activity.get_rollup())]
+    Path(plotters[0].plots_directory).mkdir(parents=True, exist_ok=True)
+    plot_number = sum(len(plotter.plot_columns) for plotter in plotters)
+
+    print('threads\tplots\tseconds\tseconds per plot')
+    for worker_number in workers:
+        start_time = perf_counter()
+        with PlotRenderer(max_workers=worker_number, executor='thread') as plot_renderer:
+            for plotter in plotters:
+                for method in plotter.plot_columns:
+                    plot_renderer.submit(plotter, method)
+        elapsed_time = perf_counter() - start_time
+        print(f'{worker_number}\t{plot_number}\t{elapsed_time:.3f}\t{elapsed_time / plot_number:.4f}')
+
+
+def main(figures: int, days: int, workers: list[int]) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        measure_overhead(directory, figures)
+        measure_plots(directory, days, workers)
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    main(figures=args.figures, days=args.days, workers=args.workers)
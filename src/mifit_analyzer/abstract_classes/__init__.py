@@ -1,3 +1,7 @@
-from .mifit_abstract import MiFitDataAbstract, convert_csv_to_markdown
+from .derived_column import DerivedColumn
+from .mifit_abstract import MiFitDataAbstract
+from .figure_pool import FigurePool, pyplot_lock
 from .plotter_abstract import PlotterAbstract, ActivityPlotterAbstract
+from .plot_cache import PLOT_CACHE_FORMAT_VERSION, PlotCache
+from .plot_renderer import PlotRenderer, plot_executors, render_plot
 from .report_plotter_abstract import ReportPlotterAbstract, markdown_text
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class DerivedColumn:
+    name: str
+    dependencies: tuple[str, ...]
+    method: str
+    arguments: tuple = ()
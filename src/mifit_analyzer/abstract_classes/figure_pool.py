@@ -0,0 +1,74 @@
+from contextlib import contextmanager
+from pathlib import Path
+import threading
+from typing import Callable, Iterator
+
+import matplotlib as mpl
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+
+# the rc parameters of the subplot positions are named after the arguments of SubplotParams.update
+subplot_prefix = 'figure.subplot.'
+
+# the figure-level functions of seaborn only draw through pyplot, which keeps global state
+pyplot_lock = threading.Lock()
+
+
+class FigurePool:
+
+    def __init__(self, style: str = 'whitegrid') -> None:
+        self.style = style
+        self.is_style_applied = False
+        self.style_lock = threading.Lock()
+
+        # every thread recycles its own figures, one per figure size
+        self.local = threading.local()
+
+    def __repr__(self) -> str:
+        cls_name = type(self).__name__
+        return f"{cls_name}(style='{self.style}')"
+
+    def apply_style(self) -> None:
+        # the style is read by the artists when they are created, so it is set once before the first plot
+        with self.style_lock:
+            if not self.is_style_applied:
+                sns.set_style(self.style)
+                self.is_style_applied = True
+
+    def get_figure(self, figsize: tuple[float, float]) -> Figure:
+        figures = self.local.__dict__.setdefault('figures', {})
+        figure = figures.pop(figsize, None)
+        if figure is None:
+            figure = Figure(figsize=figsize)
+            FigureCanvasAgg(figure)
+        return figure
+
+    def recycle_figure(self, figure: Figure, figsize: tuple[float, float]) -> None:
+        figure.clear()
+        # tight_layout moves the subplots of a figure, which is kept after it is cleared
+        figure.set_layout_engine(None)
+        figure.subplotpars.update(**{name.removeprefix(subplot_prefix): value for name, value in mpl.rcParams.items()
+                                     if name.startswith(subplot_prefix)})
+        self.local.figures[figsize] = figure
+
+    @contextmanager
+    def figure(self, path: Path, figsize: tuple[float, float], nrows: int = 1, ncols: int = 1) -> Iterator[tuple]:
+        self.apply_style()
+        figure = self.get_figure(figsize)
+        try:
+            yield figure, figure.subplots(nrows=nrows, ncols=ncols)
+            figure.savefig(path)
+        finally:
+            self.recycle_figure(figure, figsize)
+
+    def save_pyplot_figure(self, path: Path, draw: Callable[[], Figure]) -> None:
+        self.apply_style()
+        with pyplot_lock:
+            figure = draw()
+            try:
+                figure.savefig(path)
+            finally:
+                plt.close(figure)
@@ -1,63 +1,99 @@
 from abc import ABC, abstractmethod
-import glob
+from collections import OrderedDict
 from datetime import datetime
+from functools import partial
 import logging
 from pathlib import Path
 from pympler import asizeof
-import subprocess
 
+import numpy as np
 import pandas as pd
 
-
-def convert_csv_to_markdown(csv_file: str) -> None:
-    arg_list = ['pandoc', '-f', 'csv', '-t', 'markdown',
-                '-s', f'{csv_file}.csv',
-                '-o', f'{csv_file}.md']
-    stream = subprocess.Popen(arg_list, stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding='utf-8')
-    out, err = stream.communicate()
+from abstract_classes.derived_column import DerivedColumn
+from analytics import ROLLUP_FORMAT_VERSION, Rollup, StreakSummary, find_threshold_streaks, get_rollup
+from calendar_features import CalendarFeatures, get_calendar_features
+from ingestion import CsvSource, DateIndex, DtypeSchema, FrameCache, IngestionConfig, WatermarkStore, \
+    apply_dtypes, deduplicate, get_arrow_dtypes, get_default_memory_usage_mb, get_memory_usage_mb, get_source_ranks, \
+    is_parquet_available, list_archive_sources, list_csv_sources, map_in_pool, read_csv_file_in_date_range, \
+    read_csv_header
+from markdown_tables import write_table
+from mifit_statistics import StatisticsStore, get_statistics_table
+from time_zones import TimeZoneTimeline
+
+
+def get_date_indexed(data: pd.DataFrame) -> pd.DataFrame:
+    if not data.date.is_monotonic_increasing:
+        data = data.sort_values(by='date', kind='stable')
+    # the index mirrors the date column, so it is left unnamed to keep 'date' unambiguous
+    data.index = pd.DatetimeIndex(data.date, name=None)
+    return data
 
 
-def read_my_csv_file(path: str) -> pd.DataFrame:
-    data = pd.read_csv(path, index_col=None, header=0)
-    return data
+def slice_date_range(data: pd.DataFrame, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    # the index is sorted, so the bounds are found by binary search and the rows are sliced without a mask
+    start = data.index.searchsorted(start_date, side='left')
+    stop = data.index.searchsorted(end_date, side='right')
+    return data.iloc[start:stop]
 
 
 class MiFitDataAbstract(ABC):
 
-    day_of_the_week_names = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+    dtype_schema = DtypeSchema()
+
+    key_columns: tuple[str, ...] = ('date',)
+
+    derived_columns: tuple[DerivedColumn, ...] = ()
 
-    month_names = ('January', 'February', 'March', 'April', 'May', 'June',
-                   'July', 'August', 'September', 'October', 'November', 'December')
+    statistics_columns: dict[str, str] = {}
+
+    rollup_groupings: dict[str, tuple[str, ...]] = {}
+
+    export_name = ''
 
     def __init__(self, input_directory: str = '/mnt/c/mifit_data/mifit_analyzer/data',
                  start_date: str | None = None, end_date: str | None = None,
                  date_format: str = '%Y.%m.%d',
                  results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results',
-                 hours_difference: int = 0
+                 hours_difference: int = 0,
+                 ingestion_config: IngestionConfig | None = None,
+                 time_zone_timeline: TimeZoneTimeline | None = None
                  ) -> None:
         self.input_directory = input_directory.removesuffix('/')
-        self.results_directory = results_directory.removesuffix('/')
-        self.plots_directory = f'{results_directory}/plots/'
-        self.statistics_directory = f'{results_directory}/statistics'
+        self.init_state(results_directory, ingestion_config)
 
-        self.statistics_file_name = f'{self.statistics_directory}/abstract_statistics'
-
-        self.start_date = start_date
-        self.end_date = end_date
         self.hours_difference = hours_difference
+        self.time_zone_timeline = time_zone_timeline
         self.date_format = date_format
+        # the requested bounds are parsed once, the bounds that are not given are taken from the data after reading
+        self.requested_start_date = self.parse_date(start_date)
+        self.requested_end_date = self.parse_date(end_date)
+
+        self.sources = self.get_sources()
+        self.watermark_store = self.get_watermark_store()
+        self.frame_cache = self.get_frame_cache() if self.watermark_store is None else None
+        self.cache_key = None if self.frame_cache is None else self.frame_cache.make_key(
+            type(self).__name__, self.sources,
+            {**self.get_parse_parameters(), 'read_date_range': self.get_read_date_range()},
+            verify_content=self.ingestion_config.verify_cache)
+
+        cached_data = None
+        if self.frame_cache is not None and not self.ingestion_config.rebuild_cache:
+            cached_data = self.frame_cache.load(self.cache_key)
+
+        if self.watermark_store is not None:
+            self.data: pd.DataFrame = self.read_new_csv_files(self.watermark_store)
+            self.is_transformed = True
+        elif cached_data is not None:
+            self.data = cached_data
+            self.is_transformed = True
+        else:
+            self.data = self.read_all_csv_files()
+            self.transform_time_columns_to_datetime()
+            self.is_transformed = False
 
-        self.data: pd.DataFrame = self.read_all_csv_files()
-
-        self.transform_time_columns_to_datetime()
-
-        self.date_min: datetime = self.data.date.min()
-        self.date_max: datetime = self.data.date.max()
-
+        self.set_date_index()
         self.set_start_date_and_end_date()
 
-        self.is_prepared = False
-
     def __len__(self) -> int:
         return self.data.shape[0]
 
@@ -74,52 +110,387 @@ class MiFitDataAbstract(ABC):
         logging.info(f"{self}")
         logging.info(f"{self.get_size()}")
 
-    def set_start_date_and_end_date(self):
-        if self.start_date is None:
-            self.start_date = self.date_min
-        else:
-            self.start_date: datetime = datetime.strptime(self.start_date, self.date_format)
+    def parse_date(self, date: str | None) -> datetime | None:
+        return None if date is None else datetime.strptime(date, self.date_format)
 
-        if self.end_date is None:
-            self.end_date = self.date_max
-        else:
-            self.end_date: datetime = datetime.strptime(self.end_date, self.date_format)
+    def init_state(self, results_directory: str, ingestion_config: IngestionConfig | None) -> None:
+        # the state shared by the datasets read from csv files and the datasets derived from them
+        self.results_directory = results_directory.removesuffix('/')
+        self.plots_directory = f'{results_directory}/plots/'
+        self.statistics_directory = f'{results_directory}/statistics'
+
+        self.statistics_file_name = f'{self.statistics_directory}/abstract_statistics'
+
+        self.ingestion_config = ingestion_config if ingestion_config is not None else IngestionConfig()
+        self.reset_derived_columns()
+        self.statistics: pd.DataFrame | None = None
+        self.rollup: Rollup | None = None
+
+        self.duplicates_number = 0
+        self.watermark_store = None
+        self.frame_cache = None
+        self.cache_key = None
+
+        self.is_transformed = False
+        self.is_prepared = False
+
+    def set_start_date_and_end_date(self) -> None:
+        self.date_min: datetime = self.data.index[0] if len(self.data) else pd.NaT
+        self.date_max: datetime = self.data.index[-1] if len(self.data) else pd.NaT
+
+        self.start_date: datetime = self.date_min if self.requested_start_date is None else self.requested_start_date
+        self.end_date: datetime = self.date_max if self.requested_end_date is None else self.requested_end_date
+
+    def get_sources(self) -> list[CsvSource]:
+        if not self.ingestion_config.input_archives:
+            return list_csv_sources(self.input_directory)
+
+        # ZipCrypto decryption holds the GIL, so encrypted archives only scale with process workers
+        return list_archive_sources(self.ingestion_config.input_archives, self.export_name,
+                                    password=self.ingestion_config.archive_password)
+
+    def get_parse_parameters(self) -> dict:
+        return {'date_format': self.date_format, 'dedup_policy': self.ingestion_config.dedup_policy,
+                'engine': self.ingestion_config.engine}
+
+    def get_transform_parameters(self) -> dict:
+        return {'hours_difference': self.hours_difference, **self.get_parse_parameters()}
+
+    def get_read_date_range(self) -> tuple[str | None, str | None]:
+        start_date = None if self.requested_start_date is None else self.requested_start_date.strftime('%Y-%m-%d')
+        end_date = None if self.requested_end_date is None else self.requested_end_date.strftime('%Y-%m-%d')
+        return start_date, end_date
+
+    def get_cache_directory(self) -> str:
+        if self.ingestion_config.cache_directory is not None:
+            return self.ingestion_config.cache_directory.removesuffix('/')
+        return f'{self.results_directory}/cache'
+
+    def get_watermark_store(self) -> WatermarkStore | None:
+        if not self.ingestion_config.incremental:
+            return None
+
+        if not is_parquet_available():
+            logging.warning('pyarrow is not installed, the incremental mode is disabled')
+            return None
+
+        return WatermarkStore(store_directory=f'{self.get_cache_directory()}/incremental/{type(self).__name__}',
+                              parameters=self.get_parse_parameters())
+
+    def get_frame_cache(self) -> FrameCache | None:
+        if not self.ingestion_config.use_cache:
+            return None
+
+        if not is_parquet_available():
+            logging.warning('pyarrow is not installed, the frame cache is disabled')
+            return None
+
+        return FrameCache(cache_directory=self.get_cache_directory(),
+                          max_size_mb=self.ingestion_config.cache_max_size_mb)
 
-    @abstractmethod
     def transform_data_for_analysis(self) -> None:
-        self.add_new_columns()
+        if not self.is_transformed:
+            self.apply_derived_dtypes()
+            self.is_transformed = True
+
+            if self.frame_cache is not None:
+                self.frame_cache.save(self.cache_key, self.data)
+
         self.select_date_range()
+        self.statistics = None
+        self.rollup = None
         self.create_service_directories()
 
         self.is_prepared = True
 
+    def set_date_index(self) -> None:
+        self.data = get_date_indexed(self.data)
+
+    def reset_derived_columns(self) -> None:
+        self.derived_column_sizes: OrderedDict[str, float] = OrderedDict()
+        self.calendar_features: dict[str, CalendarFeatures] = {}
+
+    def ensure_columns(self, *columns: str) -> pd.DataFrame:
+        computed_columns: list[str] = []
+        for column in columns:
+            self.materialize_column(column, computed_columns)
+
+        if computed_columns:
+            logging.info(f'{type(self).__name__} computed derived columns: {", ".join(computed_columns)}')
+
+        self.evict_derived_columns(keep=set(columns))
+        return self.data[list(columns)]
+
+    def materialize_column(self, column: str, computed_columns: list[str]) -> None:
+        if column in self.data.columns:
+            if column in self.derived_column_sizes:
+                self.derived_column_sizes.move_to_end(column)
+            return
+
+        derived_column = {derived.name: derived for derived in self.derived_columns}.get(column)
+        if derived_column is None:
+            raise KeyError(f"{type(self).__name__} has neither a column nor a derived column '{column}'")
+
+        derived_key = self.get_derived_column_key(column)
+        cached_column = None
+        if self.frame_cache is not None and derived_key is not None and not self.ingestion_config.rebuild_cache:
+            cached_column = self.frame_cache.load(derived_key)
+
+        if cached_column is not None:
+            values = cached_column[column].set_axis(self.data.index)
+        else:
+            for dependency in derived_column.dependencies:
+                self.materialize_column(dependency, computed_columns)
+
+            values = getattr(self, derived_column.method)(*derived_column.arguments)
+            dtype = self.get_dtypes(self.dtype_schema.derived_dtypes).get(column)
+            if dtype is not None:
+                values = values.astype(dtype)
+
+            if self.frame_cache is not None and derived_key is not None:
+                self.frame_cache.save(derived_key, values.to_frame(column))
+            computed_columns.append(column)
+
+        self.data[column] = values
+        self.derived_column_sizes[column] = values.memory_usage(index=False, deep=True) / 1024 / 1024
+
+    def get_derived_column_key(self, column: str) -> str | None:
+        if self.frame_cache is None or self.cache_key is None:
+            return None
+
+        # a derived column is kept next to the parsed frame it is computed from, under the parameters
+        # that only change the derived columns, e.g. the time zones of the real times
+        time_zone_timeline = None if self.time_zone_timeline is None else self.time_zone_timeline.get_entries()
+        return FrameCache.make_key(f'{type(self).__name__}_{column}', [],
+                                   {'data': self.cache_key, 'hours_difference': self.hours_difference,
+                                    'time_zone_timeline': time_zone_timeline,
+                                    'date_range': (str(self.start_date), str(self.end_date)),
+                                    'rows': len(self.data)})
+
+    def evict_derived_columns(self, keep: set[str]) -> None:
+        max_size_mb = self.ingestion_config.derived_columns_max_size_mb
+        if max_size_mb is None:
+            return
+
+        evicted_columns = []
+        total_size_mb = sum(self.derived_column_sizes.values())
+        for column in list(self.derived_column_sizes):
+            if total_size_mb <= max_size_mb:
+                break
+            if column in keep:
+                continue
+            total_size_mb -= self.derived_column_sizes.pop(column)
+            evicted_columns.append(column)
+
+        if evicted_columns:
+            # a new frame is made, so frames already handed out keep their columns
+            self.data = self.data.drop(columns=evicted_columns)
+            logging.info(f'{type(self).__name__} evicted derived columns {", ".join(evicted_columns)} '
+                         f'to stay within {max_size_mb} Mb')
+
+    def get_calendar_features(self, column: str) -> CalendarFeatures:
+        calendar_features = self.calendar_features.get(column)
+        if calendar_features is None or calendar_features.index is not self.data.index:
+            calendar_features = get_calendar_features(self.data[column])
+            self.calendar_features[column] = calendar_features
+        return calendar_features
+
+    def get_weekday(self, column: str) -> pd.Series:
+        return self.get_calendar_features(column).get_weekday()
+
+    def get_month(self, column: str) -> pd.Series:
+        return self.get_calendar_features(column).get_month()
+
+    def get_year(self, column: str) -> pd.Series:
+        return self.get_calendar_features(column).get_year()
+
+    def get_weekday_name(self, column: str) -> pd.Series:
+        return self.get_calendar_features(column).get_weekday_name()
+
+    def get_month_name(self, column: str) -> pd.Series:
+        return self.get_calendar_features(column).get_month_name()
+
     @abstractmethod
     def transform_time_columns_to_datetime(self) -> None:
-        self.data['date'] = pd.to_datetime(self.data['date'], unit='s')
+        self.data['date'] = self.convert_to_datetime(self.data['date'], unit='s')
+
+    def convert_to_datetime(self, values: pd.Series, unit: str | None = None) -> pd.Series:
+        if self.ingestion_config.engine != 'arrow':
+            return pd.to_datetime(values, unit=unit)
+
+        # integer seconds and date32 days are cast to arrow timestamps without going through numpy,
+        # while times of day are placed on the current date the same way as by the c engine
+        if values.dtype == 'time32[s][pyarrow]':
+            values = pd.Timestamp.today().normalize() + pd.to_timedelta(values.astype('int32[pyarrow]'), unit='s')
+        elif pd.api.types.is_string_dtype(values):
+            values = pd.to_datetime(values, unit=unit)
+        return values.astype('timestamp[s][pyarrow]')
+
+    def get_dtypes(self, dtypes: dict[str, str]) -> dict[str, str]:
+        if self.ingestion_config.engine == 'arrow':
+            return get_arrow_dtypes(dtypes)
+        return dtypes
+
+    def find_streaks(self, column: str, threshold: float, min_length: int = 1) -> StreakSummary:
+        return find_threshold_streaks(self.ensure_columns(column), column, threshold, min_length=min_length)
+
+    def get_statistics(self) -> pd.DataFrame:
+        if self.statistics is None:
+            self.statistics = self.get_statistics_table(self.statistics_columns).round(2)
+        return self.statistics
 
-    @abstractmethod
     def write_statistics_to_csv(self) -> None:
-        pass
+        write_table(self.get_statistics(), self.statistics_file_name)
+
+    def get_statistics_table(self, columns: dict[str, str]) -> pd.DataFrame:
+        statistics_store = self.get_statistics_store()
+        if statistics_store is None or self.watermark_store is None:
+            statistics_table = self.get_rollup().get_statistics_table(list(columns))
+        else:
+            statistics = statistics_store.get_statistics(self.ensure_columns(*columns), list(columns),
+                                                         self.watermark_store.get_watermark_date())
+            statistics_table = get_statistics_table(statistics)
+
+        statistics_table.columns = list(columns.values())
+        return statistics_table
+
+    def get_statistics_store(self) -> StatisticsStore | None:
+        # the stored statistics only describe the whole history kept in the watermark store
+        if self.watermark_store is None or self.start_date > self.date_min or self.end_date < self.date_max:
+            return None
+
+        time_zone_timeline = None if self.time_zone_timeline is None else self.time_zone_timeline.get_entries()
+        return StatisticsStore(path=f'{self.statistics_file_name}_state.json',
+                               parameters={**self.get_transform_parameters(), 'time_zone_timeline': time_zone_timeline,
+                                           'history_revision': self.watermark_store.get_history_revision()})
+
+    def get_rollup(self) -> Rollup:
+        if self.rollup is None:
+            self.rollup = self.build_rollup()
+        return self.rollup
+
+    def build_rollup(self) -> Rollup:
+        frame_cache = self.get_frame_cache()
+        rollup_key = None if frame_cache is None else self.get_rollup_key()
+        if frame_cache is not None and rollup_key is not None and not self.ingestion_config.rebuild_cache:
+            table = frame_cache.load(rollup_key)
+            if table is not None:
+                return Rollup(table=table)
+
+        columns = list(self.statistics_columns)
+        grouping_columns = list(dict.fromkeys(column for grouping_columns in self.rollup_groupings.values()
+                                              for column in grouping_columns))
+        rollup = get_rollup(self.ensure_columns(*columns, *grouping_columns), columns, self.rollup_groupings)
+        logging.info(f'{type(self).__name__} rollup has {len(rollup)} groups')
+
+        if frame_cache is not None and rollup_key is not None:
+            frame_cache.save(rollup_key, rollup.table)
+        return rollup
+
+    def get_rollup_key(self) -> str | None:
+        # the rollup is keyed by the fingerprint of the data it is built from, so the input files are not hashed again
+        data_fingerprint = self.cache_key if self.watermark_store is None else self.watermark_store.watermark
+        if data_fingerprint is None:
+            return None
+
+        time_zone_timeline = None if self.time_zone_timeline is None else self.time_zone_timeline.get_entries()
+        return FrameCache.make_key(f'{type(self).__name__}_rollup', [],
+                                   {'version': ROLLUP_FORMAT_VERSION, 'data': data_fingerprint,
+                                    'date_range': (str(self.start_date), str(self.end_date)),
+                                    'time_zone_timeline': time_zone_timeline,
+                                    'columns': list(self.statistics_columns), 'groupings': self.rollup_groupings})
 
     def read_all_csv_files(self) -> pd.DataFrame:
-        all_csv_files = glob.glob(f'{self.input_directory}/*.csv')
-        df_list = []
+        self.check_sources()
+        start_date, end_date = self.get_read_date_range()
+        return self.read_csv_sources(self.sources, start_date, end_date)
+
+    def check_sources(self) -> None:
+        if not self.sources:
+            raise FileNotFoundError(f'{type(self).__name__} has found no {self.export_name} csv files to read')
+
+    def read_new_csv_files(self, watermark_store: WatermarkStore) -> pd.DataFrame:
+        self.check_sources()
+        new_sources = watermark_store.get_new_sources(self.sources)
+        logging.info(f'{type(self).__name__} has {len(new_sources)} new files since the last run')
+
+        if new_sources:
+            # exports repeat the whole history, the store merges the rows before the watermark that differ
+            # from the stored ones with the dedup policy, so the store matches a full rebuild
+            self.data = self.read_csv_sources(new_sources, None, None)
+        else:
+            # a store without rows is loaded with the columns of the input files, read from their header
+            self.data = read_csv_header(self.sources[0], dtype=self.get_dtypes(self.dtype_schema.read_dtypes),
+                                        engine=self.ingestion_config.engine)
+        self.transform_time_columns_to_datetime()
+        self.apply_derived_dtypes()
+
+        if not new_sources:
+            return watermark_store.load(self.data)
+        return watermark_store.append(self.data, new_sources, self.key_columns,
+                                      policy=self.ingestion_config.dedup_policy)
+
+    def read_csv_sources(self, all_sources: list[CsvSource], start_date: str | None,
+                         end_date: str | None) -> pd.DataFrame:
+        date_index = DateIndex(f'{self.get_cache_directory()}/date_index/{type(self).__name__}.json')
 
-        for filename in all_csv_files:
-            df = pd.read_csv(filename, index_col=None, header=0)
+        sources = [source for source in all_sources if not date_index.is_outside(source, start_date, end_date)]
+        logging.info(f'{type(self).__name__} date index skipped {len(all_sources) - len(sources)} '
+                     f'of {len(all_sources)} files outside the requested date range')
+
+        read_dtypes = self.get_dtypes(self.dtype_schema.read_dtypes)
+        read_file = partial(read_csv_file_in_date_range, dtype=read_dtypes, start_date=start_date,
+                            end_date=end_date, chunk_size=self.ingestion_config.chunk_size,
+                            engine=self.ingestion_config.engine)
+        results = map_in_pool(read_file, sources,
+                              workers=self.ingestion_config.workers, executor=self.ingestion_config.executor)
+
+        df_list = []
+        for source, (df, date_min, date_max) in zip(sources, results):
+            if date_min is not None:
+                date_index.update(source, date_min, date_max)
             df_list.append(df)
+        date_index.save()
+
+        if not df_list and all_sources:
+            df_list.append(read_csv_header(all_sources[0], dtype=read_dtypes, engine=self.ingestion_config.engine))
 
         df = pd.concat(df_list, axis=0, ignore_index=True)
+
+        df = self.deduplicate(df, sources, [len(result[0]) for result in results])
+
+        logging.info(f'{type(self).__name__} data read with compact dtypes takes '
+                     f'{get_memory_usage_mb(df):.2f} Mb instead of '
+                     f'{get_default_memory_usage_mb(df, self.dtype_schema.read_dtypes):.2f} Mb')
         return df
 
+    def deduplicate(self, data: pd.DataFrame, sources: list[CsvSource], lengths: list[int]) -> pd.DataFrame:
+        ranks = get_source_ranks(self.sources)
+        source_ranks = np.repeat([ranks[source.key] for source in sources], lengths)
+
+        data, duplicates_number = deduplicate(data, self.key_columns, source_ranks,
+                                              policy=self.ingestion_config.dedup_policy)
+        self.duplicates_number += duplicates_number
+
+        logging.info(f'{type(self).__name__} deduplication by {", ".join(self.key_columns)} with the '
+                     f"'{self.ingestion_config.dedup_policy}' policy removed {duplicates_number} of "
+                     f'{len(data) + duplicates_number} rows')
+        return data
+
+    def apply_derived_dtypes(self) -> None:
+        memory_usage_before = get_memory_usage_mb(self.data)
+        self.data = apply_dtypes(self.data, self.get_dtypes(self.dtype_schema.derived_dtypes))
+        logging.info(f'{type(self).__name__} data with derived columns takes '
+                     f'{get_memory_usage_mb(self.data):.2f} Mb instead of {memory_usage_before:.2f} Mb')
+
     def create_service_directories(self) -> None:
         Path(self.statistics_directory).mkdir(parents=True, exist_ok=True)
         Path(self.plots_directory).mkdir(parents=True, exist_ok=True)
 
     def select_date_range(self) -> None:
         if self.start_date != self.date_min or self.end_date != self.date_max:
-            self.data = self.data[(self.data.date >= self.start_date) &
-                                  (self.data.date <= self.end_date)]
+            self.data = slice_date_range(self.data, self.start_date, self.end_date)
+            self.calendar_features.clear()
 
     def get_size(self) -> str:
         size_in_mb = asizeof.asizeof(self) / 1024 / 1024
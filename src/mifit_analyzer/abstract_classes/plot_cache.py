@@ -0,0 +1,160 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+import sys
+import time
+
+import matplotlib as mpl
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from abstract_classes import figure_pool, plotter_abstract
+from abstract_classes.plotter_abstract import PlotterAbstract
+from analytics import rollup
+
+
+PLOT_CACHE_FORMAT_VERSION = 1
+
+# the modules every plot is drawn with besides the module of its plot method
+rendering_modules = (figure_pool, plotter_abstract, rollup)
+
+# the backend does not change the png files, which are always written by an Agg canvas
+ignored_rc_parameters = ('backend', 'backend_fallback')
+
+
+def get_frame_hash(data: pd.DataFrame) -> str:
+    frame_hash = hashlib.blake2b(digest_size=16)
+    frame_hash.update(json.dumps([list(data.columns), [str(dtype) for dtype in data.dtypes]]).encode('utf-8'))
+    frame_hash.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return frame_hash.hexdigest()
+
+
+class PlotCache:
+
+    def __init__(self, cache_directory: str, max_size_mb: int = 128, rebuild: bool = False) -> None:
+        self.cache_directory = cache_directory.removesuffix('/')
+        self.manifest_file_name = f'{self.cache_directory}/manifest.json'
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.rebuild = rebuild
+        self.hits = 0
+        self.misses = 0
+        self.rollup_hashes: dict[int, str] = {}
+        self.code_hashes: dict[str, str] = {}
+
+        Path(self.cache_directory).mkdir(parents=True, exist_ok=True)
+        self.manifest = self.read_manifest()
+
+    def __repr__(self) -> str:
+        cls_name = type(self).__name__
+        return f"{cls_name}(cache_directory='{self.cache_directory}', " \
+               f"max_size_mb={self.max_size_bytes // 1024 // 1024})"
+
+    def read_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_file_name):
+            return {'version': PLOT_CACHE_FORMAT_VERSION, 'plots': {}}
+
+        with open(self.manifest_file_name) as file:
+            manifest = json.load(file)
+
+        if manifest.get('version') != PLOT_CACHE_FORMAT_VERSION:
+            return {'version': PLOT_CACHE_FORMAT_VERSION, 'plots': {}}
+        return manifest
+
+    def save_manifest(self) -> None:
+        with open(f'{self.manifest_file_name}.tmp', 'w') as file:
+            json.dump(self.manifest, file, indent=1)
+        os.replace(f'{self.manifest_file_name}.tmp', self.manifest_file_name)
+
+    def get_rollup_hash(self, plotter: PlotterAbstract) -> str | None:
+        if plotter.rollup is None:
+            return None
+
+        # a rollup is shared by all plots of a plotter, so it is hashed once
+        rollup_hash = self.rollup_hashes.get(id(plotter.rollup))
+        if rollup_hash is None:
+            table = plotter.rollup.table
+            fliers = [np.asarray(group_fliers, dtype=np.float64) for group_fliers in table.fliers]
+            rollup_hash = get_frame_hash(table.drop(columns='fliers').assign(
+                fliers_number=[len(group_fliers) for group_fliers in fliers]))
+            rollup_hash += hashlib.blake2b(np.concatenate([np.zeros(0), *fliers]).tobytes(),
+                                           digest_size=16).hexdigest()
+            self.rollup_hashes[id(plotter.rollup)] = rollup_hash
+        return rollup_hash
+
+    def get_code_hash(self, plotter: PlotterAbstract, method: str) -> str:
+        plot = f'{type(plotter).__name__}.{method}'
+        code_hash = self.code_hashes.get(plot)
+        if code_hash is None:
+            plot_module = sys.modules[getattr(type(plotter), method).__module__]
+            sources = [inspect.getsource(module) for module in (plot_module, *rendering_modules)]
+            code_hash = hashlib.blake2b(''.join(sources).encode('utf-8'), digest_size=16).hexdigest()
+            self.code_hashes[plot] = code_hash
+        return code_hash
+
+    def get_rc_parameters(self, plotter: PlotterAbstract) -> dict:
+        # the style of the figure pool is only applied before the first plot is drawn, so it is added here
+        rc_parameters = {**mpl.rcParams, **sns.axes_style(plotter.figure_pool.style)}
+        return {name: value for name, value in rc_parameters.items() if name not in ignored_rc_parameters}
+
+    def make_key(self, plotter: PlotterAbstract, method: str) -> str:
+        # the styling parameters are the attributes of the plotter besides its data, e.g. the axis labels
+        styling = {name: value for name, value in vars(plotter).items()
+                   if name not in ('data', 'rollup', 'results_directory', 'plots_directory')}
+        styling.update({name: getattr(plotter, name)
+                        for name in ('hour_axis_labels', 'title_fontsize', 'label_fontsize', 'plot_figsize')})
+
+        # the code version covers the plot method, the shared drawing helpers and the plotting libraries
+        fingerprint = {'version': PLOT_CACHE_FORMAT_VERSION,
+                       'plot': f'{type(plotter).__name__}.{method}',
+                       'code': self.get_code_hash(plotter, method),
+                       'libraries': (mpl.__version__, sns.__version__),
+                       'styling': styling,
+                       'rc_parameters': self.get_rc_parameters(plotter),
+                       'data': get_frame_hash(plotter.select_plot_columns(method).data),
+                       'rollup': self.get_rollup_hash(plotter) if method in plotter.rollup_plots else None}
+        return hashlib.blake2b(json.dumps(fingerprint, sort_keys=True, default=str).encode('utf-8'),
+                               digest_size=16).hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return f'{self.cache_directory}/{key}.png'
+
+    def load(self, key: str, plot_path: Path) -> bool:
+        entry = self.manifest['plots'].get(key)
+        if self.rebuild or entry is None or not os.path.exists(self.get_path(key)):
+            self.misses += 1
+            return False
+
+        shutil.copyfile(self.get_path(key), plot_path)
+        entry['last_used'] = time.time()
+        self.hits += 1
+        return True
+
+    def save(self, key: str, plot_path: Path) -> None:
+        shutil.copyfile(plot_path, f'{self.get_path(key)}.tmp')
+        os.replace(f'{self.get_path(key)}.tmp', self.get_path(key))
+        self.manifest['plots'][key] = {'plot': Path(plot_path).name, 'size': os.path.getsize(self.get_path(key)),
+                                       'last_used': time.time()}
+        self.evict()
+
+    def evict(self) -> None:
+        # the least recently used plots are removed first
+        entries = sorted(self.manifest['plots'].items(), key=lambda item: item[1]['last_used'])
+        cache_size = sum(entry['size'] for _, entry in entries)
+
+        while entries and cache_size > self.max_size_bytes:
+            key, entry = entries.pop(0)
+            cache_size -= entry['size']
+            del self.manifest['plots'][key]
+            Path(self.get_path(key)).unlink(missing_ok=True)
+            logging.info(f"Plot cache entry {entry['plot']} {key} has been evicted")
+
+    def flush(self) -> None:
+        # the size limit may have been lowered since the last run
+        self.evict()
+        self.save_manifest()
+        logging.info(f'Plot cache: {self.hits} hits, {self.misses} misses')
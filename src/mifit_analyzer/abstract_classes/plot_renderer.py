@@ -0,0 +1,83 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import multiprocessing
+from time import perf_counter
+from typing import Callable
+
+from abstract_classes.plotter_abstract import PlotterAbstract
+
+
+plot_executors = ('thread', 'process')
+
+
+def render_plot(plotter: PlotterAbstract, method: str) -> float:
+    start_time = perf_counter()
+    getattr(plotter, method)()
+    return perf_counter() - start_time
+
+
+class PlotRenderer:
+
+    def __init__(self, max_workers: int = 1, executor: str = 'thread') -> None:
+        if executor not in plot_executors:
+            raise ValueError(f"Unknown executor '{executor}', expected one of: {', '.join(plot_executors)}")
+
+        self.max_workers = max_workers
+        self.executor = executor
+        self.futures: dict[Future, tuple[str, Callable[[], None] | None]] = {}
+
+        # the plots are drawn on their own figures without pyplot, so they can share the threads of one process.
+        # Processes are spawned rather than forked because the report converter runs an event loop thread
+        self.pool: Executor | None = None
+        if max_workers > 1 and executor == 'thread':
+            self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        elif max_workers > 1:
+            self.pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def __repr__(self) -> str:
+        cls_name = type(self).__name__
+        return f"{cls_name}(max_workers={self.max_workers}, executor='{self.executor}')"
+
+    def __enter__(self) -> 'PlotRenderer':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def submit(self, plotter: PlotterAbstract, method: str, on_rendered: Callable[[], None] | None = None) -> None:
+        if self.pool is None:
+            render_plot(plotter, method)
+            if on_rendered is not None:
+                on_rendered()
+            return
+
+        # every worker gets a copy of the plotter with only the columns of its plot
+        future = self.pool.submit(render_plot, plotter.select_plot_columns(method), method)
+        self.futures[future] = (f'{type(plotter).__name__}.{method}', on_rendered)
+
+    def wait(self) -> None:
+        if not self.futures:
+            return
+
+        start_time = perf_counter()
+        futures, self.futures = self.futures, {}
+        render_time = 0.0
+        for future, (plot_name, on_rendered) in futures.items():
+            try:
+                render_time += future.result()
+            except Exception:
+                logging.error(f'{plot_name} could not be rendered')
+                raise
+            if on_rendered is not None:
+                on_rendered()
+
+        logging.info(f'{len(futures)} plots have been rendered by {self.max_workers} {self.executor} workers, '
+                     f'{render_time:.2f} seconds of rendering in total, the report waited '
+                     f'{perf_counter() - start_time:.2f} seconds for them')
+
+    def close(self) -> None:
+        try:
+            self.wait()
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown(cancel_futures=True)
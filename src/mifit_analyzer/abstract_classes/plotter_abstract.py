@@ -1,19 +1,46 @@
 from abc import ABC
+import colorsys
+import copy
 import logging
+from pathlib import Path
 from pympler import asizeof
 
+import matplotlib as mpl
+from matplotlib.axes import Axes
+import matplotlib.colors as mcolors
 import pandas as pd
+import seaborn as sns
+
+from abstract_classes.figure_pool import FigurePool
+from analytics import Rollup
+
+
+def get_axis_labels(values: pd.Series, step: int = 1) -> list[int]:
+    # an empty frame has no maximum, so its axis gets no labels
+    maximum = values.max()
+    return [] if pd.isna(maximum) else [i for i in range(0, int(maximum), step)]
 
 
 class PlotterAbstract(ABC):
 
+    required_columns: tuple[str, ...] = ()
+
+    # the columns every plot reads, the boxplots only read the rollup
+    plot_columns: dict[str, tuple[str, ...]] = {}
+    rollup_plots: tuple[str, ...] = ()
+
     hour_axis_labels = [i for i in range(0, 25, 2)]
     title_fontsize = 20
     label_fontsize = 16
     plot_figsize = (12, 8)
 
-    def __init__(self, data: pd.DataFrame, results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results'):
+    # the figures are drawn on Agg canvases without pyplot and recycled between the plots of a thread
+    figure_pool = FigurePool()
+
+    def __init__(self, data: pd.DataFrame, results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results',
+                 rollup: Rollup | None = None):
         self.data = data
+        self.rollup = rollup
 
         self.results_directory = '/mnt/c/mifit_data/mifit_analyzer/results'
         self.plots_directory = f'{results_directory}/plots/'
@@ -30,11 +57,48 @@ class PlotterAbstract(ABC):
         logging.info(f"{self}")
         logging.info(f"{self.get_size()}")
 
+    def get_plot_path(self, method: str) -> Path:
+        return Path(self.plots_directory, f"{method.removeprefix('make_')}.png")
+
+    def select_plot_columns(self, method: str) -> 'PlotterAbstract':
+        plotter = copy.copy(self)
+        plotter.data = self.data[list(self.plot_columns.get(method, self.required_columns))]
+        # the rollup holds the groups of all boxplots, so the other plots go without it
+        if method not in self.rollup_plots:
+            plotter.rollup = None
+        return plotter
+
+    def draw_boxplot(self, level: str, column: str, ax: Axes) -> None:
+        if self.rollup is None:
+            raise ValueError(f'{type(self).__name__} draws boxplots from a rollup, but none was given')
+
+        labels, box_statistics = self.rollup.get_box_statistics(level, column)
+
+        # the boxes are drawn from the precomputed quartiles and whiskers with the colors of seaborn boxplots
+        color = sns.desaturate(mpl.rcParams['axes.prop_cycle'].by_key()['color'][0], 0.75)
+        line_lightness = colorsys.rgb_to_hls(*mcolors.to_rgb(color))[1] * 0.6
+        line_color = (line_lightness, line_lightness, line_lightness)
+        positions = [position for position, statistics in enumerate(box_statistics) if statistics is not None]
+        ax.bxp([statistics for statistics in box_statistics if statistics is not None], positions=positions,
+               widths=0.8, capwidths=0.4, patch_artist=True, manage_ticks=False,
+               boxprops={'facecolor': color, 'edgecolor': line_color}, medianprops={'color': line_color},
+               whiskerprops={'color': line_color}, capprops={'color': line_color},
+               flierprops={'markeredgecolor': line_color})
+
+        if level == 'all':
+            ax.set_xticks([])
+        else:
+            ax.set_xticks(range(len(labels)), labels)
+        ax.set_xlim(-0.5, len(labels) - 0.5)
+        ax.xaxis.grid(False)
+        ax.set_ylabel(column)
+
 
 class ActivityPlotterAbstract(PlotterAbstract):
 
-    def __init__(self, data: pd.DataFrame, results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results'):
-        super().__init__(data, results_directory)
+    def __init__(self, data: pd.DataFrame, results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results',
+                 rollup: Rollup | None = None):
+        super().__init__(data, results_directory, rollup)
 
-        self.steps_axis_labels = [i for i in range(0, self.data.steps.max(), 2000)]
-        self.distance_axis_labels = [i for i in range(0, self.data.distance.max(), 2000)]
+        self.steps_axis_labels = get_axis_labels(self.data.steps, 2000)
+        self.distance_axis_labels = get_axis_labels(self.data.distance, 2000)
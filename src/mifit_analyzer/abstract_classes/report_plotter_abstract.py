@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
+from functools import partial
 import logging
 from pympler import asizeof
 
+from abstract_classes.plot_cache import PlotCache
+from abstract_classes.plot_renderer import PlotRenderer
 from abstract_classes.plotter_abstract import PlotterAbstract
 
 
@@ -10,10 +13,13 @@ markdown_text = str
 
 class ReportPlotterAbstract(ABC):
 
-    def __init__(self, plotter: PlotterAbstract, markdown_plots_list: list[markdown_text]):
+    def __init__(self, plotter: PlotterAbstract, markdown_plots_list: list[markdown_text],
+                 plot_renderer: PlotRenderer | None = None, plot_cache: PlotCache | None = None):
         self.plotter = plotter
         self.plots_directory = plotter.plots_directory
         self.markdown_plots_list = markdown_plots_list
+        self.plot_renderer = plot_renderer
+        self.plot_cache = plot_cache
 
     def __repr__(self) -> str:
         cls_name = type(self).__name__
@@ -26,6 +32,24 @@ class ReportPlotterAbstract(ABC):
         plot_markdown = f"![image]({plot_path})"
         return plot_name, plot_markdown
 
+    def make_plot(self, method: str) -> None:
+        # a plot is only rendered or submitted here, the report plotters add its markdown in their own order,
+        # which does not depend on the order in which the plots are finished
+        on_rendered = None
+        if self.plot_cache is not None:
+            plot_key = self.plot_cache.make_key(self.plotter, method)
+            plot_path = self.plotter.get_plot_path(method)
+            if self.plot_cache.load(plot_key, plot_path):
+                return
+            on_rendered = partial(self.plot_cache.save, plot_key, plot_path)
+
+        if self.plot_renderer is None:
+            getattr(self.plotter, method)()
+            if on_rendered is not None:
+                on_rendered()
+        else:
+            self.plot_renderer.submit(self.plotter, method, on_rendered)
+
     def make_logging_message(self):
         logging.info(f"{self}")
         logging.info(f"{self.get_size()}")
@@ -1,58 +1,50 @@
-from abstract_classes.mifit_abstract import MiFitDataAbstract, convert_csv_to_markdown
+import pandas as pd
+
+from abstract_classes.derived_column import DerivedColumn
+from abstract_classes.mifit_abstract import MiFitDataAbstract
+from analytics import StreakSummary, get_rolling_goal_rates, get_rolling_means, rolling_windows
+from ingestion import DtypeSchema, IngestionConfig
 
 
 class ActivityData(MiFitDataAbstract):
 
+    export_name = 'ACTIVITY'
+
+    dtype_schema = DtypeSchema(
+        read_dtypes={'steps': 'int32', 'distance': 'int32', 'runDistance': 'int32', 'calories': 'uint16'},
+        derived_dtypes={'date_weekday': 'int8', 'date_month': 'int8', 'year': 'int16'})
+
+    derived_columns = (
+        DerivedColumn('date_weekday', ('date',), 'get_weekday', ('date',)),
+        DerivedColumn('date_month', ('date',), 'get_month', ('date',)),
+        DerivedColumn('year', ('date',), 'get_year', ('date',)),
+        DerivedColumn('date_weekday_name', ('date',), 'get_weekday_name', ('date',)),
+        DerivedColumn('date_month_name', ('date',), 'get_month_name', ('date',)))
+
+    statistics_columns = {'steps': 'Steps', 'distance': 'Distance', 'runDistance': 'Run distance',
+                          'calories': 'Calories'}
+
+    rollup_groupings = {'weekday': ('date_weekday_name',), 'month': ('date_month_name',), 'year': ('year',),
+                        'weekday_month': ('date_weekday_name', 'date_month_name')}
+
     def __init__(self, input_directory: str = '/mnt/c/mifit_data/mifit_analyzer/data/ACTIVITY',
                  start_date: str | None = None, end_date: str | None = None, date_format: str = '%Y.%m.%d',
                  results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results',
-                 ) -> None:
+                 ingestion_config: IngestionConfig | None = None) -> None:
 
-        super().__init__(input_directory, start_date, end_date, date_format, results_directory)
+        super().__init__(input_directory, start_date, end_date, date_format, results_directory,
+                         ingestion_config=ingestion_config)
         self.statistics_file_name = f'{self.statistics_directory}/activity_statistics'
 
-    def transform_data_for_analysis(self) -> None:
-        self.transform_time_columns_to_datetime()
-        self.add_new_columns()
-        self.select_date_range()
-        self.create_service_directories()
-
-        self.is_prepared = True
-
     def transform_time_columns_to_datetime(self) -> None:
         super().transform_time_columns_to_datetime()
 
-    def add_new_columns(self) -> None:
-        self.get_days_and_month_from_date()
-        self.get_days_and_month_names()
-        self.set_the_order_of_days_and_months()
-
-    def get_days_and_month_from_date(self) -> None:
-        self.data['date_weekday'] = self.data['date'].dt.dayofweek
-        self.data['date_month'] = self.data['date'].dt.month
-        self.data['year'] = self.data['date'].dt.year
-
-    def get_days_and_month_names(self) -> None:
-        self.data['date_weekday_name'] = self.data['date'].dt.day_name()
-        self.data['date_month_name'] = self.data['date'].dt.month_name()
-
-    def set_the_order_of_days_and_months(self) -> None:
-        self.data['date_weekday_name'] = self.data['date_weekday_name'].astype('category')
-        self.data['date_weekday_name'] = self.data['date_weekday_name'] \
-            .cat.set_categories(self.day_of_the_week_names)
-        self.data['date_month_name'] = self.data['date_month_name'].astype('category')
-        self.data['date_month_name'] = self.data['date_month_name'] \
-            .cat.set_categories(self.month_names)
-
-    def write_statistics_to_csv(self) -> None:
-        desired_columns = self.data.describe()[['steps', 'distance', 'runDistance', 'calories']]\
-            .round(2)
-
-        desired_columns.columns = ['Steps', 'Distance', 'Run distance', 'Calories']
-
-        desired_columns.to_csv(f'{self.statistics_file_name}.csv')
-
-        convert_csv_to_markdown(csv_file=self.statistics_file_name)
+    def find_date_range_length_by_daily_steps_goal(self, daily_steps_goal: int = 8000,
+                                                   min_length: int = 1) -> StreakSummary:
+        return self.find_streaks('steps', daily_steps_goal, min_length=min_length)
 
-    def find_date_range_length_by_daily_steps_goal(self):
-        pass
+    def get_rolling_activity(self, daily_steps_goal: int = 8000,
+                             windows: tuple[int, ...] = rolling_windows) -> pd.DataFrame:
+        data = self.ensure_columns('steps', 'distance')
+        return pd.concat([get_rolling_means(data, ['steps', 'distance'], windows=windows),
+                          get_rolling_goal_rates(data, 'steps', daily_steps_goal, windows=windows)], axis=1)
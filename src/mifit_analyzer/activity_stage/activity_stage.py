@@ -1,57 +1,70 @@
 import pandas as pd
 
-from abstract_classes.mifit_abstract import MiFitDataAbstract, convert_csv_to_markdown
+from abstract_classes.derived_column import DerivedColumn
+from abstract_classes.mifit_abstract import MiFitDataAbstract
+from ingestion import DtypeSchema, IngestionConfig
+from time_zones import TimeZoneTimeline
 
 
 class ActivityStageData(MiFitDataAbstract):
 
+    export_name = 'ACTIVITY_STAGE'
+
+    dtype_schema = DtypeSchema(
+        read_dtypes={'distance': 'int32', 'calories': 'uint16', 'steps': 'int32'})
+
+    key_columns = ('date', 'start', 'stop')
+
+    derived_columns = (
+        DerivedColumn('minute_difference', ('start', 'stop'), 'get_minute_difference'),
+        DerivedColumn('steps_per_minute', ('steps', 'minute_difference'), 'get_per_minute', ('steps',)),
+        DerivedColumn('meters_per_minute', ('distance', 'minute_difference'), 'get_per_minute', ('distance',)),
+        DerivedColumn('meters_per_second', ('distance', 'minute_difference'), 'get_meters_per_second'),
+        DerivedColumn('kilometers_per_hour', ('distance', 'minute_difference'), 'get_kilometers_per_hour'),
+        DerivedColumn('start_real', ('date', 'start'), 'get_real_time', ('start',)),
+        DerivedColumn('stop_real', ('date', 'stop'), 'get_real_time', ('stop',)),
+        DerivedColumn('start_hour', ('start_real',), 'get_hour_of_day', ('start_real',)),
+        DerivedColumn('stop_hour', ('stop_real',), 'get_hour_of_day', ('stop_real',)),
+        DerivedColumn('weekday_name', ('date',), 'get_weekday_name', ('date',)))
+
+    statistics_columns = {'distance': 'Distance, (meters)', 'calories': 'Calories', 'steps': 'Steps',
+                          'minute_difference': 'Stage duration, (minutes)', 'steps_per_minute': 'Steps/min',
+                          'meters_per_minute': 'm/min', 'meters_per_second': 'm/s', 'kilometers_per_hour': 'km/h'}
+
     def __init__(self, input_directory: str = '/mnt/c/mifit_data/mifit_analyzer/data/ACTIVITY_STAGE',
                  start_date: str | None = None, end_date: str | None = None, date_format: str = '%Y.%m.%d',
-                 results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results') -> None:
+                 results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results',
+                 ingestion_config: IngestionConfig | None = None,
+                 time_zone_timeline: TimeZoneTimeline | None = None) -> None:
 
         super().__init__(input_directory, start_date, end_date, date_format,
-                         results_directory)
+                         results_directory, ingestion_config=ingestion_config, time_zone_timeline=time_zone_timeline)
         self.statistics_file_name = f'{self.statistics_directory}/activity_stage_statistics'
 
-    def transform_data_for_analysis(self) -> None:
-        self.transform_time_columns_to_datetime()
-        self.add_new_columns()
-        self.select_date_range()
-        self.create_service_directories()
-
-        self.is_prepared = True
-
     def transform_time_columns_to_datetime(self) -> None:
-        self.data['date'] = pd.to_datetime(self.data['date'])
-        self.data['start'] = pd.to_datetime(self.data['start'])
-        self.data['stop'] = pd.to_datetime(self.data['stop'])
-
-    def add_new_columns(self):
-        self.data['minute_difference'] = (self.data.stop - self.data.start) / pd.Timedelta(minutes=1)
-        self.data['steps_per_minute'] = self.data.steps / self.data.minute_difference
-        self.data['meters_per_minute'] = self.data.distance / self.data.minute_difference
-        self.data['meters_per_second'] = self.data.meters_per_minute / 60
-        self.data['kilometers_per_hour'] = self.data.meters_per_second * 3600 / 1000
+        self.data['date'] = self.convert_to_datetime(self.data['date'])
+        self.data['start'] = self.convert_to_datetime(self.data['start'])
+        self.data['stop'] = self.convert_to_datetime(self.data['stop'])
 
-        self.data['start_hour'] = self.data.start.dt.hour + self.data.start.dt.minute / 60
-        self.data['stop_hour'] = self.data.stop.dt.hour + self.data.stop.dt.minute / 60
+    def get_minute_difference(self) -> pd.Series:
+        return (self.data.stop - self.data.start) / pd.Timedelta(minutes=1)
 
-        self.data['weekday_name'] = self.data.date.dt.day_name()
-        self.data["weekday_name"] = self.data["weekday_name"].astype('category')
-        self.data["weekday_name"] = self.data["weekday_name"].cat.set_categories(
-            self.day_of_the_week_names)
+    def get_per_minute(self, column: str) -> pd.Series:
+        return self.data[column] / self.data.minute_difference
 
-    def write_statistics_to_csv(self) -> None:
+    def get_meters_per_second(self) -> pd.Series:
+        return self.get_per_minute('distance') / 60
 
-        desired_columns = self.data.describe()[['distance', 'calories', 'steps',
-                                                'minute_difference', 'steps_per_minute', 'meters_per_minute',
-                                                'meters_per_second', 'kilometers_per_hour']]\
-            .round(2)
+    def get_kilometers_per_hour(self) -> pd.Series:
+        return self.get_meters_per_second() * 3600 / 1000
 
-        desired_columns.columns = ['Distance, (meters)', 'Calories', 'Steps',
-                                   'Stage duration, (minutes)', 'Steps/min', 'm/min',
-                                   'm/s', 'km/h']
+    def get_real_time(self, column: str) -> pd.Series:
+        if self.time_zone_timeline is None:
+            return self.data[column]
 
-        desired_columns.to_csv(f'{self.statistics_file_name}.csv')
+        # the stage times are UTC times of day, so they are put on their own date before the conversion
+        utc_time = self.data.date + (self.data[column] - self.data[column].dt.floor('D'))
+        return self.time_zone_timeline.convert_to_local_time(utc_time)
 
-        convert_csv_to_markdown(csv_file=self.statistics_file_name)
+    def get_hour_of_day(self, column: str) -> pd.Series:
+        return self.data[column].dt.hour + self.data[column].dt.minute / 60
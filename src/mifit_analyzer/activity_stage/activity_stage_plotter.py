@@ -1,64 +1,58 @@
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
 
-from abstract_classes.plotter_abstract import ActivityPlotterAbstract
+from abstract_classes.plotter_abstract import ActivityPlotterAbstract, get_axis_labels
 
 
 class ActivityStagePlotter(ActivityPlotterAbstract):
 
+    required_columns = ('steps', 'distance', 'kilometers_per_hour', 'start_hour', 'stop_hour', 'weekday_name')
+
+    plot_columns = {
+        'make_activity_stage_histplot_km_h': ('kilometers_per_hour',),
+        'make_activity_stage_start_stop_hour_per_weekday_scatterplot': ('start_hour', 'stop_hour', 'weekday_name'),
+        'make_activity_stage_start_hour_and_steps_per_weekday_scatterplot': ('start_hour', 'steps', 'weekday_name')}
+
     def __init__(self, data: pd.DataFrame, results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results'):
 
         super().__init__(data, results_directory)
 
-        self.steps_axis_labels = [i for i in range(0, self.data.steps.max(), 2000)]
-        self.distance_axis_labels = [i for i in range(0, self.data.distance.max(), 2000)]
-        self.speed_km_h_axis_labels = [i for i in range(0, int(self.data.kilometers_per_hour.max()))]
+        self.steps_axis_labels = get_axis_labels(self.data.steps, 2000)
+        self.distance_axis_labels = get_axis_labels(self.data.distance, 2000)
+        self.speed_km_h_axis_labels = get_axis_labels(self.data.kilometers_per_hour)
 
     def make_activity_stage_histplot_km_h(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.histplot(self.data, x='kilometers_per_hour', bins=30)
+        plot_path = Path(self.plots_directory, 'activity_stage_histplot_km_h.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            sns.histplot(self.data, x='kilometers_per_hour', bins=30, ax=ax)
 
-        plt.xticks(self.speed_km_h_axis_labels)
-        plt.title('Kilometers per hour plot', fontsize=self.title_fontsize)
-        plt.xlabel("Kilometers per hour", fontsize=self.label_fontsize)
-        plt.ylabel("Count", fontsize=self.label_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'activity_stage_histplot_km_h.png'))
-        plt.close("all")
+            ax.set_xticks(self.speed_km_h_axis_labels)
+            ax.set_title('Kilometers per hour plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Kilometers per hour", fontsize=self.label_fontsize)
+            ax.set_ylabel("Count", fontsize=self.label_fontsize)
 
     def make_activity_stage_start_stop_hour_per_weekday_scatterplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.scatterplot(data=self.data, x="start_hour", y="stop_hour", hue="weekday_name")
+        plot_path = Path(self.plots_directory, 'activity_stage_start_stop_hour_per_weekday_scatterplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            sns.scatterplot(data=self.data, x="start_hour", y="stop_hour", hue="weekday_name", ax=ax)
 
-        plt.xticks(self.hour_axis_labels)
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Start and stop time plot', fontsize=self.title_fontsize)
-        plt.xlabel("Start activity stage time", fontsize=self.label_fontsize)
-        plt.ylabel("Stop activity stage time", fontsize=self.label_fontsize)
-        plt.legend(title="Day of the week")
-
-        plt.savefig(Path(self.plots_directory, 'activity_stage_start_stop_hour_per_weekday_scatterplot.png'))
-        plt.close("all")
+            ax.set_xticks(self.hour_axis_labels)
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Start and stop time plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Start activity stage time", fontsize=self.label_fontsize)
+            ax.set_ylabel("Stop activity stage time", fontsize=self.label_fontsize)
+            ax.legend(title="Day of the week")
 
     def make_activity_stage_start_hour_and_steps_per_weekday_scatterplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.scatterplot(data=self.data, x="start_hour", y="steps", hue="weekday_name")
-
-        plt.xticks(self.hour_axis_labels)
-        plt.yticks(self.steps_axis_labels)
-        plt.title('Start activity stage time and steps plot', fontsize=self.title_fontsize)
-        plt.xlabel("Start activity stage time", fontsize=self.label_fontsize)
-        plt.ylabel("Steps", fontsize=self.label_fontsize)
-        plt.legend(title="Day of the week")
-
-        plt.savefig(Path(self.plots_directory, 'activity_stage_start_hour_and_steps_per_weekday_scatterplot.png'))
-        plt.close("all")
+        plot_path = Path(self.plots_directory, 'activity_stage_start_hour_and_steps_per_weekday_scatterplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            sns.scatterplot(data=self.data, x="start_hour", y="steps", hue="weekday_name", ax=ax)
+
+            ax.set_xticks(self.hour_axis_labels)
+            ax.set_yticks(self.steps_axis_labels)
+            ax.set_title('Start activity stage time and steps plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Start activity stage time", fontsize=self.label_fontsize)
+            ax.set_ylabel("Steps", fontsize=self.label_fontsize)
+            ax.legend(title="Day of the week")
@@ -1,12 +1,15 @@
+from abstract_classes.plot_cache import PlotCache
+from abstract_classes.plot_renderer import PlotRenderer
 from abstract_classes.report_plotter_abstract import ReportPlotterAbstract, markdown_text
 from activity_stage.activity_stage_plotter import ActivityStagePlotter
 
 
 class ActivityStageReportPlotter(ReportPlotterAbstract):
 
-    def __init__(self, plotter: ActivityStagePlotter, markdown_plots_list: list[markdown_text]):
+    def __init__(self, plotter: ActivityStagePlotter, markdown_plots_list: list[markdown_text],
+                 plot_renderer: PlotRenderer | None = None, plot_cache: PlotCache | None = None):
         self.plotter = plotter
-        super().__init__(self.plotter, markdown_plots_list)
+        super().__init__(self.plotter, markdown_plots_list, plot_renderer, plot_cache)
 
     def make_plots(self) -> None:
         self.markdown_plots_list.append('Here you can find your activity stage plots\n')
@@ -16,14 +19,14 @@ class ActivityStageReportPlotter(ReportPlotterAbstract):
         self._make_activity_stage_scatterplots()
 
     def _make_activity_stage_km_h_plots(self) -> None:
-        self.plotter.make_activity_stage_histplot_km_h()
+        self.make_plot('make_activity_stage_histplot_km_h')
         self.markdown_plots_list.extend(self.get_plot_markdown_text('activity_stage_histplot_km_h'))
 
     def _make_activity_stage_scatterplots(self) -> None:
-        self.plotter.make_activity_stage_start_stop_hour_per_weekday_scatterplot()
+        self.make_plot('make_activity_stage_start_stop_hour_per_weekday_scatterplot')
         self.markdown_plots_list.extend(self.get_plot_markdown_text(
             'activity_stage_start_stop_hour_per_weekday_scatterplot'))
 
-        self.plotter.make_activity_stage_start_hour_and_steps_per_weekday_scatterplot()
+        self.make_plot('make_activity_stage_start_hour_and_steps_per_weekday_scatterplot')
         self.markdown_plots_list.extend(self.get_plot_markdown_text(
             'activity_stage_start_hour_and_steps_per_weekday_scatterplot'))
@@ -0,0 +1,4 @@
+from .rolling import WindowAggregates, get_rolling_goal_rates, get_rolling_means, get_sleep_debt, \
+    get_window_aggregates, rolling_windows
+from .rollup import ROLLUP_FORMAT_VERSION, Rollup, calendar_levels, get_rollup
+from .streaks import Streak, StreakSummary, find_streaks, find_threshold_streaks
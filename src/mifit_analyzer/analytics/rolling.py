@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+rolling_windows = (7, 30, 90, 365)
+
+
+@dataclass(slots=True, frozen=True)
+class WindowAggregates:
+    calendar: pd.DatetimeIndex
+    cumulative_sums: np.ndarray
+    sums: np.ndarray
+    counts: np.ndarray
+    windows: tuple[int, ...]
+
+    def get_means(self) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.counts > 0, self.sums / self.counts, np.nan)
+
+
+def get_window_aggregates(index: pd.DatetimeIndex, values: np.ndarray,
+                          windows: tuple[int, ...] = rolling_windows) -> WindowAggregates:
+    days = index.to_numpy(dtype='datetime64[D]').astype(np.int64)
+    if len(days) == 0:
+        empty = np.zeros((0, values.shape[1], len(windows)))
+        return WindowAggregates(calendar=pd.DatetimeIndex([]), cumulative_sums=np.zeros((0, values.shape[1])),
+                                sums=empty, counts=empty, windows=windows)
+
+    # rows are placed on a complete calendar, so a missing day adds neither a value nor a count to any window
+    positions = days - days.min()
+    length = int(positions.max()) + 1
+    is_present = ~np.isnan(values)
+    day_sums = np.column_stack([np.bincount(positions[is_present[:, column]],
+                                            weights=values[is_present[:, column], column], minlength=length)
+                                for column in range(values.shape[1])])
+    day_counts = np.column_stack([np.bincount(positions[is_present[:, column]], minlength=length)
+                                  for column in range(values.shape[1])])
+
+    # one cumulative sum serves every window size, each window is the difference of two of its rows
+    cumulative_sums = np.concatenate([np.zeros((1, values.shape[1])), np.cumsum(day_sums, axis=0)])
+    cumulative_counts = np.concatenate([np.zeros((1, values.shape[1]), dtype=np.int64), np.cumsum(day_counts, axis=0)])
+    ends = np.arange(1, length + 1)
+    starts = np.maximum(ends[:, None] - np.asarray(windows)[None, :], 0)
+
+    sums = cumulative_sums[ends][:, :, None] - cumulative_sums[starts].transpose(0, 2, 1)
+    counts = cumulative_counts[ends][:, :, None] - cumulative_counts[starts].transpose(0, 2, 1)
+    calendar = pd.date_range(start=days.min().astype('datetime64[D]'), periods=length, freq='D')
+    return WindowAggregates(calendar=calendar, cumulative_sums=cumulative_sums[1:], sums=sums, counts=counts,
+                            windows=windows)
+
+
+def get_column_values(data: pd.DataFrame, columns: list[str]) -> np.ndarray:
+    return np.column_stack([data[column].to_numpy(dtype=np.float64, na_value=np.nan) for column in columns])
+
+
+def get_rolling_means(data: pd.DataFrame, columns: list[str],
+                      windows: tuple[int, ...] = rolling_windows) -> pd.DataFrame:
+    aggregates = get_window_aggregates(pd.DatetimeIndex(data.index), get_column_values(data, columns), windows)
+    means = aggregates.get_means()
+    return pd.DataFrame({f'{column}_mean_{window}d': means[:, position, window_position]
+                         for position, column in enumerate(columns)
+                         for window_position, window in enumerate(windows)}, index=aggregates.calendar)
+
+
+def get_rolling_goal_rates(data: pd.DataFrame, column: str, threshold: float,
+                           windows: tuple[int, ...] = rolling_windows) -> pd.DataFrame:
+    values = get_column_values(data, [column])
+    goal_hits = np.where(np.isnan(values), np.nan, values >= threshold)
+    aggregates = get_window_aggregates(pd.DatetimeIndex(data.index), goal_hits, windows)
+    rates = aggregates.get_means()
+    return pd.DataFrame({f'{column}_goal_rate_{window}d': rates[:, 0, window_position]
+                         for window_position, window in enumerate(windows)}, index=aggregates.calendar)
+
+
+def get_sleep_debt(data: pd.DataFrame, column: str, target_hours: float,
+                   windows: tuple[int, ...] = rolling_windows) -> pd.DataFrame:
+    # the debt grows by the hours missing to the target and shrinks by the hours slept over it
+    deficits = target_hours - get_column_values(data, [column])
+    aggregates = get_window_aggregates(pd.DatetimeIndex(data.index), deficits, windows)
+    sleep_debt = pd.DataFrame({f'{column}_debt_{window}d': aggregates.sums[:, 0, window_position]
+                               for window_position, window in enumerate(windows)}, index=aggregates.calendar)
+    sleep_debt.insert(0, f'{column}_debt', aggregates.cumulative_sums[:, 0])
+    return sleep_debt
@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from mifit_statistics import statistics_index
+
+
+ROLLUP_FORMAT_VERSION = 3
+
+calendar_levels = {'daily': 'D', 'weekly': 'W', 'monthly': 'M', 'yearly': 'Y'}
+
+# the whiskers reach the furthest values within 1.5 interquartile ranges of the box, as in matplotlib boxplots
+whisker_range = 1.5
+
+
+@dataclass(slots=True, frozen=True)
+class Rollup:
+    table: pd.DataFrame
+
+    def __len__(self) -> int:
+        return self.table.shape[0]
+
+    def get_level(self, level: str, column: str) -> pd.DataFrame:
+        is_column = (self.table.column == column).to_numpy()
+        if not is_column.any():
+            raise KeyError(f"The rollup has no column '{column}'")
+        # a level without groups, e.g. the years of an empty date range, has no rows
+        rows = self.table[is_column & (self.table.level == level).to_numpy()]
+        return rows.drop(columns=['level', 'column']).set_index('key')
+
+    def get_total(self, column: str) -> float:
+        return self.get_level('all', column)['sum'].iloc[0]
+
+    def get_box_statistics(self, level: str, column: str) -> tuple[list[str], list[dict | None]]:
+        groups = self.get_level(level, column)
+        box_statistics = [None if group.count == 0 else
+                          {'label': key, 'med': group.median, 'q1': group.q1, 'q3': group.q3,
+                           'whislo': group.whislo, 'whishi': group.whishi, 'fliers': np.asarray(group.fliers)}
+                          for key, group in zip(groups.index, groups.itertuples())]
+        return list(groups.index), box_statistics
+
+    def get_statistics_table(self, columns: list[str]) -> pd.DataFrame:
+        summaries = {}
+        for column in columns:
+            total = self.get_level('all', column).iloc[0]
+            summaries[column] = [float(total['count']), total['mean'], total['min'], total['q1'], total['median'],
+                                 total['q3'], total['max'], total['std']]
+        return pd.DataFrame(summaries, index=list(statistics_index))
+
+
+def get_period_codes(index: pd.DatetimeIndex, level: str) -> tuple[np.ndarray, list[str]]:
+    days = index.to_numpy(dtype='datetime64[D]')
+    if len(days) == 0:
+        return np.zeros(0, dtype=np.int64), []
+
+    if level == 'weekly':
+        # the weeks start on Monday and 1970-01-01 was a Thursday
+        periods = (days.astype(np.int64) + 3) // 7
+    else:
+        periods = days.astype(f'datetime64[{calendar_levels[level]}]').astype(np.int64)
+
+    # every period between the first and the last one is kept, so the calendar has no gaps
+    all_periods = np.arange(periods.min(), periods.max() + 1)
+    if level == 'weekly':
+        labels = np.datetime_as_string((all_periods * 7 - 3).astype('datetime64[D]'))
+    else:
+        labels = np.datetime_as_string(all_periods.astype(f'datetime64[{calendar_levels[level]}]'))
+    return periods - periods.min(), labels.tolist()
+
+
+def get_grouping_codes(data: pd.DataFrame, columns: tuple[str, ...]) -> tuple[np.ndarray, list[str]]:
+    codes = np.zeros(len(data), dtype=np.int64)
+    labels = ['']
+    is_missing = np.zeros(len(data), dtype=bool)
+    for column in columns:
+        values = data[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # all categories are kept in their order, as on the categorical axes of seaborn
+            column_codes = values.cat.codes.to_numpy().astype(np.int64)
+            column_labels = [str(category) for category in values.cat.categories]
+        else:
+            column_codes, uniques = pd.factorize(values, sort=True)
+            column_labels = [str(unique) for unique in uniques]
+
+        is_missing |= column_codes < 0
+        codes = codes * len(column_labels) + column_codes
+        labels = [f'{label} {column_label}'.lstrip() for label in labels for column_label in column_labels]
+
+    return np.where(is_missing, -1, codes), labels
+
+
+def get_sorted_values(sorted_values: np.ndarray, positions: np.ndarray, is_filled: np.ndarray) -> np.ndarray:
+    if len(sorted_values) == 0:
+        return np.full(len(positions), np.nan)
+    return np.where(is_filled, sorted_values[np.clip(positions, 0, len(sorted_values) - 1)], np.nan)
+
+
+def get_group_quantiles(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray,
+                        quantile: float) -> np.ndarray:
+    # the linear interpolation between the closest ranks of numpy.quantile
+    positions = quantile * np.maximum(counts - 1, 0)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, np.maximum(counts - 1, 0))
+    is_filled = counts > 0
+    lower_values = get_sorted_values(sorted_values, starts + lower, is_filled)
+    upper_values = get_sorted_values(sorted_values, starts + upper, is_filled)
+    return lower_values + (upper_values - lower_values) * (positions - lower)
+
+
+def get_group_aggregates(codes: np.ndarray, group_number: int, values: np.ndarray) -> dict:
+    is_present = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[is_present], values[is_present]
+
+    # one sort by group and value gives the order statistics of every group at once
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+
+    counts = np.bincount(codes, minlength=group_number)
+    starts = np.cumsum(counts) - counts
+    is_filled = counts > 0
+    sums = np.bincount(codes, weights=values, minlength=group_number)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(is_filled, sums / counts, np.nan)
+        squares = np.bincount(codes, weights=np.square(values - means[codes]), minlength=group_number)
+        stds = np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+
+    q1 = get_group_quantiles(values, starts, counts, 0.25)
+    q3 = get_group_quantiles(values, starts, counts, 0.75)
+    low_limits = q1 - whisker_range * (q3 - q1)
+    high_limits = q3 + whisker_range * (q3 - q1)
+
+    # the values of a group are sorted, so the values within the limits follow the values below them
+    below_numbers = np.bincount(codes[values < low_limits[codes]], minlength=group_number)
+    within_numbers = np.bincount(codes[values <= high_limits[codes]], minlength=group_number)
+    whislo = get_sorted_values(values, starts + below_numbers, below_numbers < counts)
+    whislo = np.where(np.isnan(whislo) | (whislo > q1), q1, whislo)
+    whishi = get_sorted_values(values, starts + within_numbers - 1, within_numbers > 0)
+    whishi = np.where(np.isnan(whishi) | (whishi < q3), q3, whishi)
+
+    # numpy splits an empty array into one part, so a level without groups gets no fliers
+    is_flier = (values < whislo[codes]) | (values > whishi[codes])
+    fliers = np.split(values[is_flier], np.cumsum(np.bincount(codes[is_flier], minlength=group_number))[:-1]) \
+        if group_number else []
+
+    return {'count': counts, 'sum': sums, 'mean': means, 'std': stds,
+            'min': get_sorted_values(values, starts, is_filled), 'q1': q1,
+            'median': get_group_quantiles(values, starts, counts, 0.5), 'q3': q3,
+            'max': get_sorted_values(values, starts + counts - 1, is_filled),
+            'whislo': whislo, 'whishi': whishi, 'fliers': fliers}
+
+
+def get_rollup(data: pd.DataFrame, columns: list[str],
+               groupings: dict[str, tuple[str, ...]] | None = None) -> Rollup:
+    index = pd.DatetimeIndex(data.index)
+    levels = {'all': (np.zeros(len(data), dtype=np.int64), ['all'])}
+    levels.update({level: get_period_codes(index, level) for level in calendar_levels})
+    levels.update({level: get_grouping_codes(data, grouping_columns)
+                   for level, grouping_columns in (groupings or {}).items()})
+
+    tables = []
+    for column in columns:
+        values = data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        for level, (codes, labels) in levels.items():
+            aggregates = get_group_aggregates(codes, len(labels), values)
+            tables.append(pd.DataFrame({'level': level, 'key': labels, 'column': column, **aggregates}))
+
+    return Rollup(table=pd.concat(tables, axis=0, ignore_index=True))
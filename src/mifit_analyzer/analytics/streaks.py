@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(slots=True, frozen=True)
+class Streak:
+    start_date: pd.Timestamp
+    end_date: pd.Timestamp
+    length: int
+
+
+@dataclass(slots=True, frozen=True)
+class StreakSummary:
+    longest: Streak | None
+    current: Streak | None
+    streaks: tuple[Streak, ...]
+
+    def __len__(self) -> int:
+        return len(self.streaks)
+
+
+def find_streaks(dates: pd.DatetimeIndex, is_achieved: np.ndarray, min_length: int = 1) -> StreakSummary:
+    # the dates are sorted, so every step below is a single linear pass
+    days = dates.to_numpy(dtype='datetime64[D]').astype(np.int64)
+    achieved_days = days[is_achieved]
+    if len(achieved_days) == 0:
+        return StreakSummary(longest=None, current=None, streaks=())
+    achieved_days = achieved_days[np.diff(achieved_days, prepend=achieved_days[0] - 1) != 0]
+
+    # a streak is broken by a missed goal and by a calendar day without data alike
+    starts = np.flatnonzero(np.diff(achieved_days, prepend=achieved_days[0] - 2) != 1)
+    ends = np.append(starts[1:], len(achieved_days)) - 1
+    lengths = ends - starts + 1
+
+    start_days = achieved_days[starts].astype('datetime64[D]')
+    end_days = achieved_days[ends].astype('datetime64[D]')
+
+    def get_streak(position: int) -> Streak:
+        return Streak(start_date=pd.Timestamp(start_days[position]), end_date=pd.Timestamp(end_days[position]),
+                      length=int(lengths[position]))
+
+    # the current streak has to reach the last day with data
+    current = get_streak(len(lengths) - 1) if achieved_days[-1] == days[-1] else None
+    return StreakSummary(longest=get_streak(int(np.argmax(lengths))), current=current,
+                         streaks=tuple(get_streak(int(position)) for position in np.flatnonzero(lengths >= min_length)))
+
+
+def find_threshold_streaks(data: pd.DataFrame, column: str, threshold: float,
+                           min_length: int = 1) -> StreakSummary:
+    is_achieved = data[column].to_numpy(dtype=np.float64, na_value=np.nan) >= threshold
+    return find_streaks(pd.DatetimeIndex(data.index), is_achieved, min_length=min_length)
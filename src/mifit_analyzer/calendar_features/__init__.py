@@ -0,0 +1,2 @@
+from .calendar_features import CalendarFeatures, day_of_the_week_names, get_calendar_features, month_dtype, \
+    month_names, weekday_dtype
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+day_of_the_week_names = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+month_names = ('January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December')
+
+# every name column of every dataset shares these dtypes, so the categories are stored only once
+weekday_dtype = pd.CategoricalDtype(categories=day_of_the_week_names)
+month_dtype = pd.CategoricalDtype(categories=month_names)
+
+
+@dataclass(slots=True, frozen=True)
+class CalendarFeatures:
+    index: pd.Index
+    weekday_codes: np.ndarray
+    month_codes: np.ndarray
+    years: np.ndarray
+
+    def get_weekday(self) -> pd.Series:
+        return pd.Series(self.weekday_codes, index=self.index)
+
+    def get_month(self) -> pd.Series:
+        return pd.Series(np.where(self.month_codes < 0, -1, self.month_codes + 1).astype(np.int8), index=self.index)
+
+    def get_year(self) -> pd.Series:
+        return pd.Series(self.years, index=self.index)
+
+    def get_weekday_name(self) -> pd.Series:
+        return pd.Series(pd.Categorical.from_codes(self.weekday_codes, dtype=weekday_dtype), index=self.index)
+
+    def get_month_name(self) -> pd.Series:
+        return pd.Series(pd.Categorical.from_codes(self.month_codes, dtype=month_dtype), index=self.index)
+
+
+def get_calendar_features(timestamps: pd.Series) -> CalendarFeatures:
+    if getattr(timestamps.dt, 'tz', None) is not None:
+        # the calendar of a time zone aware timestamp is the one of its local wall time
+        timestamps = timestamps.dt.tz_localize(None)
+
+    values = timestamps.to_numpy(dtype='datetime64[s]')
+    is_missing = np.isnat(values)
+
+    days = values.astype('datetime64[D]').astype(np.int64)
+    months = values.astype('datetime64[M]').astype(np.int64)
+
+    # 1970-01-01 was a Thursday, the weekday codes start from Monday
+    weekday_codes = np.where(is_missing, -1, (days + 3) % 7).astype(np.int8)
+    month_codes = np.where(is_missing, -1, months % 12).astype(np.int8)
+    years = np.where(is_missing, -1, months // 12 + 1970).astype(np.int16)
+
+    return CalendarFeatures(index=timestamps.index, weekday_codes=weekday_codes, month_codes=month_codes,
+                            years=years)
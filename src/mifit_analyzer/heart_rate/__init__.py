@@ -0,0 +1,2 @@
+from .heart_rate import HeartRateData
+from .heart_rate_aggregator import HeartRateAggregator, aggregate_heart_rate_file
@@ -0,0 +1,91 @@
+from functools import partial
+import logging
+
+import pandas as pd
+
+from abstract_classes.mifit_abstract import MiFitDataAbstract, get_date_indexed, slice_date_range
+from heart_rate.heart_rate_aggregator import HeartRateAggregator, aggregate_heart_rate_file
+from ingestion import DateIndex, DtypeSchema, FrameCache, IngestionConfig, WatermarkStore, get_source_ranks, \
+    map_in_pool
+
+
+class HeartRateData(MiFitDataAbstract):
+
+    export_name = 'HEARTRATE_AUTO'
+
+    dtype_schema = DtypeSchema(
+        derived_dtypes={'count': 'uint32', 'min': 'uint8', 'max': 'uint8',
+                        'p5': 'uint8', 'p25': 'uint8', 'p50': 'uint8', 'p75': 'uint8', 'p95': 'uint8'})
+
+    key_columns = ('date', 'time')
+
+    statistics_columns = {'min': 'Daily minimum', 'mean': 'Daily mean', 'max': 'Daily maximum',
+                          'resting': 'Resting heart rate', 'p50': 'Daily median'}
+
+    def __init__(self, input_directory: str = '/mnt/c/mifit_data/mifit_analyzer/data/HEARTRATE_AUTO',
+                 start_date: str | None = None, end_date: str | None = None, date_format: str = '%Y.%m.%d',
+                 results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results',
+                 ingestion_config: IngestionConfig | None = None) -> None:
+
+        self.hourly_data: pd.DataFrame = pd.DataFrame()
+
+        super().__init__(input_directory, start_date, end_date, date_format, results_directory,
+                         ingestion_config=ingestion_config)
+        self.statistics_file_name = f'{self.statistics_directory}/heart_rate_statistics'
+
+    def get_frame_cache(self) -> FrameCache | None:
+        # the raw stream is never kept in memory, so only the small summaries would be cached
+        return None
+
+    def get_watermark_store(self) -> WatermarkStore | None:
+        return None
+
+    def read_all_csv_files(self) -> pd.DataFrame:
+        start_date, end_date = self.get_read_date_range()
+        date_index = DateIndex(f'{self.get_cache_directory()}/date_index/{type(self).__name__}.json')
+
+        sources = [source for source in self.sources if not date_index.is_outside(source, start_date, end_date)]
+        logging.info(f'{type(self).__name__} date index skipped {len(self.sources) - len(sources)} '
+                     f'of {len(self.sources)} files outside the requested date range')
+
+        aggregate_file = partial(aggregate_heart_rate_file, start_date=start_date, end_date=end_date,
+                                 chunk_size=self.ingestion_config.chunk_size,
+                                 policy=self.ingestion_config.dedup_policy)
+        results = map_in_pool(aggregate_file, sources,
+                              workers=self.ingestion_config.workers, executor=self.ingestion_config.executor)
+
+        # the files are merged from the earliest export to the latest one for the dedup policy
+        ranks = get_source_ranks(self.sources)
+        aggregator = HeartRateAggregator(policy=self.ingestion_config.dedup_policy)
+        ordered_results = sorted(zip(sources, results), key=lambda item: ranks[item[0].key])
+        for source, (file_aggregator, date_min, date_max) in ordered_results:
+            if date_min is not None:
+                date_index.update(source, date_min, date_max)
+            aggregator.merge(file_aggregator)
+        date_index.save()
+        self.duplicates_number = aggregator.duplicates_number
+
+        logging.info(f'{type(self).__name__} deduplication by {", ".join(self.key_columns)} with the '
+                     f"'{self.ingestion_config.dedup_policy}' policy removed {self.duplicates_number} measurements")
+
+        logging.info(f'{type(self).__name__} has aggregated {aggregator.get_measurements_number()} '
+                     f'heart rate measurements into {len(aggregator)} days')
+
+        self.hourly_data = aggregator.get_hourly_summary()
+        return aggregator.get_daily_summary()
+
+    def transform_time_columns_to_datetime(self) -> None:
+        self.data['date'] = pd.to_datetime(self.data['date'])
+        # without input files the hourly data is the empty frame it is initialized with
+        if self.hourly_data.columns.empty:
+            return
+        self.hourly_data['date'] = pd.to_datetime(self.hourly_data['date'])
+        self.hourly_data['date_hour'] = self.hourly_data.date + pd.to_timedelta(self.hourly_data.hour, unit='h')
+
+    def set_date_index(self) -> None:
+        super().set_date_index()
+        self.hourly_data = get_date_indexed(self.hourly_data)
+
+    def select_date_range(self) -> None:
+        super().select_date_range()
+        self.hourly_data = slice_date_range(self.hourly_data, self.start_date, self.end_date)
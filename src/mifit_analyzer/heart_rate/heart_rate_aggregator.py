@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+
+from ingestion import CsvSource, dedup_policies
+
+
+class HeartRateAggregator:
+
+    bins_number = 256
+    minutes_number = 24 * 60
+    percentiles = (5, 25, 50, 75, 95)
+    resting_fraction = 0.1
+
+    def __init__(self, policy: str = 'latest') -> None:
+        if policy not in dedup_policies:
+            raise ValueError(f"Unknown dedup policy '{policy}', expected one of: {', '.join(dedup_policies)}")
+
+        self.policy = policy
+        self.days: list[str] = []
+        self.day_indices: dict[str, int] = {}
+        self.duplicates_number = 0
+
+        # Mi Fit measures the heart rate at most once a minute, so the measurements are deduplicated by date and
+        # time in a slot per minute of a day, 0 marks a minute without a measurement
+        self.minute_heart_rates = np.zeros((0, self.minutes_number), dtype=np.uint8)
+
+        # the measurements of an already filled minute are only kept with the 'none' policy and are binned here
+        self.duplicate_histograms = np.zeros((0, self.bins_number), dtype=np.uint32)
+        self.duplicate_hourly_counts = np.zeros((0, 24), dtype=np.uint32)
+        self.duplicate_hourly_sums = np.zeros((0, 24), dtype=np.uint64)
+        self.duplicate_hourly_mins = np.zeros((0, 24), dtype=np.uint8)
+        self.duplicate_hourly_maxs = np.zeros((0, 24), dtype=np.uint8)
+
+    def __repr__(self) -> str:
+        cls_name = type(self).__name__
+        return f"{cls_name}(policy='{self.policy}', days={len(self.days)})"
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def get_measurements_number(self) -> int:
+        return int(np.count_nonzero(self.minute_heart_rates) + self.duplicate_histograms.sum())
+
+    def get_day_indices(self, days: np.ndarray) -> np.ndarray:
+        new_days = [day for day in days if day not in self.day_indices]
+        for day in new_days:
+            self.day_indices[day] = len(self.days)
+            self.days.append(day)
+
+        if new_days:
+            new_rows = len(new_days)
+            self.minute_heart_rates = np.vstack((self.minute_heart_rates,
+                                                 np.zeros((new_rows, self.minutes_number), dtype=np.uint8)))
+            self.duplicate_histograms = np.vstack((self.duplicate_histograms,
+                                                   np.zeros((new_rows, self.bins_number), dtype=np.uint32)))
+            self.duplicate_hourly_counts = np.vstack((self.duplicate_hourly_counts,
+                                                      np.zeros((new_rows, 24), dtype=np.uint32)))
+            self.duplicate_hourly_sums = np.vstack((self.duplicate_hourly_sums,
+                                                    np.zeros((new_rows, 24), dtype=np.uint64)))
+            self.duplicate_hourly_mins = np.vstack((self.duplicate_hourly_mins,
+                                                    np.full((new_rows, 24), 255, dtype=np.uint8)))
+            self.duplicate_hourly_maxs = np.vstack((self.duplicate_hourly_maxs,
+                                                    np.zeros((new_rows, 24), dtype=np.uint8)))
+
+        return np.array([self.day_indices[day] for day in days], dtype=np.int64)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        heart_rates = chunk.heartRate.to_numpy()
+        # Mi Fit writes 0 and 255 when the bracelet could not measure the heart rate
+        chunk = chunk[(heart_rates > 0) & (heart_rates < 255)]
+        if chunk.empty:
+            return
+
+        day_codes, days = pd.factorize(chunk.date.astype(str))
+        time_codes, times = pd.factorize(chunk.time.astype(str))
+        minutes = np.array([int(time[:2]) * 60 + int(time[3:5]) for time in times], dtype=np.int64)[time_codes]
+
+        day_indices = self.get_day_indices(np.asarray(days))
+        self.add_measurements(day_indices[day_codes] * self.minutes_number + minutes,
+                              chunk.heartRate.to_numpy(dtype=np.uint8))
+
+    def add_measurements(self, keys: np.ndarray, heart_rates: np.ndarray) -> None:
+        # the keys are the minutes since the first known day in the order the measurements were read,
+        # with the 'latest' policy the measurement read last wins like in the deduplication of the other data
+        if self.policy == 'latest':
+            keys, heart_rates = keys[::-1], heart_rates[::-1]
+        unique_keys, positions = np.unique(keys, return_index=True)
+
+        minute_heart_rates = self.minute_heart_rates.reshape(-1)
+        is_known = minute_heart_rates[unique_keys] > 0
+        new_keys, new_positions = unique_keys[~is_known], positions[~is_known]
+
+        if self.policy == 'none':
+            is_duplicate = np.ones(len(keys), dtype=bool)
+            is_duplicate[new_positions] = False
+            self.add_duplicates(keys[is_duplicate], heart_rates[is_duplicate])
+        else:
+            self.duplicates_number += len(keys) - len(new_keys)
+
+        if self.policy == 'latest':
+            minute_heart_rates[unique_keys] = heart_rates[positions]
+        else:
+            minute_heart_rates[new_keys] = heart_rates[new_positions]
+
+    def add_duplicates(self, keys: np.ndarray, heart_rates: np.ndarray) -> None:
+        if not len(keys):
+            return
+
+        histograms, counts, sums, mins, maxs = bin_measurements(keys, heart_rates, len(self.days),
+                                                                self.minutes_number, self.bins_number)
+        self.duplicate_histograms += histograms.astype(np.uint32)
+        self.duplicate_hourly_counts += counts.astype(np.uint32)
+        self.duplicate_hourly_sums += sums.astype(np.uint64)
+        self.duplicate_hourly_mins = np.minimum(self.duplicate_hourly_mins, mins)
+        self.duplicate_hourly_maxs = np.maximum(self.duplicate_hourly_maxs, maxs)
+
+    def merge(self, other: 'HeartRateAggregator') -> None:
+        # the exports are merged from the earliest to the latest one, so the measurements of the merged
+        # aggregator are read after the known ones
+        day_indices = self.get_day_indices(np.asarray(other.days, dtype=object))
+
+        other_days, minutes = np.nonzero(other.minute_heart_rates)
+        self.add_measurements(day_indices[other_days] * self.minutes_number + minutes,
+                              other.minute_heart_rates[other_days, minutes])
+        self.duplicates_number += other.duplicates_number
+
+        self.duplicate_histograms[day_indices] += other.duplicate_histograms
+        self.duplicate_hourly_counts[day_indices] += other.duplicate_hourly_counts
+        self.duplicate_hourly_sums[day_indices] += other.duplicate_hourly_sums
+        self.duplicate_hourly_mins[day_indices] = np.minimum(self.duplicate_hourly_mins[day_indices],
+                                                             other.duplicate_hourly_mins)
+        self.duplicate_hourly_maxs[day_indices] = np.maximum(self.duplicate_hourly_maxs[day_indices],
+                                                             other.duplicate_hourly_maxs)
+
+    def get_binned_measurements(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        days, minutes = np.nonzero(self.minute_heart_rates)
+        histograms, counts, sums, mins, maxs = bin_measurements(days * self.minutes_number + minutes,
+                                                                self.minute_heart_rates[days, minutes],
+                                                                len(self.days), self.minutes_number,
+                                                                self.bins_number)
+        return (histograms + self.duplicate_histograms, counts + self.duplicate_hourly_counts,
+                sums + self.duplicate_hourly_sums, np.minimum(mins, self.duplicate_hourly_mins),
+                np.maximum(maxs, self.duplicate_hourly_maxs))
+
+    def get_daily_summary(self) -> pd.DataFrame:
+        histograms = self.get_binned_measurements()[0].astype(np.int64)
+        heart_rates = np.arange(self.bins_number)
+        counts = histograms.sum(axis=1)
+        cumulative_counts = histograms.cumsum(axis=1)
+
+        summary = pd.DataFrame({'date': self.days, 'count': counts})
+        summary['min'] = (cumulative_counts > 0).argmax(axis=1)
+        summary['mean'] = histograms @ heart_rates / counts
+        summary['max'] = self.bins_number - 1 - (histograms[:, ::-1] > 0).argmax(axis=1)
+
+        # the resting heart rate is estimated as the mean of the lowest decile of the daily measurements
+        resting_counts = np.ceil(counts * self.resting_fraction)
+        lowest_counts = np.minimum(histograms, np.maximum(resting_counts[:, None] -
+                                                          (cumulative_counts - histograms), 0))
+        summary['resting'] = lowest_counts @ heart_rates / lowest_counts.sum(axis=1)
+
+        for percentile in self.percentiles:
+            ranks = np.ceil(counts * percentile / 100)
+            summary[f'p{percentile}'] = (cumulative_counts >= np.maximum(ranks, 1)[:, None]).argmax(axis=1)
+
+        return summary.sort_values(by='date', ignore_index=True)
+
+    def get_hourly_summary(self) -> pd.DataFrame:
+        days_number = len(self.days)
+        _, counts, sums, mins, maxs = self.get_binned_measurements()
+        summary = pd.DataFrame({'date': np.repeat(np.asarray(self.days, dtype=object), 24),
+                                'hour': np.tile(np.arange(24, dtype=np.int8), days_number),
+                                'count': counts.ravel(),
+                                'min': mins.ravel(),
+                                'mean': sums.ravel() / np.maximum(counts.ravel(), 1),
+                                'max': maxs.ravel()})
+        summary = summary[summary['count'] > 0]
+        return summary.sort_values(by=['date', 'hour'], ignore_index=True)
+
+
+def bin_measurements(keys: np.ndarray, heart_rates: np.ndarray, days_number: int, minutes_number: int,
+                     bins_number: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    day_codes, minutes = np.divmod(keys, minutes_number)
+    heart_rates = heart_rates.astype(np.int64)
+
+    histograms = np.bincount(day_codes * bins_number + heart_rates, minlength=days_number * bins_number)
+
+    hour_codes = day_codes * 24 + minutes // 60
+    counts = np.bincount(hour_codes, minlength=days_number * 24)
+    sums = np.bincount(hour_codes, weights=heart_rates, minlength=days_number * 24)
+
+    extremes = pd.Series(heart_rates).groupby(hour_codes).agg(['min', 'max'])
+    mins = np.full(days_number * 24, 255, dtype=np.uint8)
+    maxs = np.zeros(days_number * 24, dtype=np.uint8)
+    mins[extremes.index] = extremes['min']
+    maxs[extremes.index] = extremes['max']
+
+    return (histograms.reshape(days_number, bins_number), counts.reshape(days_number, 24),
+            sums.reshape(days_number, 24), mins.reshape(days_number, 24), maxs.reshape(days_number, 24))
+
+
+def aggregate_heart_rate_file(source: CsvSource, start_date: str | None = None, end_date: str | None = None,
+                              chunk_size: int = 100000,
+                              policy: str = 'latest') -> tuple[HeartRateAggregator, str | None, str | None]:
+    aggregator = HeartRateAggregator(policy=policy)
+    date_min = date_max = None
+
+    with source.open() as file, pd.read_csv(file, index_col=None, header=0, dtype={'heartRate': 'int16'},
+                                            chunksize=chunk_size) as reader:
+        for chunk in reader:
+            if chunk.empty:
+                continue
+
+            dates = chunk['date'].astype(str)
+            date_min = dates.min() if date_min is None else min(date_min, dates.min())
+            date_max = dates.max() if date_max is None else max(date_max, dates.max())
+
+            if start_date is not None:
+                chunk = chunk[dates >= start_date]
+                dates = dates[dates >= start_date]
+            if end_date is not None:
+                chunk = chunk[dates <= end_date]
+            aggregator.update(chunk)
+
+    return aggregator, date_min, date_max
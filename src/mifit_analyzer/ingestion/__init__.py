@@ -0,0 +1,8 @@
+from .csv_reader import map_in_pool, read_csv_file, read_csv_file_in_date_range, read_csv_header
+from .csv_source import CsvSource, list_archive_sources, list_csv_sources
+from .date_index import DateIndex
+from .deduplication import dedup_policies, deduplicate, get_source_ranks
+from .dtype_schema import DtypeSchema, apply_dtypes, get_arrow_dtypes, get_default_memory_usage_mb, get_memory_usage_mb
+from .frame_cache import FrameCache, is_parquet_available
+from .ingestion_config import IngestionConfig
+from .watermark_store import WatermarkStore
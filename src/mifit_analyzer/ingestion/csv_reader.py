@@ -0,0 +1,90 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from itertools import islice
+from typing import Any, Callable
+
+import pandas as pd
+
+from ingestion.csv_source import CsvSource
+
+
+executors: dict[str, type[ThreadPoolExecutor] | type[ProcessPoolExecutor]] = {'thread': ThreadPoolExecutor,
+                                                                              'process': ProcessPoolExecutor}
+
+engines: dict[str, dict[str, str]] = {'c': {}, 'arrow': {'engine': 'pyarrow', 'dtype_backend': 'pyarrow'}}
+
+
+def map_in_pool(function: Callable, items: list, workers: int = 1, executor: str = 'thread') -> list[Any]:
+    if executor not in executors:
+        raise ValueError(f"Unknown executor '{executor}', expected one of: {', '.join(executors)}")
+
+    if workers <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+
+    # Executor.map yields results in submission order, so the results keep the order of items
+    with executors[executor](max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(function, items))
+
+
+def read_csv_file(source: CsvSource | str, dtype: dict[str, str] | None = None, engine: str = 'c') -> pd.DataFrame:
+    if engine not in engines:
+        raise ValueError(f"Unknown engine '{engine}', expected one of: {', '.join(engines)}")
+
+    if isinstance(source, str):
+        return pd.read_csv(source, index_col=None, header=0, dtype=dtype, **engines[engine])
+
+    with source.open() as file:
+        data = pd.read_csv(file, index_col=None, header=0, dtype=dtype, **engines[engine])
+    return data
+
+
+def read_csv_header(source: CsvSource, dtype: dict[str, str] | None = None, engine: str = 'c') -> pd.DataFrame:
+    # only the header and the first row are parsed, so the empty frame gets the dtypes the engine infers
+    # for the whole file
+    with source.open() as file:
+        head = b''.join(islice(file, 2))
+    return pd.read_csv(BytesIO(head), index_col=None, header=0, dtype=dtype, **engines[engine]).iloc[:0]
+
+
+def select_raw_date_range(data: pd.DataFrame, start_date: str | None,
+                          end_date: str | None) -> tuple[pd.DataFrame, str | None, str | None]:
+    # Mi Fit exports store dates as 'YYYY-MM-DD' strings, so the lexicographic order of the raw values
+    # is the chronological one and the rows can be filtered before any datetime conversion
+    if data.empty:
+        return data, None, None
+
+    dates = data['date'].astype(str)
+    mask = pd.Series(True, index=data.index)
+    if start_date is not None:
+        mask &= dates >= start_date
+    if end_date is not None:
+        mask &= dates <= end_date
+    return data[mask], dates.min(), dates.max()
+
+
+def read_csv_file_in_date_range(source: CsvSource, dtype: dict[str, str] | None = None,
+                                start_date: str | None = None, end_date: str | None = None,
+                                chunk_size: int = 100000,
+                                engine: str = 'c') -> tuple[pd.DataFrame, str | None, str | None]:
+    if engine == 'arrow':
+        # the pyarrow engine can not read in chunks, but it parses the whole file in parallel blocks
+        return select_raw_date_range(read_csv_file(source, dtype=dtype, engine=engine), start_date, end_date)
+
+    chunks = []
+    date_min: str | None = None
+    date_max: str | None = None
+
+    with source.open() as file, pd.read_csv(file, index_col=None, header=0, dtype=dtype,
+                                            chunksize=chunk_size) as reader:
+        for chunk in reader:
+            chunk, chunk_date_min, chunk_date_max = select_raw_date_range(chunk, start_date, end_date)
+            if chunk_date_min is not None and chunk_date_max is not None:
+                date_min = chunk_date_min if date_min is None else min(date_min, chunk_date_min)
+                date_max = chunk_date_max if date_max is None else max(date_max, chunk_date_max)
+            chunks.append(chunk)
+
+    if not chunks:
+        return read_csv_header(source, dtype=dtype, engine=engine), date_min, date_max
+
+    data = pd.concat(chunks, axis=0, ignore_index=True)
+    return data, date_min, date_max
@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+import glob
+import hashlib
+import os
+from pathlib import PurePosixPath
+import re
+from typing import IO, Iterator
+import zipfile
+
+
+@dataclass(slots=True, frozen=True)
+class CsvSource:
+    path: str
+    size: int
+    mtime: float
+    archive: str | None = None
+    crc: int | None = None
+    password: str | None = field(default=None, repr=False)
+
+    @property
+    def key(self) -> str:
+        if self.archive is None:
+            return self.path
+        return f'{self.archive}::{self.path}'
+
+    @contextmanager
+    def open(self) -> Iterator[IO[bytes]]:
+        if self.archive is None:
+            with open(self.path, 'rb') as file:
+                yield file
+        else:
+            # every member gets its own archive handle, so members can be decompressed in parallel
+            password = None if self.password is None else self.password.encode('utf-8')
+            with zipfile.ZipFile(self.archive) as archive, archive.open(self.path, pwd=password) as file:
+                yield file
+
+    def get_content_hash(self, chunk_size: int = 1024 * 1024) -> str:
+        if self.crc is not None:
+            # zip archives already store a checksum of every member
+            return f'crc32:{self.crc:08x}'
+
+        content_hash = hashlib.blake2b(digest_size=16)
+        with open(self.path, 'rb') as file:
+            while chunk := file.read(chunk_size):
+                content_hash.update(chunk)
+        return content_hash.hexdigest()
+
+
+def list_csv_sources(directory: str) -> list[CsvSource]:
+    sources = []
+    for path in glob.glob(f'{directory}/*.csv'):
+        stat = os.stat(path)
+        sources.append(CsvSource(path=path, size=stat.st_size, mtime=stat.st_mtime))
+    return sources
+
+
+def list_archive_sources(archives: tuple[str, ...], export_name: str,
+                         password: str | None = None) -> list[CsvSource]:
+    # Mi Fit archives keep every data type in its own directory, e.g. ACTIVITY/ACTIVITY_1600000000.csv
+    file_name_pattern = re.compile(rf'{export_name}_\d+\.csv')
+
+    sources = []
+    for archive_path in archives:
+        with zipfile.ZipFile(archive_path) as archive:
+            for member in archive.infolist():
+                member_path = PurePosixPath(member.filename)
+                if member.is_dir() or member_path.suffix != '.csv':
+                    continue
+                if member_path.parent.name != export_name and not file_name_pattern.fullmatch(member_path.name):
+                    continue
+
+                sources.append(CsvSource(path=member.filename, size=member.file_size,
+                                         mtime=datetime(*member.date_time).timestamp(),
+                                         archive=archive_path, crc=member.CRC, password=password))
+    return sources
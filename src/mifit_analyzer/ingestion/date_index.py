@@ -0,0 +1,56 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+from ingestion.csv_source import CsvSource
+
+
+class DateIndex:
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self.is_changed = False
+
+        if os.path.exists(self.path):
+            with open(self.path) as file:
+                self.entries = json.load(file)
+
+    def __repr__(self) -> str:
+        cls_name = type(self).__name__
+        return f"{cls_name}(path='{self.path}')"
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, source: CsvSource) -> tuple[str, str] | None:
+        entry = self.entries.get(source.key)
+        if entry is None or entry['size'] != source.size or entry['mtime'] != source.mtime:
+            return None
+        return entry['date_min'], entry['date_max']
+
+    def update(self, source: CsvSource, date_min: str, date_max: str) -> None:
+        entry = {'size': source.size, 'mtime': source.mtime, 'date_min': date_min, 'date_max': date_max}
+        if self.entries.get(source.key) != entry:
+            self.entries[source.key] = entry
+            self.is_changed = True
+
+    def is_outside(self, source: CsvSource, start_date: str | None, end_date: str | None) -> bool:
+        date_range = self.get(source)
+        if date_range is None:
+            return False
+
+        date_min, date_max = date_range
+        return (start_date is not None and date_max < start_date) or (end_date is not None and date_min > end_date)
+
+    def save(self) -> None:
+        if not self.is_changed:
+            return
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with open(f'{self.path}.tmp', 'w') as file:
+            json.dump(self.entries, file, indent=1)
+        os.replace(f'{self.path}.tmp', self.path)
+        self.is_changed = False
+        logging.info(f'Date index {self.path} has been saved')
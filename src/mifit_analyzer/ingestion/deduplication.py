@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from ingestion.csv_source import CsvSource
+
+
+dedup_policies = ('latest', 'earliest', 'none')
+
+
+def get_source_ranks(sources: list[CsvSource]) -> dict[str, int]:
+    # the export written last is the latest one
+    ordered_sources = sorted(sources, key=lambda source: (source.mtime, source.key))
+    return {source.key: rank for rank, source in enumerate(ordered_sources)}
+
+
+def deduplicate(data: pd.DataFrame, key_columns: tuple[str, ...], source_ranks: np.ndarray,
+                policy: str = 'latest') -> tuple[pd.DataFrame, int]:
+    if policy not in dedup_policies:
+        raise ValueError(f"Unknown dedup policy '{policy}', expected one of: {', '.join(dedup_policies)}")
+
+    if policy == 'none' or data.empty:
+        return data, 0
+
+    # rows are compared by 64-bit hashes of their keys, hashing and the duplicated lookup are both linear
+    key_hashes = pd.util.hash_pandas_object(data[list(key_columns)], index=False).to_numpy()
+
+    # the ranks are small unsigned integers, so the stable argsort is a linear radix sort
+    order = np.argsort(source_ranks.astype(np.min_scalar_type(int(source_ranks.max()))), kind='stable')
+    if policy == 'latest':
+        order = order[::-1]
+
+    is_duplicated = pd.Series(key_hashes[order]).duplicated(keep='first').to_numpy()
+    is_kept = np.empty(len(data), dtype=bool)
+    is_kept[order] = ~is_duplicated
+
+    duplicates_number = int(len(data) - is_kept.sum())
+    if duplicates_number == 0:
+        return data, 0
+    return data[is_kept].reset_index(drop=True), duplicates_number
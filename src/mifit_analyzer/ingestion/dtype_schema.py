@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+
+@dataclass(slots=True, frozen=True)
+class DtypeSchema:
+    read_dtypes: dict[str, str] = field(default_factory=dict)
+    derived_dtypes: dict[str, str] = field(default_factory=dict)
+
+
+def get_memory_usage_mb(data: pd.DataFrame) -> float:
+    return data.memory_usage(index=True, deep=True).sum() / 1024 / 1024
+
+
+def get_default_memory_usage_mb(data: pd.DataFrame, dtypes: dict[str, str]) -> float:
+    # without a schema pandas stores every numeric column as 8 byte int64/float64
+    memory_usage = data.memory_usage(index=True, deep=True)
+    for column in dtypes:
+        if column in data.columns and pd.api.types.is_numeric_dtype(data[column]):
+            memory_usage[column] = data.shape[0] * 8
+    return memory_usage.sum() / 1024 / 1024
+
+
+def get_arrow_dtypes(dtypes: dict[str, str]) -> dict[str, str]:
+    return {column: f'{dtype}[pyarrow]' for column, dtype in dtypes.items()}
+
+
+def apply_dtypes(data: pd.DataFrame, dtypes: dict[str, str]) -> pd.DataFrame:
+    present_dtypes = {column: dtype for column, dtype in dtypes.items() if column in data.columns}
+    return data.astype(present_dtypes)
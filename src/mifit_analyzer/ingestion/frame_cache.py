@@ -0,0 +1,76 @@
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from ingestion.csv_source import CsvSource
+
+
+CACHE_FORMAT_VERSION = 3
+
+
+def is_parquet_available() -> bool:
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+class FrameCache:
+
+    def __init__(self, cache_directory: str, max_size_mb: int = 512) -> None:
+        self.cache_directory = cache_directory.removesuffix('/')
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+
+        Path(self.cache_directory).mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self) -> str:
+        cls_name = type(self).__name__
+        return f"{cls_name}(cache_directory='{self.cache_directory}', " \
+               f"max_size_mb={self.max_size_bytes // 1024 // 1024})"
+
+    @staticmethod
+    def make_key(dataset_name: str, sources: list[CsvSource], parameters: dict, verify_content: bool = False) -> str:
+        # the size and modification time of a file change with its content, so a warm run only stats the files.
+        # Hashing the content as well reads every file, which catches edits that keep both
+        files: list[tuple] = [(source.path, source.archive, source.size, source.mtime) for source in sources]
+        if verify_content:
+            files = [(*file, source.get_content_hash()) for file, source in zip(files, sources)]
+        fingerprint = {'version': CACHE_FORMAT_VERSION, 'parameters': parameters, 'files': files}
+        digest = hashlib.blake2b(json.dumps(fingerprint, sort_keys=True, default=str).encode('utf-8'),
+                                 digest_size=16).hexdigest()
+        return f'{dataset_name}_{digest}'
+
+    def get_path(self, key: str) -> str:
+        return f'{self.cache_directory}/{key}.parquet'
+
+    def load(self, key: str) -> pd.DataFrame | None:
+        path = self.get_path(key)
+        if not os.path.exists(path):
+            logging.info(f'Frame cache miss for {key}')
+            return None
+
+        data = pd.read_parquet(path)
+        # the modification time marks the last use of the entry for the eviction
+        os.utime(path)
+        logging.info(f'Frame cache hit for {key}')
+        return data
+
+    def save(self, key: str, data: pd.DataFrame) -> None:
+        path = self.get_path(key)
+        data.to_parquet(f'{path}.tmp', index=False)
+        os.replace(f'{path}.tmp', path)
+        logging.info(f'Frame cache entry {key} has been saved')
+
+        self.evict()
+
+    def evict(self) -> None:
+        entries = sorted(Path(self.cache_directory).glob('*.parquet'), key=lambda entry: entry.stat().st_mtime)
+        cache_size = sum(entry.stat().st_size for entry in entries)
+
+        while entries and cache_size > self.max_size_bytes:
+            entry = entries.pop(0)
+            cache_size -= entry.stat().st_size
+            entry.unlink()
+            logging.info(f'Frame cache entry {entry.stem} has been evicted')
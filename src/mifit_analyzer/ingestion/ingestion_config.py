@@ -0,0 +1,19 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True, frozen=True)
+class IngestionConfig:
+    workers: int = 1
+    executor: str = 'thread'
+    use_cache: bool = True
+    rebuild_cache: bool = False
+    verify_cache: bool = False
+    cache_directory: str | None = None
+    cache_max_size_mb: int = 512
+    chunk_size: int = 100000
+    incremental: bool = False
+    dedup_policy: str = 'latest'
+    engine: str = 'c'
+    derived_columns_max_size_mb: float | None = None
+    input_archives: tuple[str, ...] = ()
+    archive_password: str | None = field(default=None, repr=False)
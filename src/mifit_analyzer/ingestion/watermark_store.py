@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from ingestion.csv_source import CsvSource
+from ingestion.deduplication import deduplicate
+
+
+STORE_FORMAT_VERSION = 3
+
+
+class WatermarkStore:
+
+    def __init__(self, store_directory: str, parameters: dict) -> None:
+        self.store_directory = store_directory.removesuffix('/')
+        self.watermark_file_name = f'{self.store_directory}/watermark.json'
+        self.tail_file_name = f'{self.store_directory}/tail.parquet'
+        self.parameters = json.loads(json.dumps({'version': STORE_FORMAT_VERSION, **parameters}, default=str))
+
+        self.watermark = self.read_watermark()
+
+    def __repr__(self) -> str:
+        cls_name = type(self).__name__
+        return f"{cls_name}(store_directory='{self.store_directory}', parameters={self.parameters})"
+
+    def read_watermark(self) -> dict:
+        empty_watermark = {'parameters': self.parameters, 'date': None, 'parts': 0, 'history_revision': 0,
+                           'files': {}}
+
+        if not os.path.exists(self.watermark_file_name):
+            return empty_watermark
+
+        with open(self.watermark_file_name) as file:
+            watermark = json.load(file)
+
+        if watermark['parameters'] != self.parameters:
+            logging.info(f'Transform parameters have changed, the store {self.store_directory} is rebuilt')
+            shutil.rmtree(self.store_directory)
+            return empty_watermark
+
+        return watermark
+
+    def get_watermark_date(self) -> str | None:
+        return self.watermark['date']
+
+    def get_history_revision(self) -> int:
+        return self.watermark['history_revision']
+
+    def get_new_sources(self, sources: list[CsvSource]) -> list[CsvSource]:
+        new_sources = [source for source in sources
+                       if self.watermark['files'].get(source.key) != [source.size, source.mtime]]
+        # later exports have to be read last to win over the earlier ones
+        return sorted(new_sources, key=lambda source: source.mtime)
+
+    def load(self, empty_data: pd.DataFrame) -> pd.DataFrame:
+        part_file_names = [self.get_part_file_name(index) for index in range(self.watermark['parts'])]
+        if os.path.exists(self.tail_file_name):
+            part_file_names.append(self.tail_file_name)
+
+        # a store without rows has the columns of the data read for it
+        if not part_file_names:
+            return empty_data
+
+        return pd.concat([pd.read_parquet(file_name) for file_name in part_file_names], axis=0, ignore_index=True)
+
+    def get_part_file_name(self, index: int) -> str:
+        return f'{self.store_directory}/part_{index:06d}.parquet'
+
+    def merge_history(self, history_data: pd.DataFrame, key_columns: tuple[str, ...], policy: str) -> None:
+        part_file_names = [self.get_part_file_name(index) for index in range(self.watermark['parts'])]
+        if history_data.empty or not part_file_names:
+            return
+
+        stored_data = pd.concat([pd.read_parquet(file_name) for file_name in part_file_names],
+                                axis=0, ignore_index=True)
+        # rows repeated unchanged by a later export leave the sealed parts as they are
+        stored_hashes = pd.util.hash_pandas_object(stored_data, index=False).to_numpy()
+        history_hashes = pd.util.hash_pandas_object(history_data[stored_data.columns], index=False).to_numpy()
+        changed_data = history_data[~np.isin(history_hashes, stored_hashes)]
+        if changed_data.empty:
+            return
+
+        data = pd.concat([stored_data, changed_data], axis=0, ignore_index=True)
+        source_ranks = np.repeat([0, 1], [len(stored_data), len(changed_data)])
+        data, _ = deduplicate(data, key_columns, source_ranks, policy=policy)
+        data = data.sort_values(by='date', kind='stable', ignore_index=True)
+
+        # the sealed parts are replaced by a single part holding the merged history
+        data.to_parquet(f'{self.get_part_file_name(0)}.tmp', index=False)
+        for file_name in part_file_names:
+            os.remove(file_name)
+        os.replace(f'{self.get_part_file_name(0)}.tmp', self.get_part_file_name(0))
+        self.watermark['parts'] = 1
+        # the state kept for the sealed rows, e.g. the statistics, is rebuilt after a new revision
+        self.watermark['history_revision'] += 1
+
+        logging.info(f'{len(changed_data)} new rows before the watermark {self.watermark["date"]} differ from '
+                     f'the store {self.store_directory}, its history has been merged again')
+
+    def append(self, new_data: pd.DataFrame, new_sources: list[CsvSource],
+               key_columns: tuple[str, ...], policy: str = 'latest') -> pd.DataFrame:
+        Path(self.store_directory).mkdir(parents=True, exist_ok=True)
+
+        if self.watermark['date'] is not None:
+            is_history = (new_data.date < self.watermark['date']).to_numpy()
+            self.merge_history(new_data[is_history], key_columns, policy)
+            new_data = new_data[~is_history]
+
+        # rows of the watermark day are kept in a small tail part because the last day of an export
+        # is usually incomplete and is overwritten by the rows of the next export
+        tail_data = new_data.iloc[:0]
+        if os.path.exists(self.tail_file_name):
+            tail_data = pd.read_parquet(self.tail_file_name)
+        frames = [frame for frame in (tail_data, new_data) if not frame.empty]
+
+        if frames:
+            data = pd.concat(frames, axis=0, ignore_index=True)
+            # the stored rows of the watermark day come from an earlier export than the new rows
+            source_ranks = np.repeat([0, 1], [len(tail_data), len(new_data)])
+            data, _ = deduplicate(data, key_columns, source_ranks, policy=policy)
+            data = data.sort_values(by='date', kind='stable', ignore_index=True)
+
+            watermark_date = data.date.max()
+            sealed_data = data[data.date < watermark_date]
+            tail_data = data[data.date >= watermark_date]
+
+            if not sealed_data.empty:
+                sealed_data.to_parquet(self.get_part_file_name(self.watermark['parts']), index=False)
+                self.watermark['parts'] += 1
+            tail_data.to_parquet(f'{self.tail_file_name}.tmp', index=False)
+            os.replace(f'{self.tail_file_name}.tmp', self.tail_file_name)
+
+            self.watermark['date'] = watermark_date.strftime('%Y-%m-%d')
+
+        for source in new_sources:
+            self.watermark['files'][source.key] = [source.size, source.mtime]
+        self.save_watermark()
+
+        logging.info(f'{len(new_data)} rows from {len(new_sources)} new files have been appended to '
+                     f'the store {self.store_directory}, the watermark is {self.watermark["date"]}')
+        return self.load(new_data.iloc[:0])
+
+    def save_watermark(self) -> None:
+        with open(f'{self.watermark_file_name}.tmp', 'w') as file:
+            json.dump(self.watermark, file, indent=1)
+        os.replace(f'{self.watermark_file_name}.tmp', self.watermark_file_name)
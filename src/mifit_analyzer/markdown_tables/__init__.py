@@ -0,0 +1,2 @@
+from .markdown_table import escape_markdown, get_table_rows, render_data_frame, render_markdown_table, \
+    table_formats, write_table
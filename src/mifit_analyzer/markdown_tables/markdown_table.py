@@ -0,0 +1,68 @@
+import csv
+import io
+import re
+
+import pandas as pd
+
+
+# the characters escaped by the markdown writer of pandoc, underscores only outside of words
+markdown_special_characters = re.compile(r'([\\*|<>\[\]`])|(?<![0-9A-Za-z])_|_(?![0-9A-Za-z])')
+
+
+def escape_markdown(text: str) -> str:
+    return markdown_special_characters.sub(lambda match: f'\\{match.group(0)}', text)
+
+
+def get_column_widths(rows: list[list[str]]) -> list[int]:
+    return [max(len(cell) for cell in column) for column in zip(*rows)]
+
+
+def render_simple_table(rows: list[list[str]]) -> str:
+    widths = [width + 2 for width in get_column_widths(rows)]
+    separator = ['-' * width for width in widths]
+    lines = [' '.join(cell.ljust(width) for cell, width in zip(row, widths))
+             for row in [rows[0], separator, *rows[1:]]]
+    return ''.join(f'  {line}'.rstrip() + '\n' for line in lines)
+
+
+def render_pipe_table(rows: list[list[str]]) -> str:
+    widths = get_column_widths(rows)
+    separator = '|' + '|'.join('-' * (width + 2) for width in widths) + '|'
+    lines = ['| ' + ' | '.join(cell.ljust(width) for cell, width in zip(row, widths)) + ' |' for row in rows]
+    return '\n'.join([lines[0], separator, *lines[1:]]) + '\n'
+
+
+def render_grid_table(rows: list[list[str]]) -> str:
+    widths = get_column_widths(rows)
+    border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+    header_border = border.replace('-', '=')
+    lines = ['| ' + ' | '.join(cell.ljust(width) for cell, width in zip(row, widths)) + ' |' for row in rows]
+    return '\n'.join([border, lines[0], header_border, *[f'{line}\n{border}' for line in lines[1:]]]) + '\n'
+
+
+table_formats = {'simple': render_simple_table, 'pipe': render_pipe_table, 'grid': render_grid_table}
+
+
+def render_markdown_table(rows: list[list[str]], table_format: str = 'simple') -> str:
+    rows = [[escape_markdown(cell) for cell in row] for row in rows]
+    return table_formats[table_format](rows)
+
+
+def get_table_rows(data: pd.DataFrame, index: bool = True) -> tuple[str, list[list[str]]]:
+    # the markdown cells are taken from the csv text, so both sinks show the same values
+    csv_text = data.to_csv(index=index)
+    return csv_text, list(csv.reader(io.StringIO(csv_text)))
+
+
+def render_data_frame(data: pd.DataFrame, index: bool = True, table_format: str = 'simple') -> str:
+    _, rows = get_table_rows(data, index=index)
+    return render_markdown_table(rows, table_format=table_format)
+
+
+def write_table(data: pd.DataFrame, file_name: str, index: bool = True, table_format: str = 'simple') -> None:
+    csv_text, rows = get_table_rows(data, index=index)
+    with open(f'{file_name}.csv', 'w') as file:
+        file.write(csv_text)
+
+    with open(f'{file_name}.md', 'w') as file:
+        file.write(render_markdown_table(rows, table_format=table_format))
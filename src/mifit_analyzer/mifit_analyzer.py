@@ -4,12 +4,16 @@ from pathlib import Path
 import sys
 from time import perf_counter
 
+from abstract_classes import PlotCache, PlotRenderer, plot_executors
 from mifit_dataclasses.mifit_data import MiFitData
 from activity.activity import ActivityData
 from activity_stage.activity_stage import ActivityStageData
-from report.report import MifitReport
+from heart_rate.heart_rate import HeartRateData
+from ingestion import IngestionConfig, is_parquet_available, list_archive_sources
+from report import MifitReport, ReportConverter
 from sleep.sleep import SleepData
 from sleep_activity.sleep_activity import SleepActivityData
+from time_zones import read_time_zone_timeline
 
 
 def parse_arguments():
@@ -21,72 +25,184 @@ def parse_arguments():
     parser.add_argument('--start_date', help='start date. Default: 1900.01.01', type=str, default='1900.01.01')
     parser.add_argument('--end_date', help='end date. Default: 2100.01.01', type=str, default='2100.01.01')
     parser.add_argument('--time_zone', help='time zone. Default: 0', type=int, default=0)
+    parser.add_argument('--time_zone_timeline', help='path to csv file with effective_from and time_zone columns '
+                                                     'listing the IANA time zones you lived in, replaces --time_zone',
+                        type=str, default=None)
     parser.add_argument('--output_directory', help='path to output directory. '
                                                    'Default: mifit_analyzer/results', type=str,
                         default='/mnt/c/mifit_data/mifit_analyzer/results')
     parser.add_argument('--daily_steps_goal', help='daily steps goal. Default: 8000', type=int, default=8000)
     parser.add_argument('--user_name', help='user name. Default: Username', type=str, default='Username')
     parser.add_argument('--top_step_days_number', help='top step days number. Default: 10', type=int, default=10)
+    parser.add_argument('--min_streak_length', help='shortest streak of achieved daily steps goals counted in '
+                                                    'the report. Default: 7', type=int, default=7)
+    parser.add_argument('--sleep_target_hours', help='hours of sleep a night the sleep debt is counted against. '
+                                                     'Default: 8', type=float, default=8.0)
+    parser.add_argument('--rolling_windows', help='lengths in days of the rolling averages in the report. '
+                                                  'Default: 7 30 90 365', type=int, nargs='+', default=[7, 30, 90, 365])
     parser.add_argument('--date_format', help='date format. Default: YYYY.mm.dd', type=str, default='%Y.%m.%d')
     parser.add_argument('--log_mode', help='log mode. Default: w', type=str, default='w')
+    parser.add_argument('--ingest_workers', help='number of workers reading input csv files. Default: 1',
+                        type=int, default=1)
+    parser.add_argument('--ingest_executor', help='pool used to read input csv files. Default: thread', type=str,
+                        default='thread', choices=['thread', 'process'])
+    parser.add_argument('--cache_directory', help='path to frame cache directory. '
+                                                  'Default: mifit_analyzer/results/cache', type=str, default=None)
+    parser.add_argument('--cache_max_size_mb', help='frame cache size limit in Mb. Default: 512', type=int,
+                        default=512)
+    parser.add_argument('--no_cache', help='do not use the frame cache', action='store_true')
+    parser.add_argument('--rebuild_cache', help='ignore and overwrite existing frame cache entries',
+                        action='store_true')
+    parser.add_argument('--verify_cache', help='hash the content of the input files to look up the frame cache '
+                                               'instead of only their size and modification time',
+                        action='store_true')
+    parser.add_argument('--chunk_size', help='number of rows read at once from large csv files. Default: 100000',
+                        type=int, default=100000)
+    parser.add_argument('--dedup_policy', help='which export wins when exports overlap. Default: latest', type=str,
+                        default='latest', choices=['latest', 'earliest', 'none'])
+    parser.add_argument('--incremental', help='keep a deduplicated store of the parsed data and read only '
+                                              'the files added since the last run', action='store_true')
+    parser.add_argument('--engine', help='csv parser and dataframe backend, arrow keeps pyarrow-backed columns '
+                                         'end to end. Default: c', type=str, default='c', choices=['c', 'arrow'])
+    parser.add_argument('--derived_columns_max_size_mb',
+                        help='memory budget of the lazily derived columns of every dataset in Mb. Default: unlimited',
+                        type=float, default=None)
+    parser.add_argument('--input_archive', help='read the exports straight from Mi Fit zip archives '
+                                                'instead of the input directory', type=str, nargs='+', default=None)
+    parser.add_argument('--archive_password', help='password of encrypted zip archives', type=str, default=None)
+    parser.add_argument('--no_statistics_files', help='do not write the statistics tables to csv and markdown files, '
+                                                      'the report is built from the statistics kept in memory',
+                        action='store_true')
+    parser.add_argument('--html_workers', help='number of pandoc processes converting reports to html at once. '
+                                               'Default: 2', type=int, default=2)
+    parser.add_argument('--plot_workers', help='number of workers rendering the plots at once, 1 renders them '
+                                               'one after another in the main thread. Default: 1',
+                        type=int, default=1)
+    parser.add_argument('--plot_executor', help='pool used to render the plots. Default: thread', type=str,
+                        default='thread', choices=plot_executors)
+    parser.add_argument('--plot_cache_max_size_mb', help='size limit of the cache of rendered plots in Mb. '
+                                                         'Default: 128', type=int, default=128)
     args = parser.parse_args()
     return args
 
 
 def main(input_directory: str = '/mnt/c/mifit_data/mifit_analyzer/data',
-         hours_difference: int = 0, daily_steps_goal: int = 8000, user_name: str = 'Username',
+         hours_difference: int = 0, time_zone_timeline: str | None = None,
+         daily_steps_goal: int = 8000, user_name: str = 'Username',
          start_date: str | None = None, end_date: str | None = None,
-         top_step_days_number: int = 10, date_format: str = '%Y.%m.%d',
-         output_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results') -> None:
+         top_step_days_number: int = 10, min_streak_length: int = 7, sleep_target_hours: float = 8.0,
+         rolling_windows: list[int] | None = None, date_format: str = '%Y.%m.%d',
+         output_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results',
+         ingest_workers: int = 1, ingest_executor: str = 'thread',
+         use_cache: bool = True, rebuild_cache: bool = False, verify_cache: bool = False,
+         cache_directory: str | None = None,
+         cache_max_size_mb: int = 512, chunk_size: int = 100000, incremental: bool = False,
+         dedup_policy: str = 'latest', engine: str = 'c', derived_columns_max_size_mb: float | None = None,
+         input_archives: list[str] | None = None,
+         archive_password: str | None = None, write_statistics_files: bool = True,
+         report_converter: ReportConverter | None = None, plot_renderer: PlotRenderer | None = None,
+         plot_cache_max_size_mb: int = 128) -> None:
 
     input_directory = input_directory.removesuffix('/')
     output_directory = output_directory.removesuffix('/')
 
+    timeline = None
+    if time_zone_timeline is not None:
+        timeline = read_time_zone_timeline(time_zone_timeline)
+        logging.info(f'Time zone timeline {time_zone_timeline} has been read: {timeline}')
+
+    if engine == 'arrow' and not is_parquet_available():
+        logging.warning('pyarrow is not installed, the c engine is used instead')
+        engine = 'c'
+
+    ingestion_config = IngestionConfig(workers=ingest_workers, executor=ingest_executor,
+                                       use_cache=use_cache, rebuild_cache=rebuild_cache, verify_cache=verify_cache,
+                                       cache_directory=cache_directory, cache_max_size_mb=cache_max_size_mb,
+                                       chunk_size=chunk_size, incremental=incremental, dedup_policy=dedup_policy,
+                                       engine=engine, derived_columns_max_size_mb=derived_columns_max_size_mb,
+                                       input_archives=tuple(input_archives or ()),
+                                       archive_password=archive_password)
+
     sleep = SleepData(input_directory=f'{input_directory}/SLEEP',
                       start_date=start_date, end_date=end_date,
                       date_format=date_format, hours_difference=hours_difference,
-                      results_directory=output_directory)
+                      results_directory=output_directory, ingestion_config=ingestion_config,
+                      time_zone_timeline=timeline)
     sleep.transform_data_for_analysis()
-    sleep.write_statistics_to_csv()
+    if write_statistics_files:
+        sleep.write_statistics_to_csv()
 
     sleep.make_logging_message()
 
     activity = ActivityData(input_directory=f'{input_directory}/ACTIVITY',
                             start_date=start_date, end_date=end_date, date_format=date_format,
-                            results_directory=output_directory)
+                            results_directory=output_directory, ingestion_config=ingestion_config)
     activity.transform_data_for_analysis()
-    activity.write_statistics_to_csv()
+    if write_statistics_files:
+        activity.write_statistics_to_csv()
 
     activity.make_logging_message()
 
     activity_stage = ActivityStageData(input_directory=f'{input_directory}/ACTIVITY_STAGE',
                                        start_date=start_date, end_date=end_date, date_format=date_format,
-                                       results_directory=output_directory)
+                                       results_directory=output_directory, ingestion_config=ingestion_config,
+                                       time_zone_timeline=timeline)
     activity_stage.transform_data_for_analysis()
-    activity_stage.write_statistics_to_csv()
+    if write_statistics_files:
+        activity_stage.write_statistics_to_csv()
 
     activity_stage.make_logging_message()
 
+    heart_rate = None
+    if ingestion_config.input_archives:
+        has_heart_rate = bool(list_archive_sources(ingestion_config.input_archives, HeartRateData.export_name))
+    else:
+        has_heart_rate = Path(f'{input_directory}/HEARTRATE_AUTO').is_dir()
+
+    if has_heart_rate:
+        heart_rate = HeartRateData(input_directory=f'{input_directory}/HEARTRATE_AUTO',
+                                   start_date=start_date, end_date=end_date, date_format=date_format,
+                                   results_directory=output_directory, ingestion_config=ingestion_config)
+        heart_rate.transform_data_for_analysis()
+        if write_statistics_files:
+            heart_rate.write_statistics_to_csv()
+
+        heart_rate.make_logging_message()
+
     sleep_activity = SleepActivityData(sleep=sleep, activity=activity, results_directory=output_directory)
-    sleep_activity.write_statistics_to_csv()
+    if write_statistics_files:
+        sleep_activity.write_statistics_to_csv()
 
     sleep_activity.make_logging_message()
 
     mifit_data = MiFitData(sleep=sleep, activity=activity, sleep_activity=sleep_activity,
-                           activity_stage=activity_stage)
+                           activity_stage=activity_stage, heart_rate=heart_rate)
+
+    # the plots are kept next to the frame cache and rendered again only when their data, style or code change
+    plot_cache = None
+    if use_cache:
+        plot_cache = PlotCache(cache_directory=f'{activity.get_cache_directory()}/plots',
+                               max_size_mb=plot_cache_max_size_mb, rebuild=rebuild_cache)
 
     report = MifitReport(mifit_data=mifit_data,
                          user_name=user_name,
                          daily_steps_goal=daily_steps_goal,
                          top_step_days_number=top_step_days_number,
+                         min_streak_length=min_streak_length,
+                         sleep_target_hours=sleep_target_hours,
+                         rolling_windows=tuple(rolling_windows or (7, 30, 90, 365)),
                          date_format=date_format,
-                         results_directory=output_directory)
+                         results_directory=output_directory,
+                         report_converter=report_converter,
+                         write_statistics_files=write_statistics_files,
+                         plot_renderer=plot_renderer,
+                         plot_cache=plot_cache)
 
     report.make_logging_message()
 
     report.make_plots()
 
-    logging.info("Report plots were built")
+    logging.info("Report plots were submitted")
 
     report.make_report()
 
@@ -111,29 +227,82 @@ if __name__ == "__main__":
 
     logging.info('Mifit_analyzer has started its work')
     logging.info('To reproduce this analysis, you can use the following command:')
-    logging.info(f'python3 {" ".join(sys.argv)}')
+    command_line = sys.argv.copy()
+    if args.archive_password is not None:
+        command_line = ['***' if argument == args.archive_password else argument for argument in command_line]
+    logging.info(f'python3 {" ".join(command_line)}')
 
     logging.info(f"main(input_directory='{args.input_directory}', "
                  f"user_name='{args.user_name}', "
                  f"start_date='{args.start_date}', "
                  f"end_date='{args.end_date}', "
                  f"hours_difference={args.time_zone}, "
+                 f"time_zone_timeline={args.time_zone_timeline!r}, "
                  f"output_directory='{args.output_directory}', "
                  f"daily_steps_goal={args.daily_steps_goal}, "
                  f"top_step_days_number={args.top_step_days_number}, "
-                 f"date_format='{args.date_format}')"
+                 f"min_streak_length={args.min_streak_length}, "
+                 f"sleep_target_hours={args.sleep_target_hours}, "
+                 f"rolling_windows={args.rolling_windows}, "
+                 f"date_format='{args.date_format}', "
+                 f"ingest_workers={args.ingest_workers}, "
+                 f"ingest_executor='{args.ingest_executor}', "
+                 f"use_cache={not args.no_cache}, "
+                 f"rebuild_cache={args.rebuild_cache}, "
+                 f"verify_cache={args.verify_cache}, "
+                 f"cache_directory={args.cache_directory!r}, "
+                 f"cache_max_size_mb={args.cache_max_size_mb}, "
+                 f"chunk_size={args.chunk_size}, "
+                 f"incremental={args.incremental}, "
+                 f"dedup_policy='{args.dedup_policy}', "
+                 f"engine='{args.engine}', "
+                 f"derived_columns_max_size_mb={args.derived_columns_max_size_mb}, "
+                 f"input_archives={args.input_archive}, "
+                 f"write_statistics_files={not args.no_statistics_files}, "
+                 f"html_workers={args.html_workers}, "
+                 f"plot_workers={args.plot_workers}, "
+                 f"plot_executor='{args.plot_executor}', "
+                 f"plot_cache_max_size_mb={args.plot_cache_max_size_mb})"
                  )
 
-    main(input_directory=args.input_directory,
-         user_name=args.user_name,
-         start_date=args.start_date,
-         end_date=args.end_date,
-         hours_difference=args.time_zone,
-         output_directory=args.output_directory,
-         daily_steps_goal=args.daily_steps_goal,
-         top_step_days_number=args.top_step_days_number,
-         date_format=args.date_format
-         )
+    # a run converts its single report at the end, html_workers only caps the pandoc processes
+    # when several runs share one converter
+    with ReportConverter(max_workers=args.html_workers) as report_converter, \
+            PlotRenderer(max_workers=args.plot_workers, executor=args.plot_executor) as plot_renderer:
+        main(input_directory=args.input_directory,
+             user_name=args.user_name,
+             start_date=args.start_date,
+             end_date=args.end_date,
+             hours_difference=args.time_zone,
+             time_zone_timeline=args.time_zone_timeline,
+             output_directory=args.output_directory,
+             daily_steps_goal=args.daily_steps_goal,
+             top_step_days_number=args.top_step_days_number,
+             min_streak_length=args.min_streak_length,
+             sleep_target_hours=args.sleep_target_hours,
+             rolling_windows=args.rolling_windows,
+             date_format=args.date_format,
+             ingest_workers=args.ingest_workers,
+             ingest_executor=args.ingest_executor,
+             use_cache=not args.no_cache,
+             rebuild_cache=args.rebuild_cache,
+             verify_cache=args.verify_cache,
+             cache_directory=args.cache_directory,
+             cache_max_size_mb=args.cache_max_size_mb,
+             chunk_size=args.chunk_size,
+             incremental=args.incremental,
+             dedup_policy=args.dedup_policy,
+             engine=args.engine,
+             derived_columns_max_size_mb=args.derived_columns_max_size_mb,
+             input_archives=args.input_archive,
+             archive_password=args.archive_password,
+             write_statistics_files=not args.no_statistics_files,
+             report_converter=report_converter,
+             plot_renderer=plot_renderer,
+             plot_cache_max_size_mb=args.plot_cache_max_size_mb
+             )
+
+    logging.info("Report has been converted to .html file")
 
     logging.info("Mifit_analyzer has finished its work")
 
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 
 from activity.activity import ActivityData
 from activity_stage.activity_stage import ActivityStageData
+from heart_rate.heart_rate import HeartRateData
 from sleep.sleep import SleepData
 from sleep_activity.sleep_activity import SleepActivityData
 
@@ -12,3 +13,4 @@ class MiFitData:
     activity: ActivityData
     sleep_activity: SleepActivityData
     activity_stage: ActivityStageData
+    heart_rate: HeartRateData | None = None
@@ -0,0 +1,3 @@
+from .column_statistics import ColumnStatistics, get_column_statistics, get_statistics_table, statistics_index
+from .quantile_sketch import QuantileSketch
+from .statistics_store import StatisticsStore
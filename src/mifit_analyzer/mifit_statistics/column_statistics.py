@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from mifit_statistics.quantile_sketch import QuantileSketch
+
+
+# the rows of the statistics tables, in the order of DataFrame.describe
+statistics_index = ('count', 'mean', 'min', '25%', '50%', '75%', 'max', 'std')
+
+
+@dataclass(slots=True, frozen=True)
+class ColumnStatistics:
+    count: int
+    mean: float
+    m2: float
+    minimum: float
+    maximum: float
+    sketch: QuantileSketch
+
+    @classmethod
+    def from_values(cls, values: pd.Series) -> 'ColumnStatistics':
+        values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return cls(count=0, mean=np.nan, m2=0.0, minimum=np.nan, maximum=np.nan,
+                       sketch=QuantileSketch.from_sorted_values(values))
+
+        mean = values.mean()
+        sorted_values = np.sort(values)
+        return cls(count=len(values), mean=mean, m2=np.square(values - mean).sum(),
+                   minimum=sorted_values[0], maximum=sorted_values[-1],
+                   sketch=QuantileSketch.from_sorted_values(sorted_values))
+
+    def merge(self, other: 'ColumnStatistics') -> 'ColumnStatistics':
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+
+        # the moments of both parts are combined with the parallel form of the Welford algorithm
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return ColumnStatistics(count=count, mean=self.mean + delta * other.count / count,
+                                m2=self.m2 + other.m2 + delta ** 2 * self.count * other.count / count,
+                                minimum=min(self.minimum, other.minimum), maximum=max(self.maximum, other.maximum),
+                                sketch=self.sketch.merge(other.sketch))
+
+    def get_std(self) -> float:
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    def get_summary(self) -> list[float]:
+        quartiles = self.sketch.get_quantiles([0.25, 0.5, 0.75], self.minimum, self.maximum)
+        return [float(self.count), self.mean, self.minimum, *quartiles, self.maximum, self.get_std()]
+
+    def to_dict(self) -> dict:
+        return {'count': self.count, 'mean': float(self.mean), 'm2': float(self.m2),
+                'minimum': float(self.minimum), 'maximum': float(self.maximum), 'sketch': self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'ColumnStatistics':
+        return cls(count=state['count'], mean=state['mean'], m2=state['m2'], minimum=state['minimum'],
+                   maximum=state['maximum'], sketch=QuantileSketch.from_dict(state['sketch']))
+
+
+def get_column_statistics(data: pd.DataFrame, columns: list[str]) -> dict[str, ColumnStatistics]:
+    return {column: ColumnStatistics.from_values(data[column]) for column in columns}
+
+
+def get_statistics_table(statistics: dict[str, ColumnStatistics]) -> pd.DataFrame:
+    return pd.DataFrame({column: column_statistics.get_summary() for column, column_statistics in statistics.items()},
+                        index=list(statistics_index))
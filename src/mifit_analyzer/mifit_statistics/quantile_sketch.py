@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(slots=True, frozen=True)
+class QuantileSketch:
+    means: np.ndarray
+    weights: np.ndarray
+    compression: int = 1000
+    max_size: int = 50000
+
+    @classmethod
+    def from_sorted_values(cls, values: np.ndarray, compression: int = 1000,
+                           max_size: int = 50000) -> 'QuantileSketch':
+        sketch = cls(means=values, weights=np.ones(len(values)), compression=compression, max_size=max_size)
+        return sketch.compress() if len(values) > max_size else sketch
+
+    def __len__(self) -> int:
+        return len(self.means)
+
+    def is_exact(self) -> bool:
+        # every value keeps its own centroid until the sketch is compressed for the first time
+        return len(self.means) == 0 or self.weights.max() == 1
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        means = np.concatenate([self.means, other.means])
+        order = np.argsort(means, kind='stable')
+        sketch = QuantileSketch(means=means[order], weights=np.concatenate([self.weights, other.weights])[order],
+                                compression=self.compression, max_size=self.max_size)
+        return sketch.compress() if len(sketch) > self.max_size else sketch
+
+    def compress(self) -> 'QuantileSketch':
+        # centroids are merged along the arcsine scale of the t-digest, so the tails keep small centroids
+        cumulative_weights = np.cumsum(self.weights)
+        quantiles = (cumulative_weights - self.weights / 2) / cumulative_weights[-1]
+        scale = self.compression / (2 * np.pi) * np.arcsin(2 * quantiles - 1)
+        cluster_codes = np.floor(scale - scale[0]).astype(np.int64)
+
+        weights = np.bincount(cluster_codes, weights=self.weights)
+        means = np.bincount(cluster_codes, weights=self.weights * self.means)
+        is_used = weights > 0
+        return QuantileSketch(means=means[is_used] / weights[is_used], weights=weights[is_used],
+                              compression=self.compression, max_size=self.max_size)
+
+    def get_quantiles(self, quantiles: list[float], minimum: float, maximum: float) -> np.ndarray:
+        if len(self.means) == 0:
+            return np.full(len(quantiles), np.nan)
+
+        if self.is_exact():
+            return np.quantile(self.means, quantiles)
+
+        # the values of a centroid are spread around its mean, the extremes are known exactly
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0], centers, [self.weights.sum()]])
+        values = np.concatenate([[minimum], self.means, [maximum]])
+        return np.interp(np.asarray(quantiles) * positions[-1], positions, values)
+
+    def to_dict(self) -> dict:
+        return {'means': self.means.tolist(), 'weights': self.weights.tolist(), 'compression': self.compression,
+                'max_size': self.max_size}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'QuantileSketch':
+        return cls(means=np.asarray(state['means'], dtype=np.float64),
+                   weights=np.asarray(state['weights'], dtype=np.float64),
+                   compression=state['compression'], max_size=state['max_size'])
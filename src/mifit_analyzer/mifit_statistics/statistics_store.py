@@ -0,0 +1,82 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from mifit_statistics.column_statistics import ColumnStatistics
+
+
+STATISTICS_FORMAT_VERSION = 2
+
+
+class StatisticsStore:
+
+    def __init__(self, path: str, parameters: dict) -> None:
+        self.path = path
+        self.parameters = json.loads(json.dumps({'version': STATISTICS_FORMAT_VERSION, **parameters}, default=str))
+
+        self.state = self.read_state()
+
+    def __repr__(self) -> str:
+        cls_name = type(self).__name__
+        return f"{cls_name}(path='{self.path}', parameters={self.parameters})"
+
+    def read_state(self) -> dict:
+        empty_state = {'parameters': self.parameters, 'sealed_until': None, 'sealed_rows': 0, 'columns': {}}
+
+        if not os.path.exists(self.path):
+            return empty_state
+
+        with open(self.path) as file:
+            state = json.load(file)
+
+        if state['parameters'] != self.parameters:
+            logging.info(f'Transform parameters have changed, the statistics state {self.path} is rebuilt')
+            return empty_state
+
+        return state
+
+    def get_statistics(self, data: pd.DataFrame, columns: list[str],
+                       sealed_until: str | None) -> dict[str, ColumnStatistics]:
+        # rows dated before the watermark never change, so only their statistics are kept between runs
+        sealed_stop = 0 if sealed_until is None else int(data.index.searchsorted(pd.Timestamp(sealed_until)))
+
+        sealed_rows = self.state['sealed_rows']
+        if self.state['sealed_until'] is not None:
+            stored_stop = int(data.index.searchsorted(pd.Timestamp(self.state['sealed_until'])))
+        else:
+            stored_stop = 0
+
+        if stored_stop != sealed_rows or sealed_rows > sealed_stop or set(self.state['columns']) != set(columns):
+            if sealed_rows:
+                logging.info(f'Statistics state {self.path} does not match the data and is rebuilt')
+            self.state = {'parameters': self.parameters, 'sealed_until': None, 'sealed_rows': 0,
+                          'columns': {column: ColumnStatistics.from_values(data[column].iloc[:0]).to_dict()
+                                      for column in columns}}
+            sealed_rows = 0
+
+        statistics = {column: ColumnStatistics.from_dict(self.state['columns'][column]) for column in columns}
+
+        if sealed_stop > sealed_rows:
+            newly_sealed_data = data.iloc[sealed_rows:sealed_stop]
+            statistics = {column: column_statistics.merge(ColumnStatistics.from_values(newly_sealed_data[column]))
+                          for column, column_statistics in statistics.items()}
+            self.state.update(sealed_until=sealed_until, sealed_rows=sealed_stop,
+                              columns={column: column_statistics.to_dict()
+                                       for column, column_statistics in statistics.items()})
+            self.save()
+
+        logging.info(f'Statistics state {self.path} covers {sealed_rows} stored rows, '
+                     f'{len(data) - sealed_rows} rows have been scanned')
+
+        tail_data = data.iloc[sealed_stop:]
+        return {column: column_statistics.merge(ColumnStatistics.from_values(tail_data[column]))
+                for column, column_statistics in statistics.items()}
+
+    def save(self) -> None:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with open(f'{self.path}.tmp', 'w') as file:
+            json.dump(self.state, file)
+        os.replace(f'{self.path}.tmp', self.path)
@@ -1 +1,3 @@
 from .report import MifitReport
+from .report_converter import ConversionFailure, ReportConverter
+from .report_metric import ReportMetric, get_template_fields
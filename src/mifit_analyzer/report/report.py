@@ -1,21 +1,32 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
 import glob
 import logging
 from pathlib import Path
+from typing import Any, cast
 from pympler import asizeof
-import subprocess
 
+import numpy as np
 import pandas as pd
 
-from abstract_classes import convert_csv_to_markdown, markdown_text
+from abstract_classes import MiFitDataAbstract, PlotCache, PlotRenderer, markdown_text
 from activity import ActivityData, ActivityPlotter, ActivityReportPlotter
+from analytics import StreakSummary, rolling_windows
 from activity_stage import ActivityStageData, ActivityStagePlotter, ActivityStageReportPlotter
+from heart_rate import HeartRateData
+from markdown_tables import render_data_frame, write_table
 from mifit_dataclasses import MiFitData
+from report.report_converter import ReportConverter
+from report.report_metric import ReportMetric, get_template_fields
 from sleep import SleepData, SleepPlotter, SleepReportPlotter
 from sleep_activity import SleepActivityData, SleepActivityPlotter, SleepActivityReportPlotter
 
 
+def get_last_value(values: pd.Series, default: float = np.nan) -> float:
+    # a date range without recorded days has no last value
+    return values.iloc[-1] if len(values) else default
+
+
 @dataclass(slots=True, frozen=True)
 class TotalRecords:
     start_date: str
@@ -33,11 +44,60 @@ class TotalRecords:
 
 class MifitReport:
 
+    metrics = (
+        ReportMetric('date_min', 'get_first_date', dataset='activity'),
+        ReportMetric('date_max', 'get_last_date', dataset='activity'),
+        ReportMetric('days_number', 'get_days_number', dataset='activity'),
+        ReportMetric('daily_steps_goal_achieved_days', 'get_goal_achieved_days', dataset='activity',
+                     columns=('steps',)),
+        ReportMetric('distance_sum', 'get_total', ('distance',), dataset='activity'),
+        ReportMetric('steps_sum', 'get_total', ('steps',), dataset='activity'),
+        ReportMetric('calories_sum', 'get_total', ('calories',), dataset='activity'),
+        ReportMetric('run_distance_sum', 'get_total', ('runDistance',), dataset='activity'),
+        ReportMetric('total_sleep_time_sum', 'get_total', ('totalSleepTime_hours',), dataset='sleep'),
+        ReportMetric('daily_steps_goal', 'get_daily_steps_goal'),
+        ReportMetric('start_date', 'format_date', dependencies=('date_min',)),
+        ReportMetric('end_date', 'format_date', dependencies=('date_max',)),
+        ReportMetric('date_difference', 'get_date_difference', dependencies=('date_min', 'date_max')),
+        ReportMetric('available_days_percent', 'get_percent', dependencies=('days_number', 'date_difference')),
+        ReportMetric('daily_steps_goal_achieved_days_percent', 'get_percent',
+                     dependencies=('daily_steps_goal_achieved_days', 'days_number')),
+        ReportMetric('total_sleep_days_number', 'get_sleep_days', dependencies=('total_sleep_time_sum',)),
+        ReportMetric('total_sleep_days_percent', 'get_sleep_days_percent',
+                     dependencies=('total_sleep_time_sum', 'days_number')),
+        ReportMetric('total_distance_kilometers', 'get_thousands', dependencies=('distance_sum',)),
+        ReportMetric('total_distance_kilosteps', 'get_thousands', dependencies=('steps_sum',)),
+        ReportMetric('total_burned_kilocalories', 'get_thousands', dependencies=('calories_sum',)),
+        ReportMetric('total_run_kilometers', 'get_thousands', dependencies=('run_distance_sum',)),
+        ReportMetric('stride_length', 'get_ratio', dependencies=('distance_sum', 'steps_sum')))
+
+    interesting_statistics_template = \
+        'You have been wearing a fitness bracelet from {start_date} to {end_date}.\n\n' \
+        'Data are available for {days_number} ({available_days_percent}%) days out ' \
+        'of {date_difference} total days.\n\n' \
+        'Your daily steps goal is {daily_steps_goal} steps a day.\n\n' \
+        'You have successfully achieved your daily steps goal during {daily_steps_goal_achieved_days} ' \
+        '({daily_steps_goal_achieved_days_percent}%) days in total.\n\n' \
+        'You slept for {total_sleep_days_number} ({total_sleep_days_percent}%) days in total.\n\n' \
+        'You walked {total_distance_kilometers} kilometers in total.\n\n' \
+        'You walked {total_distance_kilosteps} thousand steps in total.\n\n' \
+        'You burned {total_burned_kilocalories} kilocalories while walking.\n\n' \
+        'You ran {total_run_kilometers} kilometers.\n\n' \
+        'Your stride length is {stride_length} meter.\n\n'
+
     def __init__(self, mifit_data: MiFitData,
                  user_name: str, daily_steps_goal: int,
                  top_step_days_number: int, date_format: str,
-                 results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results') -> None:
+                 results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results',
+                 report_converter: ReportConverter | None = None, write_statistics_files: bool = True,
+                 min_streak_length: int = 7, sleep_target_hours: float = 8.0,
+                 rolling_windows: tuple[int, ...] = rolling_windows,
+                 plot_renderer: PlotRenderer | None = None, plot_cache: PlotCache | None = None) -> None:
         self.results_directory = results_directory
+        self.report_converter = report_converter
+        self.plot_renderer = plot_renderer
+        self.plot_cache = plot_cache
+        self.write_statistics_files = write_statistics_files
         self.plots_directory = f'{results_directory}/plots/'
         self.statistics_directory = f'{results_directory}/statistics'
         self.report_directory = f'{results_directory}/report'
@@ -50,26 +110,22 @@ class MifitReport:
         self.activity: ActivityData = mifit_data.activity
         self.sleep_activity: SleepActivityData = mifit_data.sleep_activity
         self.activity_stage: ActivityStageData = mifit_data.activity_stage
+        self.heart_rate: HeartRateData | None = mifit_data.heart_rate
 
         self.user = user_name
         self.daily_steps_goal = daily_steps_goal
         self.number_days = top_step_days_number
+        self.min_streak_length = min_streak_length
+        self.sleep_target_hours = sleep_target_hours
+        self.rolling_windows = rolling_windows
 
         self.markdown_plots_list: list[markdown_text] = []
-        self.date_min: datetime = self.activity.data.date.min()
-        self.date_max: datetime = self.activity.data.date.max()
-
-        self.date_difference: int = (self.date_max - self.date_min).days + 1
-        self.total_sleep_time_sum: int = self.sleep.data.totalSleepTime_hours.sum()
-        self.distance_sum: int = self.activity.data.distance.sum()
-        self.steps_sum: int = self.activity.data.steps.sum()
-        self.daily_steps_goal_achieved_days: int = self.activity.data[self.activity.data.steps >=
-                                                                      self.daily_steps_goal].shape[0]
+        self.metric_values: dict[str, object] = {}
 
         Path(self.report_directory).mkdir(parents=True, exist_ok=True)
 
     def __len__(self) -> int:
-        return self.activity.data.shape[0]
+        return cast(int, self.get_metric('days_number'))
 
     def __repr__(self) -> str:
         cls_name = type(self).__name__
@@ -93,33 +149,36 @@ class MifitReport:
                          f'date: {today}\n'
                          f'---']
 
-        records = self.get_total_records()
-
-        logging.info('Records have been calculated')
-
-        interesting_statistics = self.get_interesting_statistics(records)
+        interesting_statistics = self.get_interesting_statistics()
 
         logging.info('Interesting_statistics have been calculated')
 
-        self.save_top_step_days()
-        sleep_statistics, activity_statistics, activity_stage_statistics, top_step_days = self.get_mifit_statistics()
+        top_step_days_df = self.get_top_step_days()
+        if self.write_statistics_files:
+            self.save_top_step_days(top_step_days_df)
+        sleep_statistics, activity_statistics, activity_stage_statistics, top_step_days = \
+            self.get_mifit_statistics(top_step_days_df)
 
         markdown_list.extend((interesting_statistics,
                               'MiFit data sleep statistics\n', sleep_statistics,
                               'MiFit data activity statistics\n', activity_statistics,
                               'MiFit data activity stage statistics\n', activity_stage_statistics,
-                              f'MiFit data top {self.number_days} step days\n', top_step_days))
+                              f'MiFit data top {self.number_days} step days\n', top_step_days,
+                              'MiFit data rolling averages\n', self.get_rolling_statistics()))
+
+        if self.heart_rate is not None:
+            markdown_list.extend(('MiFit data heart rate statistics\n',
+                                  self.get_heart_rate_statistics(self.heart_rate)))
 
         markdown_list.extend(self.markdown_plots_list)
 
+        self.wait_for_plots()
         self.save_report(markdown_list)
 
         logging.info('Report has been saved as .md file')
 
         self.convert_report_to_html()
 
-        logging.info('Report has been saved as .html file')
-
     def get_all_plots_for_markdown_report(self) -> list[str]:
         all_png_files = glob.glob(f'{self.plots_directory}/*.png')
         plots_list = []
@@ -138,83 +197,208 @@ class MifitReport:
         with open(f"{self.report_directory}/report.md", 'w') as file_md:
             file_md.write('\n'.join(markdown_list))
 
+    def get_metric(self, name: str) -> object:
+        if name not in self.metric_values:
+            metric = self.get_registered_metric(name)
+            if metric.dataset is not None:
+                self.compute_dataset_metrics(metric.dataset, [metric])
+            else:
+                values = [self.get_metric(dependency) for dependency in metric.dependencies]
+                self.metric_values[name] = getattr(self, metric.method)(*values, *metric.arguments)
+        return self.metric_values[name]
+
+    def get_metrics(self, names: list[str]) -> dict[str, object]:
+        # the dataset metrics behind the requested ones are collected first, so each dataset is scanned once
+        dataset_metrics: dict[str, list[ReportMetric]] = {}
+        for metric in self.get_required_metrics(names):
+            if metric.dataset is not None and metric.name not in self.metric_values:
+                dataset_metrics.setdefault(metric.dataset, []).append(metric)
+        for dataset, metrics in dataset_metrics.items():
+            self.compute_dataset_metrics(dataset, metrics)
+
+        return {name: self.get_metric(name) for name in names}
+
+    def get_registered_metric(self, name: str) -> ReportMetric:
+        metric = {metric.name: metric for metric in self.metrics}.get(name)
+        if metric is None:
+            raise KeyError(f"{type(self).__name__} has no metric '{name}'")
+        return metric
+
+    def get_required_metrics(self, names: list[str]) -> list[ReportMetric]:
+        required_metrics: dict[str, ReportMetric] = {}
+        pending_names = list(names)
+        while pending_names:
+            name = pending_names.pop()
+            if name not in required_metrics:
+                required_metrics[name] = self.get_registered_metric(name)
+                pending_names.extend(required_metrics[name].dependencies)
+        return list(required_metrics.values())
+
+    def compute_dataset_metrics(self, dataset_name: str, metrics: list[ReportMetric]) -> None:
+        dataset = getattr(self, dataset_name)
+        columns = list(dict.fromkeys(column for metric in metrics for column in metric.columns))
+        data = dataset.ensure_columns(*columns)
+        # numpy views of the columns keep numpy scalars and rounding for both dataframe backends
+        values = {column: data[column].to_numpy() for column in columns}
+
+        for metric in metrics:
+            self.metric_values[metric.name] = getattr(self, metric.method)(dataset, values, *metric.arguments)
+        logging.info(f'Report metrics {", ".join(metric.name for metric in metrics)} have been computed '
+                     f'in one pass over {type(dataset).__name__}')
+
+    def get_first_date(self, dataset: MiFitDataAbstract, values: dict[str, np.ndarray]) -> datetime:
+        # the data are sorted by their date index, so the range is read from the index endpoints
+        return dataset.data.index[0]
+
+    def get_last_date(self, dataset: MiFitDataAbstract, values: dict[str, np.ndarray]) -> datetime:
+        return dataset.data.index[-1]
+
+    def get_days_number(self, dataset: MiFitDataAbstract, values: dict[str, np.ndarray]) -> int:
+        return dataset.data.shape[0]
+
+    def get_total(self, dataset: MiFitDataAbstract, values: dict[str, np.ndarray], column: str) -> float:
+        # the sums are read from the rollups shared with the statistics tables and the plots
+        return dataset.get_rollup().get_total(column)
+
+    def get_goal_achieved_days(self, dataset: MiFitDataAbstract, values: dict[str, np.ndarray]) -> int:
+        return int(np.count_nonzero(values['steps'] >= self.daily_steps_goal))
+
+    def get_daily_steps_goal(self) -> int:
+        return self.daily_steps_goal
+
+    def format_date(self, date: datetime) -> str:
+        return date.strftime(self.date_format)
+
+    def get_date_difference(self, date_min: datetime, date_max: datetime) -> int:
+        return (date_max - date_min).days + 1
+
+    def get_percent(self, part: float, total: float) -> float:
+        return round(part / total * 100, 2)
+
+    def get_sleep_days(self, total_sleep_time_sum: float) -> float:
+        return round(total_sleep_time_sum / 24, 2)
+
+    def get_sleep_days_percent(self, total_sleep_time_sum: float, days_number: int) -> float:
+        return round(total_sleep_time_sum / 24 / days_number * 100, 2)
+
+    def get_thousands(self, value: float) -> float:
+        return round(value / 1000, 2)
+
+    def get_ratio(self, numerator: float, denominator: float) -> float:
+        return round(numerator / denominator, 2)
+
     def get_total_records(self) -> TotalRecords:
-        return TotalRecords(start_date=self.date_min.strftime(self.date_format),
-                            end_date=self.date_max.strftime(self.date_format),
-                            available_days_percent=round(len(self) / self.date_difference * 100, 2),
-                            daily_steps_goal_achieved_days_percent=round(self.daily_steps_goal_achieved_days /
-                                                                         len(self) * 100, 2),
-                            total_sleep_days_number=round(self.total_sleep_time_sum / 24, 2),
-                            total_sleep_days_percent=round(self.total_sleep_time_sum / 24 / len(self) * 100, 2),
-                            total_distance_kilometers=round(self.distance_sum / 1000, 2),
-                            total_distance_kilosteps=round(self.steps_sum / 1000, 2),
-                            total_burned_kilocalories=round(self.activity.data.calories.sum() / 1000, 2),
-                            total_run_kilometers=round(self.activity.data.runDistance.sum() / 1000, 2),
-                            stride_length=round(self.distance_sum / self.steps_sum, 2)
-                            )
-
-    def get_interesting_statistics(self, records: TotalRecords) -> str:
-        text = f'You have been wearing a fitness bracelet from {records.start_date} to ' \
-               f'{records.end_date}.\n\n' \
-               f'Data are available for {len(self)} ({records.available_days_percent}%) days out ' \
-               f'of {self.date_difference} total days.\n\n' \
-               f'Your daily steps goal is {self.daily_steps_goal} steps a day.\n\n' \
-               f'You have successfully achieved your daily steps goal during {self.daily_steps_goal_achieved_days} ' \
-               f'({records.daily_steps_goal_achieved_days_percent}%) days in total.\n\n' \
-               f'You slept for {records.total_sleep_days_number} ' \
-               f'({records.total_sleep_days_percent}%) days in total.\n\n' \
-               f'You walked {records.total_distance_kilometers} kilometers in total.\n\n' \
-               f'You walked {records.total_distance_kilosteps} thousand steps in total.\n\n' \
-               f'You burned {records.total_burned_kilocalories} kilocalories while walking.\n\n' \
-               f'You ran {records.total_run_kilometers} kilometers.\n\n' \
-               f'Your stride length is ' \
-               f'{records.stride_length} meter.\n\n'
+        # the metrics are typed by the methods computing them, which match the fields of TotalRecords
+        return TotalRecords(**cast(dict[str, Any], self.get_metrics([field.name for field in fields(TotalRecords)])))
+
+    def get_interesting_statistics(self) -> str:
+        # only the metrics named in the template are computed
+        text = self.interesting_statistics_template.format(
+            **self.get_metrics(get_template_fields(self.interesting_statistics_template)))
+
+        streaks = self.activity.find_date_range_length_by_daily_steps_goal(daily_steps_goal=self.daily_steps_goal,
+                                                                           min_length=self.min_streak_length)
+        text += self.get_streak_statistics(streaks)
         return text
 
-    def get_mifit_statistics(self) -> tuple[str, ...]:
-        with open(f'{self.statistics_directory}/sleep_statistics.md') as file:
-            sleep_statistics = file.read()
+    def get_streak_statistics(self, streaks: StreakSummary) -> str:
+        if streaks.longest is None:
+            return 'You have not achieved your daily steps goal yet.\n\n'
 
-        with open(f'{self.statistics_directory}/activity_statistics.md') as file:
-            activity_statistics = file.read()
+        text = f'Your longest streak of achieving your daily steps goal lasted {streaks.longest.length} days ' \
+               f'from {streaks.longest.start_date.strftime(self.date_format)} ' \
+               f'to {streaks.longest.end_date.strftime(self.date_format)}.\n\n'
 
-        with open(f'{self.statistics_directory}/activity_stage_statistics.md') as file:
-            activity_stage_statistics = file.read()
+        if streaks.current is None:
+            text += 'You did not achieve your daily steps goal on your last recorded day.\n\n'
+        else:
+            text += f'Your current streak of achieving your daily steps goal lasts {streaks.current.length} days ' \
+                    f'since {streaks.current.start_date.strftime(self.date_format)}.\n\n'
 
-        with open(f'{self.statistics_directory}/top_step_days.md') as file:
-            top_step_days = file.read()
+        text += f'You have achieved your daily steps goal for at least {self.min_streak_length} days in a row ' \
+                f'{len(streaks)} times.\n\n'
+        return text
+
+    def get_mifit_statistics(self, top_step_days_df: pd.DataFrame) -> tuple[str, ...]:
+        # the tables are rendered from the statistics kept by the datasets, the files are only an optional copy
+        return (render_data_frame(self.sleep.get_statistics()), render_data_frame(self.activity.get_statistics()),
+                render_data_frame(self.activity_stage.get_statistics()),
+                render_data_frame(top_step_days_df, index=False))
+
+    def get_rolling_statistics(self) -> str:
+        rolling_activity = self.activity.get_rolling_activity(daily_steps_goal=self.daily_steps_goal,
+                                                              windows=self.rolling_windows)
+        rolling_sleep = self.sleep.get_rolling_sleep(target_hours=self.sleep_target_hours, windows=self.rolling_windows)
+
+        # every window ends on the last recorded day of its dataset
+        rolling_table = pd.DataFrame(
+            {'Steps': [get_last_value(rolling_activity[f'steps_mean_{window}d']) for window in self.rolling_windows],
+             'Distance': [get_last_value(rolling_activity[f'distance_mean_{window}d'])
+                          for window in self.rolling_windows],
+             'Steps goal achieved days (%)': [get_last_value(rolling_activity[f'steps_goal_rate_{window}d']) * 100
+                                              for window in self.rolling_windows],
+             'Total sleep time (hours)': [get_last_value(rolling_sleep[f'totalSleepTime_hours_mean_{window}d'])
+                                          for window in self.rolling_windows],
+             'Sleep debt (hours)': [get_last_value(rolling_sleep[f'totalSleepTime_hours_debt_{window}d'])
+                                    for window in self.rolling_windows]},
+            index=[f'Last {window} days' for window in self.rolling_windows]).round(2)
+
+        sleep_debt = round(float(get_last_value(rolling_sleep['totalSleepTime_hours_debt'], 0.0)), 2)
+        text = f'Your sleep target is {self.sleep_target_hours} hours a night, your sleep debt over the whole ' \
+               f'period is {sleep_debt} hours.\n\n' \
+               f'{render_data_frame(rolling_table)}'
+        return text
 
-        return sleep_statistics, activity_statistics, activity_stage_statistics, top_step_days
+    def get_heart_rate_statistics(self, heart_rate: HeartRateData) -> str:
+        heart_rate_statistics = render_data_frame(heart_rate.get_statistics())
 
-    def save_top_step_days(self) -> None:
-        top_step_days_df = self.activity.data.sort_values(by='steps', ascending=False)[: self.number_days]
+        resting_heart_rate = round(float(heart_rate.data.resting.mean()), 2)
+        lowest_hour = heart_rate.hourly_data.groupby('hour')['mean'].mean().idxmin()
+
+        text = f'Your heart rate was measured during {len(heart_rate)} days.\n\n' \
+               f'Your average resting heart rate is {resting_heart_rate} beats per minute.\n\n' \
+               f'Your heart rate is usually the lowest at {lowest_hour}:00.\n\n' \
+               f'{heart_rate_statistics}'
+        return text
 
+    def get_top_step_days(self) -> pd.DataFrame:
         columns = ['date', 'date_weekday_name', 'steps', 'distance', 'runDistance']
-        top_step_days_df = top_step_days_df[columns]
+        top_step_days_df = self.activity.ensure_columns(*columns)\
+            .sort_values(by='steps', ascending=False)[: self.number_days]
 
         top_step_days_df['date'] = top_step_days_df['date'].apply(pd.to_datetime).dt.date
 
         top_step_days_df.columns = ['Date', 'Day', 'Steps', 'Distance', 'Run distance']
+        return top_step_days_df
 
-        top_step_days_df.to_csv(f'{self.statistics_directory}/top_step_days.csv', index=False)
-
-        convert_csv_to_markdown(csv_file=self.top_step_days_file_name)
+    def save_top_step_days(self, top_step_days_df: pd.DataFrame) -> None:
+        write_table(top_step_days_df, self.top_step_days_file_name, index=False)
 
     def convert_report_to_html(self) -> None:
-        arg_list = ['pandoc', '--self-contained', '-s', f'{self.report_directory}/report.md', '-o',
-                    f'{self.report_directory}/report.html']
-        stream = subprocess.Popen(arg_list, stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding='utf-8')
-        out, err = stream.communicate()
+        markdown_file = f'{self.report_directory}/report.md'
+        html_file = f'{self.report_directory}/report.html'
+
+        if self.report_converter is None:
+            with ReportConverter(max_workers=1) as report_converter:
+                report_converter.submit(markdown_file, html_file)
+            return
+
+        # the shared converter runs pandoc in the background and reports its failures when it is closed
+        self.report_converter.submit(markdown_file, html_file)
+        logging.info('Report conversion to .html file has been started')
 
     def make_plots(self) -> None:
         self.markdown_plots_list.append('Here you can find your plots\n')
 
-        sleep_plotter = SleepPlotter(self.sleep.data, results_directory=self.results_directory)
+        sleep_plotter = SleepPlotter(self.sleep.ensure_columns(*SleepPlotter.required_columns),
+                                     results_directory=self.results_directory, rollup=self.sleep.get_rollup())
 
         sleep_plotter.make_logging_message()
 
         sleep_report_plotter = SleepReportPlotter(plotter=sleep_plotter,
-                                                  markdown_plots_list=self.markdown_plots_list)
+                                                  markdown_plots_list=self.markdown_plots_list,
+                                                  plot_renderer=self.plot_renderer,
+                                                  plot_cache=self.plot_cache)
 
         sleep_report_plotter.make_logging_message()
 
@@ -222,12 +406,16 @@ class MifitReport:
 
         logging.info('Sleep plots have been successfully built')
 
-        activity_plotter = ActivityPlotter(self.activity.data, results_directory=self.results_directory)
+        activity_plotter = ActivityPlotter(self.activity.ensure_columns(*ActivityPlotter.required_columns),
+                                           results_directory=self.results_directory,
+                                           rollup=self.activity.get_rollup())
 
         activity_plotter.make_logging_message()
 
         activity_report_plotter = ActivityReportPlotter(plotter=activity_plotter,
-                                                        markdown_plots_list=self.markdown_plots_list)
+                                                        markdown_plots_list=self.markdown_plots_list,
+                                                        plot_renderer=self.plot_renderer,
+                                                        plot_cache=self.plot_cache)
 
         activity_report_plotter.make_logging_message()
 
@@ -235,13 +423,15 @@ class MifitReport:
 
         logging.info('Activity plots have been successfully built')
 
-        sleep_activity_plotter = SleepActivityPlotter(self.sleep_activity.data,
-                                                      results_directory=self.results_directory)
+        sleep_activity_data = self.sleep_activity.ensure_columns(*SleepActivityPlotter.required_columns)
+        sleep_activity_plotter = SleepActivityPlotter(sleep_activity_data, results_directory=self.results_directory)
 
         sleep_activity_plotter.make_logging_message()
 
         sleep_activity_report_plotter = SleepActivityReportPlotter(plotter=sleep_activity_plotter,
-                                                                   markdown_plots_list=self.markdown_plots_list)
+                                                                   markdown_plots_list=self.markdown_plots_list,
+                                                                   plot_renderer=self.plot_renderer,
+                                                                   plot_cache=self.plot_cache)
 
         sleep_activity_report_plotter.make_logging_message()
 
@@ -249,13 +439,15 @@ class MifitReport:
 
         logging.info('Sleep_activity plots have been successfully built')
 
-        activity_stage_plotter = ActivityStagePlotter(self.activity_stage.data,
-                                                      results_directory=self.results_directory)
+        activity_stage_data = self.activity_stage.ensure_columns(*ActivityStagePlotter.required_columns)
+        activity_stage_plotter = ActivityStagePlotter(activity_stage_data, results_directory=self.results_directory)
 
         activity_stage_plotter.make_logging_message()
 
         activity_stage_report_plotter = ActivityStageReportPlotter(plotter=activity_stage_plotter,
-                                                                   markdown_plots_list=self.markdown_plots_list)
+                                                                   markdown_plots_list=self.markdown_plots_list,
+                                                                   plot_renderer=self.plot_renderer,
+                                                                   plot_cache=self.plot_cache)
 
         activity_stage_report_plotter.make_logging_message()
 
@@ -263,6 +455,15 @@ class MifitReport:
 
         logging.info('Activity_stage plots have been successfully built')
 
+    def wait_for_plots(self) -> None:
+        # the plot workers go on while the report computes its tables, but the report links the plot files,
+        # so all of them have to be written before it is converted
+        if self.plot_renderer is not None:
+            self.plot_renderer.wait()
+
+        if self.plot_cache is not None:
+            self.plot_cache.flush()
+
     def make_statistics(self) -> None:
         pass
 
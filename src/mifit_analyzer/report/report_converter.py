@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import Future, wait
+from dataclasses import dataclass
+import logging
+import threading
+from time import perf_counter
+
+
+@dataclass(slots=True, frozen=True)
+class ConversionFailure:
+    markdown_file: str
+    html_file: str
+    message: str
+
+
+class ReportConverter:
+
+    def __init__(self, max_workers: int = 2) -> None:
+        self.max_workers = max_workers
+        self.futures: list[Future] = []
+        self.failures: list[ConversionFailure] = []
+
+        # the event loop runs in its own thread, so the conversions go on while the caller keeps working
+        self.loop = asyncio.new_event_loop()
+        self.semaphore = asyncio.Semaphore(max_workers)
+        self.thread = threading.Thread(target=self.loop.run_forever, name='report_converter', daemon=True)
+        self.thread.start()
+
+    def __repr__(self) -> str:
+        cls_name = type(self).__name__
+        return f'{cls_name}(max_workers={self.max_workers})'
+
+    def __enter__(self) -> 'ReportConverter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # the failures are still logged, but they do not replace an exception raised within the block
+        self.close(raise_failures=exc_type is None)
+
+    def submit(self, markdown_file: str, html_file: str) -> Future:
+        future = asyncio.run_coroutine_threadsafe(self.convert(markdown_file, html_file), self.loop)
+        self.futures.append(future)
+        return future
+
+    async def convert(self, markdown_file: str, html_file: str) -> None:
+        async with self.semaphore:
+            start_time = perf_counter()
+            try:
+                process = await asyncio.create_subprocess_exec('pandoc', '--self-contained', '-s', markdown_file,
+                                                               '-o', html_file, stdout=asyncio.subprocess.PIPE,
+                                                               stderr=asyncio.subprocess.PIPE)
+                _, err = await process.communicate()
+            except OSError as error:
+                self.failures.append(ConversionFailure(markdown_file, html_file, str(error)))
+                return
+
+            if process.returncode != 0:
+                message = f'pandoc exited with code {process.returncode}: {err.decode(errors="replace").strip()}'
+                self.failures.append(ConversionFailure(markdown_file, html_file, message))
+                return
+
+            logging.info(f'{markdown_file} has been converted to {html_file} in {perf_counter() - start_time:.2f} '
+                         f'seconds')
+
+    def wait(self) -> list[ConversionFailure]:
+        wait(self.futures)
+        self.futures.clear()
+        return self.failures
+
+    def close(self, raise_failures: bool = True) -> None:
+        failures = self.wait()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+        for failure in failures:
+            logging.error(f'{failure.markdown_file} could not be converted to {failure.html_file}: {failure.message}')
+        if failures and raise_failures:
+            raise RuntimeError(f'{len(failures)} reports could not be converted to html, see the log for details')
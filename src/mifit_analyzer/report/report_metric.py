@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from string import Formatter
+
+
+@dataclass(slots=True, frozen=True)
+class ReportMetric:
+    name: str
+    method: str
+    arguments: tuple = ()
+    dependencies: tuple[str, ...] = ()
+    # the metrics of a dataset are computed from its columns together in one pass
+    dataset: str | None = None
+    columns: tuple[str, ...] = ()
+
+
+def get_template_fields(template: str) -> list[str]:
+    return list(dict.fromkeys(field_name for _, field_name, _, _ in Formatter().parse(template) if field_name))
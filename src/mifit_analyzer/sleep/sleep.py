@@ -2,19 +2,61 @@ from datetime import timedelta
 
 import pandas as pd
 
-from abstract_classes.mifit_abstract import MiFitDataAbstract, convert_csv_to_markdown
+from abstract_classes.derived_column import DerivedColumn
+from abstract_classes.mifit_abstract import MiFitDataAbstract
+from analytics import get_rolling_means, get_sleep_debt, rolling_windows
+from ingestion import DtypeSchema, IngestionConfig
+from time_zones import TimeZoneTimeline
 
 
 class SleepData(MiFitDataAbstract):
 
+    export_name = 'SLEEP'
+
+    dtype_schema = DtypeSchema(
+        read_dtypes={'deepSleepTime': 'uint16', 'shallowSleepTime': 'uint16', 'wakeTime': 'uint16'},
+        derived_dtypes={'totalSleepTime': 'uint16', 'start_weekday_real': 'int8', 'stop_weekday_real': 'int8',
+                        'start_month_real': 'int8', 'year_real': 'int16'})
+
+    derived_columns = (
+        DerivedColumn('totalSleepTime', ('deepSleepTime', 'shallowSleepTime'), 'get_total_sleep_time'),
+        DerivedColumn('deepSleepTime_hours', ('deepSleepTime',), 'convert_minutes_to_hours', ('deepSleepTime',)),
+        DerivedColumn('shallowSleepTime_hours', ('shallowSleepTime',), 'convert_minutes_to_hours',
+                      ('shallowSleepTime',)),
+        DerivedColumn('totalSleepTime_hours', ('totalSleepTime',), 'convert_minutes_to_hours', ('totalSleepTime',)),
+        DerivedColumn('deep_total_sleep_ratio', ('deepSleepTime', 'totalSleepTime'), 'get_deep_total_sleep_ratio'),
+        DerivedColumn('start_real', ('start',), 'get_real_time', ('start',)),
+        DerivedColumn('stop_real', ('stop',), 'get_real_time', ('stop',)),
+        DerivedColumn('start_time_real', ('start_real',), 'get_time_of_day', ('start_real',)),
+        DerivedColumn('stop_time_real', ('stop_real',), 'get_time_of_day', ('stop_real',)),
+        DerivedColumn('start_weekday_real', ('start_real',), 'get_weekday', ('start_real',)),
+        DerivedColumn('stop_weekday_real', ('stop_real',), 'get_weekday', ('stop_real',)),
+        DerivedColumn('start_month_real', ('start_real',), 'get_month', ('start_real',)),
+        DerivedColumn('year_real', ('start_real',), 'get_year', ('start_real',)),
+        DerivedColumn('start_weekday_name_real', ('start_real',), 'get_weekday_name', ('start_real',)),
+        DerivedColumn('stop_weekday_name_real', ('stop_real',), 'get_weekday_name', ('stop_real',)),
+        DerivedColumn('start_month_name_real', ('start_real',), 'get_month_name', ('start_real',)),
+        DerivedColumn('stop_month_name_real', ('stop_real',), 'get_month_name', ('stop_real',)))
+
+    statistics_columns = {'totalSleepTime_hours': 'Total sleep time (hours)',
+                          'deepSleepTime_hours': 'Deep sleep time (hours)',
+                          'shallowSleepTime_hours': 'Shallow sleep time (hours)',
+                          'start_time_real': 'Start sleep time', 'stop_time_real': 'Stop sleep time',
+                          'deep_total_sleep_ratio': 'Deep sleep time/Total sleep time ratio'}
+
+    rollup_groupings = {'start_weekday': ('start_weekday_name_real',), 'stop_weekday': ('stop_weekday_name_real',),
+                        'start_month': ('start_month_name_real',), 'stop_month': ('stop_month_name_real',),
+                        'year': ('year_real',), 'weekday_month': ('start_weekday_name_real', 'start_month_name_real')}
+
     def __init__(self, input_directory: str = '/mnt/c/mifit_data/mifit_analyzer/data/SLEEP',
                  start_date: str | None = None, end_date: str | None = None,
                  date_format: str = '%Y.%m.%d',
                  results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results',
-                 hours_difference: int = 0) -> None:
+                 hours_difference: int = 0, ingestion_config: IngestionConfig | None = None,
+                 time_zone_timeline: TimeZoneTimeline | None = None) -> None:
 
         super().__init__(input_directory, start_date, end_date, date_format, results_directory,
-                         hours_difference)
+                         hours_difference, ingestion_config=ingestion_config, time_zone_timeline=time_zone_timeline)
         self.statistics_file_name = f'{self.statistics_directory}/sleep_statistics'
 
     def __repr__(self) -> str:
@@ -25,75 +67,34 @@ class SleepData(MiFitDataAbstract):
                f"start_date='{start_date}', end_date='{end_date}', "\
                f"date_format='{self.date_format}', "\
                f"results_directory='{self.results_directory}', "\
-               f"hours_difference={self.hours_difference})"
-
-    def transform_data_for_analysis(self) -> None:
-        self.add_new_columns()
-        self.select_date_range()
-        self.create_service_directories()
-
-        self.is_prepared = True
+               f"hours_difference={self.hours_difference}, "\
+               f"time_zone_timeline={self.time_zone_timeline})"
 
     def transform_time_columns_to_datetime(self) -> None:
         super().transform_time_columns_to_datetime()
-        self.data['start'] = pd.to_datetime(self.data['start'], unit='s')
-        self.data['stop'] = pd.to_datetime(self.data['stop'], unit='s')
-
-    def add_new_columns(self) -> None:
-        self.data['totalSleepTime'] = self.data.deepSleepTime + self.data.shallowSleepTime
-        self.convert_sleep_minutes_to_hours()
-        self.get_real_start_and_stop_time()
-        self.get_days_and_month_from_date()
-        self.get_days_and_month_names()
-        self.set_the_order_of_days_and_months()
-        self.data['deep_total_sleep_ratio'] = self.data.deepSleepTime_hours / self.data.totalSleepTime_hours
-
-    def convert_sleep_minutes_to_hours(self) -> None:
-        self.data['deepSleepTime_hours'] = round(self.data.deepSleepTime / 60, 2)
-        self.data['shallowSleepTime_hours'] = round(self.data.shallowSleepTime / 60, 2)
-        self.data['totalSleepTime_hours'] = round(self.data.totalSleepTime / 60, 2)
-
-    def get_real_start_and_stop_time(self) -> None:
-        self.data['start_real'] = self.data.start + timedelta(hours=self.hours_difference)
-        self.data['stop_real'] = self.data.stop + timedelta(hours=self.hours_difference)
-        self.data['start_time_real'] = round(self.data.start_real.dt.hour + self.data.start_real.dt.minute / 60, 2)
-        self.data['stop_time_real'] = round(self.data.stop_real.dt.hour + self.data.stop_real.dt.minute / 60, 2)
-
-    def get_days_and_month_from_date(self) -> None:
-        self.data['start_weekday_real'] = self.data.start_real.dt.dayofweek
-        self.data['stop_weekday_real'] = self.data.stop_real.dt.dayofweek
-        self.data['start_month_real'] = self.data.start_real.dt.month
-        self.data['year_real'] = self.data.start_real.dt.year
-
-    def get_days_and_month_names(self) -> None:
-        self.data['start_weekday_name_real'] = self.data.start_real.dt.day_name()
-        self.data['stop_weekday_name_real'] = self.data.stop_real.dt.day_name()
-        self.data['start_month_name_real'] = self.data.start_real.dt.month_name()
-        self.data['stop_month_name_real'] = self.data.stop_real.dt.month_name()
-
-    def set_the_order_of_days_and_months(self) -> None:
-        self.data["start_weekday_name_real"] = self.data["start_weekday_name_real"].astype('category')
-        self.data["start_weekday_name_real"] = self.data["start_weekday_name_real"].cat.set_categories(
-            self.day_of_the_week_names)
-        self.data["stop_weekday_name_real"] = self.data["stop_weekday_name_real"].astype('category')
-        self.data["stop_weekday_name_real"] = self.data["stop_weekday_name_real"].cat.set_categories(
-            self.day_of_the_week_names)
-        self.data["start_month_name_real"] = self.data["start_month_name_real"].astype('category')
-        self.data["start_month_name_real"] = self.data["start_month_name_real"].cat.set_categories(
-            self.month_names)
-        self.data["stop_month_name_real"] = self.data["stop_month_name_real"].astype('category')
-        self.data["stop_month_name_real"] = self.data["stop_month_name_real"].cat.set_categories(
-            self.month_names)
-
-    def write_statistics_to_csv(self) -> None:
-
-        desired_columns = self.data.describe()[['totalSleepTime_hours', 'deepSleepTime_hours', 'shallowSleepTime_hours',
-                                                'start_time_real', 'stop_time_real', 'deep_total_sleep_ratio']]\
-            .round(2)
-
-        desired_columns.columns = ['Total sleep time (hours)', 'Deep sleep time (hours)', 'Shallow sleep time (hours)',
-                                   'Start sleep time', 'Stop sleep time', 'Deep sleep time/Total sleep time ratio']
-
-        desired_columns.to_csv(f'{self.statistics_file_name}.csv')
-
-        convert_csv_to_markdown(csv_file=self.statistics_file_name)
+        self.data['start'] = self.convert_to_datetime(self.data['start'], unit='s')
+        self.data['stop'] = self.convert_to_datetime(self.data['stop'], unit='s')
+
+    def get_total_sleep_time(self) -> pd.Series:
+        return self.data.deepSleepTime + self.data.shallowSleepTime
+
+    def convert_minutes_to_hours(self, column: str) -> pd.Series:
+        return round(self.data[column] / 60, 2)
+
+    def get_real_time(self, column: str) -> pd.Series:
+        if self.time_zone_timeline is not None:
+            return self.time_zone_timeline.convert_to_local_time(self.data[column])
+        return self.data[column] + timedelta(hours=self.hours_difference)
+
+    def get_time_of_day(self, column: str) -> pd.Series:
+        return round(self.data[column].dt.hour + self.data[column].dt.minute / 60, 2)
+
+    def get_deep_total_sleep_ratio(self) -> pd.Series:
+        # computed from the minutes, so the ratio does not depend on which hour columns are materialized
+        return self.convert_minutes_to_hours('deepSleepTime') / self.convert_minutes_to_hours('totalSleepTime')
+
+    def get_rolling_sleep(self, target_hours: float = 8.0,
+                          windows: tuple[int, ...] = rolling_windows) -> pd.DataFrame:
+        data = self.ensure_columns('totalSleepTime_hours')
+        return pd.concat([get_rolling_means(data, ['totalSleepTime_hours'], windows=windows),
+                          get_sleep_debt(data, 'totalSleepTime_hours', target_hours, windows=windows)], axis=1)
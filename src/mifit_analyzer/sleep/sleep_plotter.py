@@ -1,6 +1,5 @@
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import seaborn as sns
 
 from abstract_classes.plotter_abstract import PlotterAbstract
@@ -8,43 +7,55 @@ from abstract_classes.plotter_abstract import PlotterAbstract
 
 class SleepPlotter(PlotterAbstract):
 
+    required_columns = ('deepSleepTime_hours', 'shallowSleepTime_hours', 'totalSleepTime_hours',
+                        'start_weekday_real', 'stop_weekday_real', 'start_month_real', 'year_real',
+                        'start_time_real', 'stop_time_real', 'deep_total_sleep_ratio',
+                        'start_weekday_name_real', 'stop_weekday_name_real', 'start_month_name_real',
+                        'stop_month_name_real')
+
+    rollup_plots = ('make_sleep_hours_boxplot', 'make_sleep_hours_per_start_weekday_boxplot',
+                    'make_sleep_hours_per_stop_weekday_boxplot', 'make_sleep_hours_per_start_month_boxplot',
+                    'make_sleep_hours_per_year_boxplot', 'make_sleep_start_time_per_weekday_boxplot',
+                    'make_sleep_stop_time_per_weekday_boxplot', 'make_sleep_start_time_per_month_boxplot',
+                    'make_sleep_stop_time_per_month_boxplot', 'make_sleep_start_time_per_year_boxplot',
+                    'make_sleep_stop_time_per_year_boxplot', 'make_sleep_deep_hours_per_weekday_boxplot',
+                    'make_sleep_shallow_hours_per_weekday_boxplot', 'make_sleep_deep_hours_per_month_boxplot',
+                    'make_sleep_shallow_hours_per_month_boxplot', 'make_sleep_deep_hours_per_year_boxplot',
+                    'make_sleep_shallow_hours_per_year_boxplot')
+
+    plot_columns = {
+        'make_sleep_hours_pairplot': ('deepSleepTime_hours', 'shallowSleepTime_hours', 'totalSleepTime_hours'),
+        'make_sleep_hours_correlations_plot': ('deepSleepTime_hours', 'shallowSleepTime_hours',
+                                               'totalSleepTime_hours'),
+        'make_sleep_correlations_plot': ('deepSleepTime_hours', 'shallowSleepTime_hours', 'totalSleepTime_hours',
+                                         'start_weekday_real', 'stop_weekday_real', 'start_month_real', 'year_real',
+                                         'start_time_real', 'stop_time_real', 'deep_total_sleep_ratio'),
+        'make_sleep_hours_scatterplot': ('shallowSleepTime_hours', 'deepSleepTime_hours', 'start_weekday_name_real'),
+        'make_sleep_start_and_stop_time_scatterplot': ('start_time_real', 'stop_time_real', 'start_weekday_name_real'),
+        **dict.fromkeys(rollup_plots, ())}
+
     def make_sleep_hours_pairplot(self) -> None:
         sleep_hours = self.data[['deepSleepTime_hours', 'shallowSleepTime_hours', 'totalSleepTime_hours']]
 
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.pairplot(sleep_hours)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_hours_pairplot.png'))
-        plt.close("all")
+        self.figure_pool.save_pyplot_figure(Path(self.plots_directory, 'sleep_hours_pairplot.png'),
+                                            lambda: sns.pairplot(sleep_hours).figure)
 
     def make_sleep_hours_boxplot(self) -> None:
-        sleep_hours = self.data[['deepSleepTime_hours', 'shallowSleepTime_hours', 'totalSleepTime_hours']]
-        fig, axs = plt.subplots(ncols=3, nrows=1, figsize=self.plot_figsize)
-        index = 0
-        axs = axs.flatten()
-        for k, v in sleep_hours.items():
-            sns.boxplot(y=k, data=sleep_hours, ax=axs[index])
-            index += 1
-        plt.tight_layout(pad=0.4, w_pad=0.5, h_pad=5.0)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_hours_boxplot.png'))
-        plt.close("all")
+        plot_path = Path(self.plots_directory, 'sleep_hours_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize, ncols=3) as (fig, axs):
+            for index, column in enumerate(('deepSleepTime_hours', 'shallowSleepTime_hours', 'totalSleepTime_hours')):
+                self.draw_boxplot('all', column, axs[index])
+            fig.tight_layout(pad=0.4, w_pad=0.5, h_pad=5.0)
 
     def make_sleep_hours_correlations_plot(self) -> None:
         correlations = self.data[['deepSleepTime_hours', 'shallowSleepTime_hours', 'totalSleepTime_hours']].corr()
         correlations = correlations * 100
 
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.heatmap(correlations, annot=True, fmt='.0f')
+        plot_path = Path(self.plots_directory, 'sleep_hours_correlations_plot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            sns.heatmap(correlations, annot=True, fmt='.0f', ax=ax)
 
-        plt.title('Sleep time correlations plot', fontsize=self.title_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_hours_correlations_plot.png'))
-        plt.close("all")
+            ax.set_title('Sleep time correlations plot', fontsize=self.title_fontsize)
 
     def make_sleep_correlations_plot(self) -> None:
         columns = self.data[['deepSleepTime_hours', 'shallowSleepTime_hours', 'totalSleepTime_hours',
@@ -54,269 +65,194 @@ class SleepPlotter(PlotterAbstract):
         correlations = columns.corr()
         correlations = correlations * 100
 
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.heatmap(correlations, annot=True, fmt='.0f')
-
-        plt.title('Sleep time correlations plot', fontsize=self.title_fontsize)
+        plot_path = Path(self.plots_directory, 'sleep_correlations_plot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            sns.heatmap(correlations, annot=True, fmt='.0f', ax=ax)
 
-        plt.savefig(Path(self.plots_directory, 'sleep_correlations_plot.png'))
-        plt.close("all")
+            ax.set_title('Sleep time correlations plot', fontsize=self.title_fontsize)
 
     def make_sleep_hours_scatterplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.scatterplot(data=self.data, x="shallowSleepTime_hours", y="deepSleepTime_hours",
-                        hue="start_weekday_name_real")
-
-        plt.xticks(self.hour_axis_labels)
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Shallow and deep sleep time plot', fontsize=self.title_fontsize)
-        plt.xlabel("Shallow sleep, hours", fontsize=self.label_fontsize)
-        plt.ylabel("Deep sleep, hours", fontsize=self.label_fontsize)
-        plt.legend(title="Day of the week")
-
-        plt.savefig(Path(self.plots_directory, 'sleep_hours_scatterplot.png'))
-        plt.close("all")
+        plot_path = Path(self.plots_directory, 'sleep_hours_scatterplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            sns.scatterplot(data=self.data, x="shallowSleepTime_hours", y="deepSleepTime_hours",
+                            hue="start_weekday_name_real", ax=ax)
+
+            ax.set_xticks(self.hour_axis_labels)
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Shallow and deep sleep time plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Shallow sleep, hours", fontsize=self.label_fontsize)
+            ax.set_ylabel("Deep sleep, hours", fontsize=self.label_fontsize)
+            ax.legend(title="Day of the week")
 
     def make_sleep_hours_per_start_weekday_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
+        plot_path = Path(self.plots_directory, 'sleep_hours_per_start_weekday_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('start_weekday', 'totalSleepTime_hours', ax)
 
-        sns.boxplot(data=self.data, y="totalSleepTime_hours", x="start_weekday_name_real")
-
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Total sleep time per day of the week when fall asleep plot', fontsize=self.title_fontsize)
-        plt.xlabel("Day of the week", fontsize=self.label_fontsize)
-        plt.ylabel("Total sleep time, hours", fontsize=self.label_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_hours_per_start_weekday_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Total sleep time per day of the week when fall asleep plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Day of the week", fontsize=self.label_fontsize)
+            ax.set_ylabel("Total sleep time, hours", fontsize=self.label_fontsize)
 
     def make_sleep_hours_per_stop_weekday_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.boxplot(data=self.data, y="totalSleepTime_hours", x="stop_weekday_name_real")
+        plot_path = Path(self.plots_directory, 'sleep_hours_per_stop_weekday_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('stop_weekday', 'totalSleepTime_hours', ax)
 
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Total sleep time per day of the week when woke up plot', fontsize=self.title_fontsize)
-        plt.xlabel("Day of the week", fontsize=self.label_fontsize)
-        plt.ylabel("Total sleep time, hours", fontsize=self.label_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_hours_per_stop_weekday_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Total sleep time per day of the week when woke up plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Day of the week", fontsize=self.label_fontsize)
+            ax.set_ylabel("Total sleep time, hours", fontsize=self.label_fontsize)
 
     def make_sleep_hours_per_start_month_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.boxplot(data=self.data, y="totalSleepTime_hours", x="start_month_name_real")
-
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Total sleep time per month plot', fontsize=self.title_fontsize)
-        plt.xlabel("Month", fontsize=self.label_fontsize)
-        plt.ylabel("Total sleep time, hours", fontsize=self.label_fontsize)
+        plot_path = Path(self.plots_directory, 'sleep_hours_per_start_month_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('start_month', 'totalSleepTime_hours', ax)
 
-        plt.savefig(Path(self.plots_directory, 'sleep_hours_per_start_month_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Total sleep time per month plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Month", fontsize=self.label_fontsize)
+            ax.set_ylabel("Total sleep time, hours", fontsize=self.label_fontsize)
 
     def make_sleep_start_and_stop_time_scatterplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.scatterplot(data=self.data, x="start_time_real", y="stop_time_real", hue="start_weekday_name_real")
-
-        plt.xticks(self.hour_axis_labels)
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Start and stop sleep time plot', fontsize=self.title_fontsize)
-        plt.xlabel("Start sleep time", fontsize=self.label_fontsize)
-        plt.ylabel("Stop sleep time", fontsize=self.label_fontsize)
-        plt.legend(title="Day of the week")
-
-        plt.savefig(Path(self.plots_directory, 'sleep_start_and_stop_time_scatterplot.png'))
-        plt.close("all")
+        plot_path = Path(self.plots_directory, 'sleep_start_and_stop_time_scatterplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            sns.scatterplot(data=self.data, x="start_time_real", y="stop_time_real", hue="start_weekday_name_real",
+                            ax=ax)
+
+            ax.set_xticks(self.hour_axis_labels)
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Start and stop sleep time plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Start sleep time", fontsize=self.label_fontsize)
+            ax.set_ylabel("Stop sleep time", fontsize=self.label_fontsize)
+            ax.legend(title="Day of the week")
 
     def make_sleep_start_time_per_weekday_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
+        plot_path = Path(self.plots_directory, 'sleep_start_time_per_weekday_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('start_weekday', 'start_time_real', ax)
 
-        sns.boxplot(data=self.data, y="start_time_real", x="start_weekday_name_real")
-
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Start sleep time per day of the week plot', fontsize=self.title_fontsize)
-        plt.xlabel("Day of the week", fontsize=self.label_fontsize)
-        plt.ylabel("Start sleep time", fontsize=self.label_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_start_time_per_weekday_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Start sleep time per day of the week plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Day of the week", fontsize=self.label_fontsize)
+            ax.set_ylabel("Start sleep time", fontsize=self.label_fontsize)
 
     def make_sleep_stop_time_per_weekday_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.boxplot(data=self.data, y="stop_time_real", x="stop_weekday_name_real")
+        plot_path = Path(self.plots_directory, 'sleep_stop_time_per_weekday_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('stop_weekday', 'stop_time_real', ax)
 
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Stop sleep time per day of the week plot', fontsize=self.title_fontsize)
-        plt.xlabel("Day of the week", fontsize=self.label_fontsize)
-        plt.ylabel("Stop sleep time", fontsize=self.label_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_stop_time_per_weekday_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Stop sleep time per day of the week plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Day of the week", fontsize=self.label_fontsize)
+            ax.set_ylabel("Stop sleep time", fontsize=self.label_fontsize)
 
     def make_sleep_start_time_per_month_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.boxplot(data=self.data, y="start_time_real", x="start_month_name_real")
-
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Start sleep time per month plot', fontsize=self.title_fontsize)
-        plt.xlabel("Month", fontsize=self.label_fontsize)
-        plt.ylabel("Start sleep time", fontsize=self.label_fontsize)
+        plot_path = Path(self.plots_directory, 'sleep_start_time_per_month_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('start_month', 'start_time_real', ax)
 
-        plt.savefig(Path(self.plots_directory, 'sleep_start_time_per_month_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Start sleep time per month plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Month", fontsize=self.label_fontsize)
+            ax.set_ylabel("Start sleep time", fontsize=self.label_fontsize)
 
     def make_sleep_stop_time_per_month_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
+        plot_path = Path(self.plots_directory, 'sleep_stop_time_per_month_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('stop_month', 'stop_time_real', ax)
 
-        sns.boxplot(data=self.data, y="stop_time_real", x="stop_month_name_real")
-
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Stop sleep time per month plot', fontsize=self.title_fontsize)
-        plt.xlabel("Month", fontsize=self.label_fontsize)
-        plt.ylabel("Stop sleep time", fontsize=self.label_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_stop_time_per_month_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Stop sleep time per month plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Month", fontsize=self.label_fontsize)
+            ax.set_ylabel("Stop sleep time", fontsize=self.label_fontsize)
 
     def make_sleep_start_time_per_year_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.boxplot(data=self.data, y="start_time_real", x="year_real")
+        plot_path = Path(self.plots_directory, 'sleep_start_time_per_year_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('year', 'start_time_real', ax)
 
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Start sleep time per year plot', fontsize=self.title_fontsize)
-        plt.xlabel("Year", fontsize=self.label_fontsize)
-        plt.ylabel("Start sleep time", fontsize=self.label_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_start_time_per_year_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Start sleep time per year plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Year", fontsize=self.label_fontsize)
+            ax.set_ylabel("Start sleep time", fontsize=self.label_fontsize)
 
     def make_sleep_stop_time_per_year_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.boxplot(data=self.data, y="stop_time_real", x="year_real")
-
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Stop sleep time per year plot', fontsize=self.title_fontsize)
-        plt.xlabel("Year", fontsize=self.label_fontsize)
-        plt.ylabel("Stop sleep time", fontsize=self.label_fontsize)
+        plot_path = Path(self.plots_directory, 'sleep_stop_time_per_year_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('year', 'stop_time_real', ax)
 
-        plt.savefig(Path(self.plots_directory, 'sleep_stop_time_per_year_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Stop sleep time per year plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Year", fontsize=self.label_fontsize)
+            ax.set_ylabel("Stop sleep time", fontsize=self.label_fontsize)
 
     def make_sleep_deep_hours_per_weekday_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
+        plot_path = Path(self.plots_directory, 'sleep_deep_hours_per_weekday_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('start_weekday', 'deepSleepTime_hours', ax)
 
-        sns.boxplot(data=self.data, y="deepSleepTime_hours", x="start_weekday_name_real")
-
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Deep sleep time per day of the week plot', fontsize=self.title_fontsize)
-        plt.xlabel("Day of the week", fontsize=self.label_fontsize)
-        plt.ylabel("Deep sleep time, hours", fontsize=self.label_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_deep_hours_per_weekday_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Deep sleep time per day of the week plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Day of the week", fontsize=self.label_fontsize)
+            ax.set_ylabel("Deep sleep time, hours", fontsize=self.label_fontsize)
 
     def make_sleep_shallow_hours_per_weekday_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.boxplot(data=self.data, y="shallowSleepTime_hours", x="start_weekday_name_real")
+        plot_path = Path(self.plots_directory, 'sleep_shallow_hours_per_weekday_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('start_weekday', 'shallowSleepTime_hours', ax)
 
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Shallow sleep time per day of the week plot', fontsize=self.title_fontsize)
-        plt.xlabel("Day of the week", fontsize=self.label_fontsize)
-        plt.ylabel("Shallow sleep time, hours", fontsize=self.label_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_shallow_hours_per_weekday_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Shallow sleep time per day of the week plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Day of the week", fontsize=self.label_fontsize)
+            ax.set_ylabel("Shallow sleep time, hours", fontsize=self.label_fontsize)
 
     def make_sleep_deep_hours_per_month_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.boxplot(data=self.data, y="deepSleepTime_hours", x="start_month_name_real")
-
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Deep sleep time per month plot', fontsize=self.title_fontsize)
-        plt.xlabel("Month", fontsize=self.label_fontsize)
-        plt.ylabel("Deep sleep time, hours", fontsize=self.label_fontsize)
+        plot_path = Path(self.plots_directory, 'sleep_deep_hours_per_month_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('start_month', 'deepSleepTime_hours', ax)
 
-        plt.savefig(Path(self.plots_directory, 'sleep_deep_hours_per_month_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Deep sleep time per month plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Month", fontsize=self.label_fontsize)
+            ax.set_ylabel("Deep sleep time, hours", fontsize=self.label_fontsize)
 
     def make_sleep_shallow_hours_per_month_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
+        plot_path = Path(self.plots_directory, 'sleep_shallow_hours_per_month_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('start_month', 'shallowSleepTime_hours', ax)
 
-        sns.boxplot(data=self.data, y="shallowSleepTime_hours", x="start_month_name_real")
-
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Shallow sleep time per month plot', fontsize=self.title_fontsize)
-        plt.xlabel("Month", fontsize=self.label_fontsize)
-        plt.ylabel("Shallow sleep time, hours", fontsize=self.label_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_shallow_hours_per_month_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Shallow sleep time per month plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Month", fontsize=self.label_fontsize)
+            ax.set_ylabel("Shallow sleep time, hours", fontsize=self.label_fontsize)
 
     def make_sleep_hours_per_year_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.boxplot(data=self.data, y="totalSleepTime_hours", x="year_real")
+        plot_path = Path(self.plots_directory, 'sleep_hours_per_year_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('year', 'totalSleepTime_hours', ax)
 
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Total sleep time per year plot', fontsize=self.title_fontsize)
-        plt.xlabel("Year", fontsize=self.label_fontsize)
-        plt.ylabel("Total sleep time, hours", fontsize=self.label_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_hours_per_year_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Total sleep time per year plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Year", fontsize=self.label_fontsize)
+            ax.set_ylabel("Total sleep time, hours", fontsize=self.label_fontsize)
 
     def make_sleep_deep_hours_per_year_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.boxplot(data=self.data, y="deepSleepTime_hours", x="year_real")
-
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Deep sleep time per year plot', fontsize=self.title_fontsize)
-        plt.xlabel("Year", fontsize=self.label_fontsize)
-        plt.ylabel("Deep sleep time, hours", fontsize=self.label_fontsize)
+        plot_path = Path(self.plots_directory, 'sleep_deep_hours_per_year_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('year', 'deepSleepTime_hours', ax)
 
-        plt.savefig(Path(self.plots_directory, 'sleep_deep_hours_per_year_boxplot.png'))
-        plt.close("all")
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Deep sleep time per year plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Year", fontsize=self.label_fontsize)
+            ax.set_ylabel("Deep sleep time, hours", fontsize=self.label_fontsize)
 
     def make_sleep_shallow_hours_per_year_boxplot(self) -> None:
-        sns.set_style('whitegrid')
-        plt.figure(figsize=self.plot_figsize)
-
-        sns.boxplot(data=self.data, y="shallowSleepTime_hours", x="year_real")
-
-        plt.yticks(self.hour_axis_labels)
-        plt.title('Shallow sleep time per year plot', fontsize=self.title_fontsize)
-        plt.xlabel("Year", fontsize=self.label_fontsize)
-        plt.ylabel("Shallow sleep time, hours", fontsize=self.label_fontsize)
-
-        plt.savefig(Path(self.plots_directory, 'sleep_shallow_hours_per_year_boxplot.png'))
-        plt.close("all")
+        plot_path = Path(self.plots_directory, 'sleep_shallow_hours_per_year_boxplot.png')
+        with self.figure_pool.figure(plot_path, self.plot_figsize) as (fig, ax):
+            self.draw_boxplot('year', 'shallowSleepTime_hours', ax)
+
+            ax.set_yticks(self.hour_axis_labels)
+            ax.set_title('Shallow sleep time per year plot', fontsize=self.title_fontsize)
+            ax.set_xlabel("Year", fontsize=self.label_fontsize)
+            ax.set_ylabel("Shallow sleep time, hours", fontsize=self.label_fontsize)
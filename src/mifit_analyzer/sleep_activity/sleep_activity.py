@@ -1,37 +1,48 @@
+import logging
+import tracemalloc
+
 import pandas as pd
 
+from abstract_classes.plotter_abstract import get_axis_labels
 from activity.activity import ActivityData
-from abstract_classes.mifit_abstract import convert_csv_to_markdown
+from mifit_statistics import StatisticsStore
 from sleep.sleep import SleepData
 
 
 class SleepActivityData(SleepData, ActivityData):
 
+    derived_columns = ()
+
+    sleep_columns = ('date', 'deepSleepTime_hours', 'shallowSleepTime_hours', 'totalSleepTime_hours',
+                     'start_weekday_real', 'stop_weekday_real', 'start_month_real', 'start_weekday_name_real',
+                     'stop_weekday_name_real', 'start_month_name_real', 'stop_month_name_real',
+                     'year_real', 'start_time_real', 'stop_time_real', 'deep_total_sleep_ratio')
+
+    activity_columns = ('steps', 'distance', 'runDistance', 'calories', 'date_month_name', 'date_weekday_name',
+                        'year')
+
+    statistics_columns = {**SleepData.statistics_columns, **ActivityData.statistics_columns}
+
+    rollup_groupings: dict[str, tuple[str, ...]] = {}
+
     def __init__(self, sleep: SleepData, activity: ActivityData,
                  results_directory: str = '/mnt/c/mifit_data/mifit_analyzer/results') -> None:
         self.sleep = sleep
         self.activity = activity
-        self.results_directory = results_directory.removesuffix('/')
-        self.plots_directory = f'{results_directory}/plots/'
-        self.statistics_directory = f'{results_directory}/statistics'
-
+        self.init_state(results_directory, sleep.ingestion_config)
         self.statistics_file_name = f'{self.statistics_directory}/sleep_activity_statistics'
-        self.sleep_for_merge: pd.DataFramee = \
-            sleep.data[['date', 'deepSleepTime_hours',
-                        'shallowSleepTime_hours', 'totalSleepTime_hours', 'start_weekday_real',
-                        'stop_weekday_real', 'start_month_real', 'start_weekday_name_real',
-                        'stop_weekday_name_real', 'start_month_name_real', 'stop_month_name_real',
-                        'year_real', 'start_time_real', 'stop_time_real', 'deep_total_sleep_ratio']]
 
-        self.activity_for_merge: pd.DataFrame = activity.data[['date', 'steps', 'distance', 'runDistance', 'calories',
-                                                               'date_month_name', 'date_weekday_name', 'year']]
-        self.data: pd.DataFrame = pd.merge(self.sleep_for_merge, self.activity_for_merge, on='date')
+        # the parents are already cut to the requested dates, so the joined data keeps all of its days
+        self.date_format = sleep.date_format
+        self.requested_start_date = None
+        self.requested_end_date = None
 
-        self.sleep_for_merge = None
-        self.activity_for_merge = None
+        self.data: pd.DataFrame = self.join_sleep_and_activity()
+        self.is_transformed = True
+        self.set_start_date_and_end_date()
 
-        self.steps_axis_labels = [i for i in range(0, self.data.steps.max(), 2000)]
-        self.distance_axis_labels = [i for i in range(0, self.data.distance.max(), 2000)]
+        self.steps_axis_labels = get_axis_labels(self.data.steps, 2000)
+        self.distance_axis_labels = get_axis_labels(self.data.distance, 2000)
 
     def __repr__(self) -> str:
         cls_name = type(self).__name__
@@ -39,16 +50,39 @@ class SleepActivityData(SleepData, ActivityData):
                f"activity={type(self.activity).__name__}, " \
                f"results_directory='{self.results_directory}')"
 
-    def write_statistics_to_csv(self) -> None:
-        desired_columns = self.data.describe()[['totalSleepTime_hours', 'deepSleepTime_hours', 'shallowSleepTime_hours',
-                                                'start_time_real', 'stop_time_real', 'deep_total_sleep_ratio',
-                                                'steps', 'distance', 'runDistance', 'calories']]\
-            .round(2)
+    def join_sleep_and_activity(self) -> pd.DataFrame:
+        # both parents keep a sorted date index, so their columns are lined up without a merge
+        sleep_data = self.sleep.ensure_columns(*self.sleep_columns)
+        activity_data = self.activity.ensure_columns(*self.activity_columns)
+
+        is_tracing = tracemalloc.is_tracing()
+        if not is_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        memory_before, _ = tracemalloc.get_traced_memory()
+
+        if sleep_data.index.is_unique and activity_data.index.is_unique:
+            common_dates = sleep_data.index.intersection(activity_data.index)
+            # under copy-on-write a parent whose dates are all shared is referenced, not copied
+            if not sleep_data.index.equals(common_dates):
+                sleep_data = sleep_data.loc[common_dates]
+            if not activity_data.index.equals(common_dates):
+                activity_data = activity_data.loc[common_dates]
+            data = pd.concat([sleep_data, activity_data], axis=1)
+        else:
+            data = sleep_data.join(activity_data, how='inner')
+
+        _, memory_peak = tracemalloc.get_traced_memory()
+        if not is_tracing:
+            tracemalloc.stop()
 
-        desired_columns.columns = ['Total sleep time (hours)', 'Deep sleep time (hours)', 'Shallow sleep time (hours)',
-                                   'Start sleep time', 'Stop sleep time', 'Deep sleep time/Total sleep time ratio',
-                                   'Steps', 'Distance', 'Run distance', 'Calories']
+        logging.info(f'{type(self).__name__} joined {len(data)} days of sleep and activity data '
+                     f'with a peak of {(memory_peak - memory_before) / 1024 / 1024:.2f} Mb of new memory')
+        return data
 
-        desired_columns.to_csv(f'{self.statistics_file_name}.csv')
+    def get_statistics_store(self) -> StatisticsStore | None:
+        # the joined data is rebuilt on every run and is not kept in a watermark store
+        return None
 
-        convert_csv_to_markdown(csv_file=self.statistics_file_name)
+    def get_rollup_key(self) -> str | None:
+        return None
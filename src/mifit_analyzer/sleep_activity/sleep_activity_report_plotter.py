@@ -1,19 +1,22 @@
+from abstract_classes.plot_cache import PlotCache
+from abstract_classes.plot_renderer import PlotRenderer
 from abstract_classes.report_plotter_abstract import ReportPlotterAbstract, markdown_text
 from sleep_activity.sleep_activity_plotter import SleepActivityPlotter
 
 
 class SleepActivityReportPlotter(ReportPlotterAbstract):
 
-    def __init__(self, plotter: SleepActivityPlotter, markdown_plots_list: list[markdown_text]):
+    def __init__(self, plotter: SleepActivityPlotter, markdown_plots_list: list[markdown_text],
+                 plot_renderer: PlotRenderer | None = None, plot_cache: PlotCache | None = None):
         self.plotter = plotter
-        super().__init__(self.plotter, markdown_plots_list)
+        super().__init__(self.plotter, markdown_plots_list, plot_renderer, plot_cache)
 
     def make_plots(self) -> None:
-        self.plotter.make_sleep_activity_correlations_plot()
+        self.make_plot('make_sleep_activity_correlations_plot')
 
-        self.plotter.make_sleep_activity_steps_sleep_per_start_weekday_scatterplot()
+        self.make_plot('make_sleep_activity_steps_sleep_per_start_weekday_scatterplot')
 
-        self.plotter.make_sleep_activity_steps_sleep_per_stop_weekday_scatterplot()
+        self.make_plot('make_sleep_activity_steps_sleep_per_stop_weekday_scatterplot')
 
         self.markdown_plots_list.extend(('Here you can find your sleep activity plots\n',
                                          *self.get_plot_markdown_text('sleep_activity_correlations_plot')))
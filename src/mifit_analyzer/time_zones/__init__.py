@@ -0,0 +1 @@
+from .time_zone_timeline import TimeZoneTimeline, read_time_zone_timeline
@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(slots=True, frozen=True)
+class TimeZoneTimeline:
+    effective_from: np.ndarray
+    time_zones: tuple[str, ...]
+
+    def __repr__(self) -> str:
+        cls_name = type(self).__name__
+        return f"{cls_name}(time_zones={self.time_zones})"
+
+    def get_entries(self) -> list[tuple[str, str]]:
+        return list(zip(np.datetime_as_string(self.effective_from).tolist(), self.time_zones))
+
+    def get_time_zone_codes(self, values: np.ndarray) -> np.ndarray:
+        # the rows before the first entry belong to the first time zone
+        return np.clip(np.searchsorted(self.effective_from, values, side='right') - 1, 0, None)
+
+    def convert_to_local_time(self, timestamps: pd.Series) -> pd.Series:
+        values = timestamps.to_numpy(dtype='datetime64[s]')
+        time_zone_codes = self.get_time_zone_codes(values)
+
+        # the rows are grouped by time zone with one stable sort, so every time zone is converted in a single call
+        # and the rows are not scanned again for each time zone
+        order = np.argsort(time_zone_codes, kind='stable')
+        codes, starts = np.unique(time_zone_codes[order], return_index=True)
+        local_values = values.copy()
+        for time_zone_code, rows in zip(codes, np.split(order, starts[1:])):
+            local_values[rows] = pd.DatetimeIndex(values[rows]).tz_localize('UTC')\
+                .tz_convert(self.time_zones[time_zone_code]).tz_localize(None).to_numpy(dtype='datetime64[s]')
+
+        local_time = pd.Series(local_values, index=timestamps.index, name=timestamps.name)
+        if isinstance(timestamps.dtype, pd.ArrowDtype):
+            return local_time.astype('timestamp[s][pyarrow]')
+        return local_time
+
+
+def read_time_zone_timeline(path: str) -> TimeZoneTimeline:
+    timeline = pd.read_csv(path, index_col=None, header=0, dtype={'time_zone': str})
+
+    for time_zone in timeline.time_zone.unique():
+        try:
+            ZoneInfo(time_zone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown time zone '{time_zone}' in the time zone timeline {path}")
+
+    # effective_from values without an offset are UTC instants
+    timeline['effective_from'] = pd.to_datetime(timeline.effective_from, utc=True, format='ISO8601')\
+        .dt.tz_localize(None)
+    timeline = timeline.sort_values(by='effective_from', kind='stable')
+
+    return TimeZoneTimeline(effective_from=timeline.effective_from.to_numpy(dtype='datetime64[s]'),
+                            time_zones=tuple(timeline.time_zone))
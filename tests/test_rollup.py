@@ -0,0 +1,63 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src' / 'mifit_analyzer'))
+
+from analytics import calendar_levels, get_rollup  # noqa: E402
+
+
+def get_daily_data(days: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2018-01-01', periods=days, freq='D')
+    weekdays = pd.Categorical(index.day_name(), categories=['Monday', 'Tuesday', 'Wednesday', 'Thursday',
+                                                            'Friday', 'Saturday', 'Sunday'])
+    return pd.DataFrame({'steps': rng.integers(0, 30000, days).astype(np.float64), 'weekday': weekdays},
+                        index=index)
+
+
+def test_empty_frame():
+    rollup = get_rollup(pd.DataFrame({'x': []}, index=pd.DatetimeIndex([])), ['x'])
+
+    assert list(rollup.table.level) == ['all']
+    assert rollup.get_total('x') == 0
+    assert rollup.get_level('all', 'x')['count'].iloc[0] == 0
+
+
+def test_empty_window():
+    data = get_daily_data(400)
+    rollup = get_rollup(data.loc['2030-01-01':'2030-12-31'], ['steps'], {'weekday': ('weekday',)})
+
+    assert set(rollup.table.level) == {'all', 'weekday'}
+    labels, box_statistics = rollup.get_box_statistics('weekday', 'steps')
+    assert labels == list(data.weekday.cat.categories)
+    assert box_statistics == [None] * 7
+
+    # the groups of a column that is not categorical are only known from the rows
+    data['year'] = data.index.year
+    rollup = get_rollup(data.loc['2030-01-01':'2030-12-31'], ['steps'], {'year': ('year',)})
+    assert rollup.get_box_statistics('year', 'steps') == ([], [])
+
+
+def test_groups():
+    data = get_daily_data(400)
+    rollup = get_rollup(data, ['steps'], {'weekday': ('weekday',)})
+
+    assert set(rollup.table.level) == {'all', 'weekday', *calendar_levels}
+    monthly = rollup.get_level('monthly', 'steps')
+    expected = data.steps.groupby(data.index.to_period('M')).agg(['count', 'sum', 'median'])
+    np.testing.assert_array_equal(monthly['count'], expected['count'])
+    np.testing.assert_allclose(monthly['sum'], expected['sum'])
+    np.testing.assert_allclose(monthly['median'], expected['median'])
+
+
+def test_total_quantiles_are_exact():
+    # the whole period is above the size where the statistics tables switch to quantile sketches
+    data = get_daily_data(60000)
+    total = get_rollup(data, ['steps']).get_level('all', 'steps').iloc[0]
+
+    q1, median, q3 = np.quantile(data.steps, [0.25, 0.5, 0.75])
+    assert (total['q1'], total['median'], total['q3']) == (q1, median, q3)
+    assert (total['min'], total['max']) == (data.steps.min(), data.steps.max())